@@ -15,6 +15,8 @@ from django.core.files.base import ContentFile
 from django.core.validators import EmailValidator
 from django.utils import timezone
 
+from app.games.player_cards import invalidate_player_cards
+
 from .models import DEFAULT_AVATAR_CHOICES, NicknameChangeLog, UserProfile
 
 
@@ -403,4 +405,7 @@ class ProfileEditForm(forms.Form):
             self.user.set_password(new_password1)
             self.user.save()
 
+        # 게임 화면의 플레이어 카드(닉네임, 프로필 이미지) 갱신
+        invalidate_player_cards(self.user.id)
+
         return self.user
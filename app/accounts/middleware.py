@@ -1,11 +1,43 @@
+from django.core.cache import cache
 from django.shortcuts import render
 from django.utils import timezone
 
 from app.accounts.models import UserProfile
 
+# 정지 정보 캐시 (제재 부여/해제 시 invalidate_suspension 으로 즉시 삭제)
+SUSPENSION_CACHE_TIMEOUT = 300  # 초 - DB 를 직접 고친 경우 최대 이 시간 뒤 반영
+
+
+def suspension_cache_key(user_id) -> str:
+    return f"suspension:{user_id}"
+
+
+def get_suspension(user_id) -> dict:
+    """
+    유저 정지 정보 {"permanent": bool, "until": datetime | None}
+    캐시에 있으면 DB 조회 없음, 없으면 필요한 컬럼만 1회 조회 후 저장
+    """
+    key = suspension_cache_key(user_id)
+    record = cache.get(key)
+    if record is None:
+        row = (
+            UserProfile.objects.filter(user_id=user_id)
+            .values_list("is_permanently_banned", "suspended_until")
+            .first()
+        )
+        permanent, until = row or (False, None)
+        record = {"permanent": permanent, "until": until}
+        cache.set(key, record, timeout=SUSPENSION_CACHE_TIMEOUT)
+    return record
+
+
+def invalidate_suspension(user_id):
+    """정지 정보 캐시 삭제 (제재 부여/해제 후 transaction.on_commit 으로 호출)"""
+    cache.delete(suspension_cache_key(user_id))
+
 
 class SuspensionCheckMiddleware:
-    """계정 정지 체크 미들웨어"""
+    """계정 정지 체크 미들웨어 (정지 정보는 유저별 캐시 - 보통 DB 조회 없음)"""
 
     EXEMPT_PATHS = [
         "/accounts/login/",
@@ -22,30 +54,26 @@ class SuspensionCheckMiddleware:
         if request.user.is_authenticated and not request.user.is_staff:
             path = request.path
             if not any(path.startswith(p) for p in self.EXEMPT_PATHS):
-                try:
-                    profile = UserProfile.objects.get(user=request.user)
-                    if profile.is_permanently_banned:
-                        return render(
-                            request,
-                            "account/suspended.html",
-                            {"reason": "영구 정지된 계정입니다.", "permanent": True},
-                        )
-                    if (
-                        profile.suspended_until
-                        and profile.suspended_until > timezone.now()
-                    ):
-                        remaining = profile.suspended_until - timezone.now()
-                        return render(
-                            request,
-                            "account/suspended.html",
-                            {
-                                "reason": "계정이 일시 정지되었습니다.",
-                                "until": profile.suspended_until,
-                                "remaining_days": remaining.days,
-                                "permanent": False,
-                            },
-                        )
-                except UserProfile.DoesNotExist:
-                    pass
+                suspension = get_suspension(request.user.id)
+                if suspension["permanent"]:
+                    return render(
+                        request,
+                        "account/suspended.html",
+                        {"reason": "영구 정지된 계정입니다.", "permanent": True},
+                    )
+                # 만료 시각은 요청마다 비교하므로 캐시된 정지도 제때 풀림
+                until = suspension["until"]
+                now = timezone.now()
+                if until and until > now:
+                    return render(
+                        request,
+                        "account/suspended.html",
+                        {
+                            "reason": "계정이 일시 정지되었습니다.",
+                            "until": until,
+                            "remaining_days": (until - now).days,
+                            "permanent": False,
+                        },
+                    )
 
         return self.get_response(request)
@@ -1,5 +1,3 @@
-import time
-
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import (
@@ -9,7 +7,6 @@ from django.contrib.auth import (
     update_session_auth_hash,
 )
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
 from django.db.models import Q
 from django.http import JsonResponse
 from django.core.paginator import Paginator
@@ -19,12 +16,17 @@ from django.views.decorators.http import require_POST
 from .forms import ProfileEditForm, SignUpForm
 from .models import UserProfile
 from app.games.models import Friend, FriendRequest, GameHistory
+from app.games.presence import create_last_seen_tracker
 
 
 # 온라인 상태 관련 상수
 ONLINE_TIMEOUT = 60  # 60초 내 활동이 있으면 온라인
-ONLINE_USERS_KEY = "online_users"  # 캐시 키
-AI_GAME_USERS_KEY = "ai_game_users"  # AI 게임 중인 유저 캐시 키
+ONLINE_USERS_KEY = "online_users"  # 하트비트 기록 키
+AI_GAME_USERS_KEY = "ai_game_users"  # AI 게임 중인 유저 기록 키
+
+# 유저별 하트비트 기록 (Redis ZSET, REDIS_URL 이 없으면 프로세스 메모리)
+online_users_tracker = create_last_seen_tracker(ONLINE_USERS_KEY, ONLINE_TIMEOUT)
+ai_game_users_tracker = create_last_seen_tracker(AI_GAME_USERS_KEY, ONLINE_TIMEOUT)
 
 User = get_user_model()
 
@@ -202,48 +204,26 @@ def heartbeat(request):
     모든 페이지에서 30초마다 호출됨
     """
     user = request.user
-    current_time = time.time()
-
-    # 현재 온라인 유저 목록 가져오기
-    online_users = cache.get(ONLINE_USERS_KEY, {})
 
-    # 유저 정보 업데이트
-    online_users[user.id] = {
-        "user_id": user.id,
-        "username": user.username,
-        "nickname": user.first_name or user.username,
-        "last_seen": current_time,
-    }
-
-    # 만료된 유저 정리 (60초 이상 활동 없는 유저)
-    online_users = {
-        uid: info
-        for uid, info in online_users.items()
-        if current_time - info["last_seen"] < ONLINE_TIMEOUT
-    }
-
-    # 캐시 저장 (2분 TTL)
-    cache.set(ONLINE_USERS_KEY, online_users, timeout=120)
+    # 내 기록만 갱신 (전체 목록을 읽고 다시 쓰지 않음)
+    online_users_tracker.touch(
+        {
+            "user_id": user.id,
+            "username": user.username,
+            "nickname": user.first_name or user.username,
+        }
+    )
 
-    return JsonResponse({"status": "ok", "online_count": len(online_users)})
+    return JsonResponse(
+        {"status": "ok", "online_count": online_users_tracker.count_online()}
+    )
 
 
 def get_online_users():
-    """온라인 유저 목록 반환 (다른 모듈에서 사용)"""
-    current_time = time.time()
-    online_users = cache.get(ONLINE_USERS_KEY, {})
-
-    # 만료된 유저 필터링
-    return {
-        uid: info
-        for uid, info in online_users.items()
-        if current_time - info["last_seen"] < ONLINE_TIMEOUT
-    }
+    """온라인 유저 목록 반환 (user_id → 유저 정보 + last_seen, 다른 모듈에서 사용)"""
+    return online_users_tracker.get_online()
 
 
 def set_user_offline(user_id):
     """유저를 오프라인으로 설정 (로그아웃 시 등)"""
-    online_users = cache.get(ONLINE_USERS_KEY, {})
-    if user_id in online_users:
-        del online_users[user_id]
-        cache.set(ONLINE_USERS_KEY, online_users, timeout=120)
+    online_users_tracker.remove(user_id)
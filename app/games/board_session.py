@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+
+from app.games.utils.omok import BitBoard
+
+# 프로세스당 유지할 최대 보드 세션 수 (LRU)
+MAX_BOARD_SESSIONS = 1024
+
+
+class BoardSession:
+    """게임 하나의 디코딩된 보드 상태 (DB Game 행의 캐시)"""
+
+    __slots__ = ("game_id", "version", "board", "move_count")
+
+    def __init__(self, game_id: int, version: int, board: BitBoard, move_count: int):
+        self.game_id = game_id
+        self.version = version  # Game.board_version 과 같으면 유효
+        self.board = board
+        self.move_count = move_count
+
+    @classmethod
+    def from_game(cls, game, size: int) -> "BoardSession":
+        """Game 행에서 세션 생성"""
+        return cls(
+            game_id=game.pk,
+            version=game.board_version,
+            board=BitBoard.from_string(game.board, size),
+            move_count=game.move_count,
+        )
+
+    def apply_move(self, x: int, y: int, stone: str):
+        """착수 반영 (Game.set_cell 과 같이 버전 +1)"""
+        self.board.place(x, y, stone)
+        self.move_count += 1
+        self.version += 1
+
+
+class BoardSessionCache:
+    """
+    게임별 보드 세션 LRU 캐시.
+    DB가 원본이며, 세션 버전이 Game.board_version 과 다르면 DB 보드로 다시 만든다.
+    """
+
+    def __init__(self, max_size: int = MAX_BOARD_SESSIONS):
+        self.max_size = max_size
+        self._sessions: OrderedDict[int, BoardSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, game, size: int) -> BoardSession:
+        """Game 행과 버전이 맞는 세션 반환 (없거나 다르면 재생성)"""
+        with self._lock:
+            session = self._sessions.get(game.pk)
+            if session is not None and session.version == game.board_version:
+                self._sessions.move_to_end(game.pk)
+                return session
+
+            session = BoardSession.from_game(game, size)
+            self._sessions[game.pk] = session
+            self._sessions.move_to_end(game.pk)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+            return session
+
+    def discard(self, game_id: int):
+        """세션 제거 (롤백/게임 삭제 시)"""
+        with self._lock:
+            self._sessions.pop(game_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# 프로세스 전역 인스턴스
+board_sessions = BoardSessionCache()
@@ -0,0 +1,80 @@
+import heapq
+import threading
+from typing import Optional
+
+
+def clock_deadline(game) -> Optional[float]:
+    """
+    현재 턴 플레이어의 시간이 다 되는 시각 (epoch 초)
+    시계가 돌지 않는 게임(종료, 상대 없음, 시작 전)은 None
+    """
+    if game.winner or not (game.black_id and game.white_id) or not game.last_move_time:
+        return None
+    if game.turn == "black":
+        remaining = game.black_time_remaining
+    else:
+        remaining = game.white_time_remaining
+    return game.last_move_time.timestamp() + remaining
+
+
+class DeadlineQueue:
+    """
+    게임별 시간 초과 시각 (최소 힙 + 게임별 현재 마감 시각)
+    - 갱신/취소는 dict 만 바꾸고 힙의 옛 항목은 꺼낼 때 버림 (O(log N))
+    - 착수 처리 스레드와 시계 루프가 같이 쓰므로 잠금 사용
+    """
+
+    def __init__(self):
+        self.heap: list[tuple[float, int]] = []
+        self.deadlines: dict[int, float] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def schedule(self, game_id: int, deadline: float) -> bool:
+        """마감 시각 등록/갱신. 가장 이른 마감이 바뀌었으면 True (시계 루프를 깨워야 함)"""
+        with self.lock:
+            if self.deadlines.get(game_id) == deadline:
+                return False
+            earliest = self._peek()
+            self.deadlines[game_id] = deadline
+            heapq.heappush(self.heap, (deadline, game_id))
+            self._compact()
+            return earliest is None or deadline < earliest
+
+    def cancel(self, game_id: int):
+        """마감 시각 삭제 (게임 종료, 리매치 초기화 등)"""
+        with self.lock:
+            self.deadlines.pop(game_id, None)
+            self._compact()
+
+    def next_deadline(self) -> Optional[float]:
+        """가장 이른 마감 시각 (없으면 None)"""
+        with self.lock:
+            return self._peek()
+
+    def pop_due(self, now: float) -> list[int]:
+        """now 까지 마감된 게임 ID (마감 순)"""
+        due = []
+        with self.lock:
+            while self._peek() is not None and self.heap[0][0] <= now:
+                _, game_id = heapq.heappop(self.heap)
+                del self.deadlines[game_id]
+                due.append(game_id)
+        return due
+
+    def _peek(self) -> Optional[float]:
+        # 갱신/취소로 무효가 된 항목을 버리면서 맨 앞 확인
+        while self.heap:
+            deadline, game_id = self.heap[0]
+            if self.deadlines.get(game_id) == deadline:
+                return deadline
+            heapq.heappop(self.heap)
+        return None
+
+    def _compact(self):
+        # 무효 항목이 너무 많이 쌓이면 힙 재구성
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [(d, game_id) for game_id, d in self.deadlines.items()]
+            heapq.heapify(self.heap)
@@ -0,0 +1,185 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.games.matchmaking import (
+    PAIRING_STRATEGIES,
+    MatchmakingService,
+    QueueEntry,
+    get_rating_range,
+)
+
+
+def legacy_find_match(service, user_id):
+    """이전 방식: 매 호출마다 큐 전체를 joined_at 으로 정렬 후 선형 탐색 (비교용)"""
+    entry = service.queue.get(user_id)
+    if not entry:
+        return None
+
+    now = time.time()
+    min_rating, max_rating = get_rating_range(entry.rating, int(now - entry.joined_at))
+    candidates = sorted(
+        [e for e in service.queue.values() if e.user_id != user_id],
+        key=lambda x: x.joined_at,
+    )
+    for candidate in candidates:
+        if not (min_rating <= candidate.rating <= max_rating):
+            continue
+        cand_min, cand_max = get_rating_range(
+            candidate.rating, int(now - candidate.joined_at)
+        )
+        if cand_min <= entry.rating <= cand_max:
+            return candidate
+    return None
+
+
+class Command(BaseCommand):
+    help = "매칭 성능 측정 (find_match 인덱스 vs 이전 방식, 짝짓기 greedy vs optimal)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=10000, help="큐에 넣을 유저 수 (기본값: 10000)"
+        )
+        parser.add_argument(
+            "--legacy-lookups",
+            type=int,
+            default=200,
+            help="이전 방식으로 측정할 조회 수 (느리므로 표본만, 0이면 생략)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+        parser.add_argument(
+            "--pairing-ticks",
+            type=int,
+            default=300,
+            help="짝짓기 방식 비교 시뮬레이션 틱 수 (0이면 생략)",
+        )
+        parser.add_argument(
+            "--arrivals",
+            type=float,
+            default=20.0,
+            help="짝짓기 비교 시 틱(1초)당 평균 신규 진입 수",
+        )
+
+    def handle(self, *args, **options):
+        self.benchmark_find_match(options)
+        if options["pairing_ticks"] > 0:
+            self.benchmark_pairing(options)
+
+    def benchmark_pairing(self, options):
+        """
+        짝짓기 방식(greedy / optimal) 비교
+        같은 진입 스트림(틱당 Poisson 도착, Rating 정규분포)을 각 방식으로 돌리고
+        처리량, Rating 차이, 대기 시간, 짝짓기 계산 시간을 비교한다.
+        """
+        ticks = options["pairing_ticks"]
+        rate = options["arrivals"]
+        self.stdout.write(f"\n짝짓기 방식 비교: {ticks}틱, 틱당 평균 {rate:.1f}명 진입")
+
+        for name, pair in PAIRING_STRATEGIES.items():
+            rng = random.Random(options["seed"])
+            queue: list[QueueEntry] = []
+            gaps, waits = [], []
+            compute = 0.0
+            next_id = 1
+            for tick in range(ticks):
+                now = float(tick)
+                # Poisson 도착 (지수 분포 간격을 1초 안에서 누적)
+                t = rng.expovariate(rate)
+                while t < 1.0:
+                    queue.append(
+                        QueueEntry(
+                            user_id=next_id,
+                            rating=int(rng.gauss(1200, 200)),
+                            channel_name="",
+                            nickname="",
+                            username="",
+                            joined_at=now - 1.0 + t,
+                        )
+                    )
+                    next_id += 1
+                    t += rng.expovariate(rate)
+
+                start = time.perf_counter()
+                pairs = pair(queue, now)
+                compute += time.perf_counter() - start
+
+                matched = set()
+                for a, b in pairs:
+                    matched.update((a.user_id, b.user_id))
+                    gaps.append(abs(a.rating - b.rating))
+                    waits.extend((now - a.joined_at, now - b.joined_at))
+                queue = [e for e in queue if e.user_id not in matched]
+
+            n_pairs = len(gaps)
+            if not n_pairs:
+                self.stdout.write(f"  {name}: 매칭 없음")
+                continue
+            p95 = statistics.quantiles(gaps, n=20)[-1] if n_pairs > 1 else gaps[0]
+            self.stdout.write(
+                f"  {name:8s} 매치 {n_pairs}건 ({n_pairs / ticks:.2f}/s), "
+                f"남은 큐 {len(queue)}명 | Rating 차이 평균 {statistics.mean(gaps):.1f} "
+                f"p95 {p95:.0f} | 대기 평균 {statistics.mean(waits):.1f}s "
+                f"최대 {max(waits):.0f}s | 계산 {compute / ticks * 1000:.3f} ms/틱"
+            )
+
+    def benchmark_find_match(self, options):
+        n_users = options["users"]
+        rng = random.Random(options["seed"])
+
+        service = MatchmakingService.standalone()
+
+        start = time.perf_counter()
+        for user_id in range(1, n_users + 1):
+            service.add_to_queue(
+                user_id=user_id,
+                rating=int(rng.gauss(1200, 200)),
+                channel_name="",
+                nickname=f"bench{user_id}",
+                username=f"bench{user_id}",
+            )
+        insert_time = time.perf_counter() - start
+        self.stdout.write(
+            f"큐 적재: {n_users}명, {insert_time * 1000:.1f} ms "
+            f"({insert_time / n_users * 1e6:.2f} µs/명)"
+        )
+
+        # 모든 유저가 한 번씩 조회 = 이전 구조의 '1초' 분량
+        user_ids = list(service.queue)
+        start = time.perf_counter()
+        found = sum(1 for uid in user_ids if service.find_match(uid))
+        index_time = time.perf_counter() - start
+        self.stdout.write(
+            f"Rating 인덱스: {len(user_ids)}회 조회 {index_time * 1000:.1f} ms "
+            f"({index_time / len(user_ids) * 1e6:.1f} µs/회, 매칭 후보 있음 {found}명)"
+        )
+
+        legacy_lookups = min(options["legacy_lookups"], len(user_ids))
+        if legacy_lookups <= 0:
+            return
+
+        sample = rng.sample(user_ids, legacy_lookups)
+        start = time.perf_counter()
+        legacy_results = [legacy_find_match(service, uid) for uid in sample]
+        legacy_time = time.perf_counter() - start
+        per_call = legacy_time / legacy_lookups
+        self.stdout.write(
+            f"이전 방식: {legacy_lookups}회 조회 {legacy_time * 1000:.1f} ms "
+            f"({per_call * 1e6:.1f} µs/회, 전체 {len(user_ids)}회 환산 "
+            f"{per_call * len(user_ids):.2f} s)"
+        )
+
+        # 같은 상대를 고르는지 확인 (joined_at 이 같으면 다를 수 있음)
+        same = sum(
+            1
+            for uid, legacy in zip(sample, legacy_results)
+            if (legacy and legacy.user_id)
+            == ((m := service.find_match(uid)) and m.user_id)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"속도 향상: {per_call / (index_time / len(user_ids)):.0f}배, "
+                f"결과 일치 {same}/{legacy_lookups}"
+            )
+        )
@@ -0,0 +1,122 @@
+from django.core.management.base import BaseCommand
+
+from app.games.matchmaking import PAIRING_STRATEGIES
+from app.games.matchmaking_sim import SimConfig, simulate
+
+
+class Command(BaseCommand):
+    help = "가상 시계로 매칭 시뮬레이션 (범위 설정 / 짝짓기 방식 튜닝용)"
+
+    def add_arguments(self, parser):
+        defaults = SimConfig()
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=defaults.duration,
+            help="진입 발생 시간 (초)",
+        )
+        parser.add_argument(
+            "--arrival-rate",
+            type=float,
+            default=defaults.arrival_rate,
+            help="초당 평균 진입 수 (Poisson)",
+        )
+        parser.add_argument("--rating-mean", type=float, default=defaults.rating_mean)
+        parser.add_argument("--rating-std", type=float, default=defaults.rating_std)
+        parser.add_argument(
+            "--accept-prob",
+            type=float,
+            default=defaults.accept_prob,
+            help="응답한 유저의 수락 확률",
+        )
+        parser.add_argument(
+            "--no-response-prob",
+            type=float,
+            default=defaults.no_response_prob,
+            help="매칭 알림에 응답하지 않을 확률",
+        )
+        parser.add_argument(
+            "--max-response-delay",
+            type=float,
+            default=defaults.max_response_delay,
+            help="응답 지연 상한 (초)",
+        )
+        parser.add_argument(
+            "--pairing",
+            choices=sorted(PAIRING_STRATEGIES),
+            nargs="+",
+            default=[defaults.pairing],
+            help="짝짓기 방식 (여러 개 주면 같은 진입 스트림으로 비교)",
+        )
+        parser.add_argument("--base-range", type=int, default=defaults.base_range)
+        parser.add_argument(
+            "--expansion-rate", type=int, default=defaults.expansion_rate
+        )
+        parser.add_argument(
+            "--expansion-interval", type=int, default=defaults.expansion_interval
+        )
+        parser.add_argument("--max-range", type=int, default=defaults.max_range)
+        parser.add_argument("--seed", type=int, default=defaults.seed, help="난수 시드")
+        parser.add_argument(
+            "--timeline",
+            type=float,
+            default=60.0,
+            help="큐 길이 추이 출력 간격 (초, 0이면 생략)",
+        )
+
+    def handle(self, *args, **options):
+        for pairing in options["pairing"]:
+            config = SimConfig(
+                duration=options["duration"],
+                arrival_rate=options["arrival_rate"],
+                rating_mean=options["rating_mean"],
+                rating_std=options["rating_std"],
+                accept_prob=options["accept_prob"],
+                no_response_prob=options["no_response_prob"],
+                max_response_delay=options["max_response_delay"],
+                pairing=pairing,
+                base_range=options["base_range"],
+                expansion_rate=options["expansion_rate"],
+                expansion_interval=options["expansion_interval"],
+                max_range=options["max_range"],
+                seed=options["seed"],
+            )
+            result = simulate(config)
+            self.report(result, options["timeline"])
+
+    def report(self, result, timeline: float):
+        config = result.config
+        s = result.summary()
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n[{config.pairing}] {config.duration:.0f}s, 초당 {config.arrival_rate} 진입, "
+                f"범위 {config.base_range}+{config.expansion_rate}/{config.expansion_interval}s"
+                f" (최대 {config.max_range})"
+            )
+        )
+        self.stdout.write(
+            f"진입 {s['arrivals']}명 | 확정 매치 {s['matches']}건 ({s['matches_per_min']:.1f}/분) | "
+            f"거절 {s['declines']} | 수락 시간 초과 {s['accept_timeouts']} | "
+            f"큐 시간 초과 {s['queue_timeouts']} | 종료 시 대기 {s['waiting_at_end']}명"
+        )
+        self.stdout.write(
+            f"매칭 지연 p50 {s['latency_p50']:.1f}s  p90 {s['latency_p90']:.1f}s  "
+            f"p99 {s['latency_p99']:.1f}s"
+        )
+        self.stdout.write(
+            f"Rating 차이 평균 {s['gap_mean']:.1f}  p50 {s['gap_p50']}  "
+            f"p95 {s['gap_p95']}  최대 {s['gap_max']}"
+        )
+        self.stdout.write(
+            f"큐 길이 평균 {s['queue_mean']:.1f}  최대 {s['queue_max']} | "
+            f"틱 CPU 평균 {s['tick_cpu_mean_ms']:.3f} ms  p99 {s['tick_cpu_p99_ms']:.3f} ms  "
+            f"최대 {s['tick_cpu_max_ms']:.3f} ms"
+        )
+
+        if timeline > 0:
+            points, next_at = [], 0.0
+            for at, size in result.queue_lengths:
+                if at >= next_at:
+                    points.append(f"{at:.0f}s:{size}")
+                    next_at = at + timeline
+            self.stdout.write("큐 길이 추이 " + " ".join(points))
@@ -1,9 +1,15 @@
+import bisect
+import heapq
+import json
 import random
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional
+
+import redis
+from django.conf import settings
 
 # 매칭 설정
 BASE_RANGE = 50  # 기본 Rating 범위
@@ -11,6 +17,9 @@ EXPANSION_RATE = 25  # 확장 속도 (15초당)
 EXPANSION_INTERVAL = 15  # 확장 간격 (초)
 MAX_RANGE = 300  # 최대 범위
 ACCEPT_TIMEOUT = 10  # 수락 제한 시간 (초)
+QUEUE_TIMEOUT = 600  # 큐 최대 대기 시간 (초, 지나면 자동 이탈 - 끊긴 클라이언트 정리)
+TICK_INTERVAL = 1.0  # 중앙 매칭 루프 주기 (초)
+TICK_LEASE_TTL = 3.0  # 매칭 루프 리더 임대 시간 (초, 여러 프로세스 중 한 곳만 짝지음)
 
 
 class MatchStatus(Enum):
@@ -55,6 +64,141 @@ def get_current_range(seconds_in_queue: int) -> int:
     return min(BASE_RANGE + (expansions * EXPANSION_RATE), MAX_RANGE)
 
 
+def pair_queue(
+    entries: list[QueueEntry], now: float
+) -> list[tuple[QueueEntry, QueueEntry]]:
+    """
+    한 틱에 큐 전체를 한 번에 짝지음 (그리디)
+    - 오래 기다린 유저부터 차례로 상대를 고른다
+    - 상대는 서로의 범위(get_rating_range) 안에 있는 유저 중 Rating 이 가장 가까운 유저
+    - Rating 순 이중 연결 리스트에서 짝지어진 유저를 빼 가며 바깥쪽으로만 탐색
+      → 정렬 후 대부분 O(1) 탐색, 큐 크기에 거의 선형
+    """
+    n = len(entries)
+    by_rating = sorted(entries, key=lambda e: (e.rating, e.joined_at, e.user_id))
+    ratings = [e.rating for e in by_rating]
+    ranges = [get_rating_range(e.rating, int(now - e.joined_at)) for e in by_rating]
+    prev = list(range(-1, n - 1))
+    next_ = list(range(1, n + 1))
+    matched = [False] * n
+
+    def unlink(i):
+        matched[i] = True
+        if prev[i] >= 0:
+            next_[prev[i]] = next_[i]
+        if next_[i] < n:
+            prev[next_[i]] = prev[i]
+
+    pairs = []
+    for i in sorted(range(n), key=lambda k: by_rating[k].joined_at):
+        if matched[i]:
+            continue
+        rating = ratings[i]
+        min_rating, max_rating = ranges[i]
+        left, right = prev[i], next_[i]
+        while True:
+            left_ok = left >= 0 and ratings[left] >= min_rating
+            right_ok = right < n and ratings[right] <= max_rating
+            if not (left_ok or right_ok):
+                break
+            # 더 가까운 쪽 먼저 (같으면 오래 기다린 쪽)
+            if left_ok and right_ok:
+                gap_l, gap_r = rating - ratings[left], ratings[right] - rating
+                take_left = gap_l < gap_r or (
+                    gap_l == gap_r
+                    and by_rating[left].joined_at <= by_rating[right].joined_at
+                )
+            else:
+                take_left = left_ok
+            j = left if take_left else right
+
+            # 상대방의 범위 안에 내가 있는지 확인
+            cand_min, cand_max = ranges[j]
+            if cand_min <= rating <= cand_max:
+                unlink(i)
+                unlink(j)
+                pairs.append((by_rating[i], by_rating[j]))
+                break
+            if take_left:
+                left = prev[left]
+            else:
+                right = next_[right]
+
+    return pairs
+
+
+# 최적 짝짓기 가중치
+OPTIMAL_WAIT_WEIGHT = 1.0  # 대기 1초당 점수 (오래 기다린 유저를 먼저 짝짓도록)
+OPTIMAL_LOOKBACK = 4  # Rating 순으로 몇 칸 떨어진 유저까지 짝 후보로 볼지
+
+
+def pair_queue_optimal(
+    entries: list[QueueEntry], now: float
+) -> list[tuple[QueueEntry, QueueEntry]]:
+    """
+    한 틱 전체를 보는 배치 짝짓기 (DP)
+    Rating 순으로 정렬한 뒤 서로 교차하지 않는 짝만 고려하면
+    dp[i] = 앞에서 i명까지 봤을 때 최대 (짝 수, 점수) 로 풀 수 있다.
+      짝 점수 = WAIT_WEIGHT * (두 유저 대기 시간 합) - Rating 차이
+    → 튜플 비교라 짝 수가 항상 먼저 최대화되고 (대기 시간이 아무리 길어도 짝 수를 줄이지 않음),
+      같은 짝 수 안에서 Rating 차이 합은 작게, 오래 기다린 유저는 우선.
+    짝은 서로의 범위 안에 있는 유저끼리만, 사이에 낀 유저는 이번 틱에 대기.
+    O(N * LOOKBACK)
+    """
+    n = len(entries)
+    by_rating = sorted(entries, key=lambda e: (e.rating, e.joined_at, e.user_id))
+    waits = [now - e.joined_at for e in by_rating]
+    ranges = [get_rating_range(e.rating, int(w)) for e, w in zip(by_rating, waits)]
+
+    dp = [(0, 0.0)] * (n + 1)
+    choice = [-1] * (n + 1)  # dp[i] 에서 i-1 번째와 짝지은 상대 인덱스 (-1 = 대기)
+    for i in range(1, n + 1):
+        me = i - 1
+        dp[i] = dp[i - 1]
+        rating = by_rating[me].rating
+        for j in range(me - 1, max(-1, me - 1 - OPTIMAL_LOOKBACK), -1):
+            other = by_rating[j].rating
+            if other < ranges[me][0]:
+                break
+            if not (ranges[j][0] <= rating <= ranges[j][1]):
+                continue
+            count, score = dp[j]
+            score = (
+                count + 1,
+                score + OPTIMAL_WAIT_WEIGHT * (waits[me] + waits[j]) - (rating - other),
+            )
+            if score > dp[i]:
+                dp[i] = score
+                choice[i] = j
+
+    pairs = []
+    i = n
+    while i > 0:
+        j = choice[i]
+        if j < 0:
+            i -= 1
+        else:
+            pairs.append((by_rating[j], by_rating[i - 1]))
+            i = j
+    pairs.reverse()
+    return pairs
+
+
+# settings.MATCHMAKING_PAIRING 으로 선택
+PAIRING_STRATEGIES = {
+    "greedy": pair_queue,
+    "optimal": pair_queue_optimal,
+}
+
+
+def get_pairing_strategy():
+    """설정된 짝짓기 함수 (기본값 greedy)"""
+    name = "greedy"
+    if settings.configured:
+        name = getattr(settings, "MATCHMAKING_PAIRING", "greedy")
+    return PAIRING_STRATEGIES.get(name, pair_queue)
+
+
 class MatchmakingService:
     """싱글톤 매칭 서비스"""
 
@@ -63,11 +207,37 @@ class MatchmakingService:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.queue: dict[int, QueueEntry] = {}
-            cls._instance.pending_matches: dict[str, PendingMatch] = {}
-            cls._instance.user_match_map: dict[int, str] = {}  # user_id -> match_id
+            cls._instance.reset()
         return cls._instance
 
+    @classmethod
+    def standalone(cls) -> "MatchmakingService":
+        """싱글톤과 상태를 공유하지 않는 별도 인스턴스 (시뮬레이터/벤치마크용)"""
+        service = super().__new__(cls)
+        service.reset()
+        return service
+
+    def reset(self):
+        """상태 초기화"""
+        self.queue: dict[int, QueueEntry] = {}
+        self.pending_matches: dict[str, PendingMatch] = {}
+        self.user_match_map: dict[int, str] = {}  # user_id -> match_id
+        # Rating 순 인덱스: (rating, joined_at, user_id) 정렬 리스트
+        self.rating_index: list[tuple[int, float, int]] = []
+        # 만료 힙: (deadline, match_id) / (deadline, user_id, joined_at)
+        self.match_deadlines: list[tuple[float, str]] = []
+        self.queue_deadlines: list[tuple[float, int, float]] = []
+        # 시각 함수 (None 이면 time.time, 시뮬레이터는 가상 시계를 넣음)
+        self.clock: Optional[Callable[[], float]] = None
+
+    def now(self) -> float:
+        """현재 시각"""
+        return self.clock() if self.clock else time.time()
+
+    @staticmethod
+    def _index_key(entry: QueueEntry) -> tuple[int, float, int]:
+        return (entry.rating, entry.joined_at, entry.user_id)
+
     def add_to_queue(
         self,
         user_id: int,
@@ -83,67 +253,101 @@ class MatchmakingService:
         if user_id in self.queue or user_id in self.user_match_map:
             return False
 
-        self.queue[user_id] = QueueEntry(
+        entry = QueueEntry(
             user_id=user_id,
             rating=rating,
             channel_name=channel_name,
             nickname=nickname,
             username=username,
-            joined_at=time.time(),
+            joined_at=self.now(),
             total_games=total_games,
             profile_image=profile_image,
         )
+        self.queue[user_id] = entry
+        bisect.insort(self.rating_index, self._index_key(entry))
+        heapq.heappush(
+            self.queue_deadlines,
+            (entry.joined_at + QUEUE_TIMEOUT, user_id, entry.joined_at),
+        )
         return True
 
     def remove_from_queue(self, user_id: int) -> bool:
         """큐에서 사용자 제거"""
-        if user_id in self.queue:
-            del self.queue[user_id]
-            return True
-        return False
+        entry = self.queue.pop(user_id, None)
+        if entry is None:
+            return False
+        key = self._index_key(entry)
+        i = bisect.bisect_left(self.rating_index, key)
+        if i < len(self.rating_index) and self.rating_index[i] == key:
+            del self.rating_index[i]
+        return True
 
     def get_queue_entry(self, user_id: int) -> Optional[QueueEntry]:
         """큐 엔트리 조회"""
         return self.queue.get(user_id)
 
+    def get_queued_user_ids(self) -> set[int]:
+        """큐에 있는 유저 ID 집합"""
+        return set(self.queue)
+
+    def get_queue_entries(self) -> list[QueueEntry]:
+        """큐 전체 엔트리 (매칭 루프용)"""
+        return list(self.queue.values())
+
+    def acquire_tick_lease(self, owner: str, ttl: float = TICK_LEASE_TTL) -> bool:
+        """매칭 루프 리더 임대 (프로세스 1개이므로 항상 성공)"""
+        return True
+
     def get_seconds_in_queue(self, user_id: int) -> int:
         """큐 대기 시간 반환"""
         entry = self.queue.get(user_id)
         if entry:
-            return int(time.time() - entry.joined_at)
+            return int(self.now() - entry.joined_at)
         return 0
 
     def find_match(self, user_id: int) -> Optional[QueueEntry]:
-        """매칭 상대 찾기"""
+        """
+        매칭 상대 찾기
+        Rating 인덱스에서 내 범위 [min, max] 구간만 훑고,
+        서로의 범위에 들어가는 후보 중 가장 오래 기다린 유저를 고른다.
+        """
         entry = self.queue.get(user_id)
         if not entry:
             return None
 
-        seconds_in_queue = int(time.time() - entry.joined_at)
-        min_rating, max_rating = get_rating_range(entry.rating, seconds_in_queue)
-
-        # 대기 시간 순으로 정렬하여 검색
-        candidates = sorted(
-            [e for e in self.queue.values() if e.user_id != user_id],
-            key=lambda x: x.joined_at,
+        now = self.now()
+        min_rating, max_rating = get_rating_range(
+            entry.rating, int(now - entry.joined_at)
         )
 
-        for candidate in candidates:
-            # 내 범위 안에 있는지 확인
-            if not (min_rating <= candidate.rating <= max_rating):
+        index = self.rating_index
+        lo = bisect.bisect_left(index, (min_rating,))
+        hi = bisect.bisect_left(index, (max_rating + 1,))
+
+        best = None
+        for _, joined_at, cand_id in index[lo:hi]:
+            if cand_id == user_id:
+                continue
+            if best is not None and joined_at >= best.joined_at:
                 continue
 
             # 상대방의 범위 안에 내가 있는지 확인
-            candidate_seconds = int(time.time() - candidate.joined_at)
-            cand_min, cand_max = get_rating_range(candidate.rating, candidate_seconds)
-
+            candidate = self.queue[cand_id]
+            cand_min, cand_max = get_rating_range(
+                candidate.rating, int(now - candidate.joined_at)
+            )
             if cand_min <= entry.rating <= cand_max:
-                return candidate
+                best = candidate
 
-        return None
+        return best
+
+    def create_pending_match(
+        self, player1: QueueEntry, player2: QueueEntry
+    ) -> Optional[str]:
+        """매칭 성공 - 대기 상태 생성 (둘 중 하나라도 이미 큐에 없으면 None)"""
+        if player1.user_id not in self.queue or player2.user_id not in self.queue:
+            return None
 
-    def create_pending_match(self, player1: QueueEntry, player2: QueueEntry) -> str:
-        """매칭 성공 - 대기 상태 생성"""
         match_id = str(uuid.uuid4())
 
         # 큐에서 제거
@@ -151,14 +355,16 @@ class MatchmakingService:
         self.remove_from_queue(player2.user_id)
 
         # 대기 매치 생성
+        created_at = self.now()
         self.pending_matches[match_id] = PendingMatch(
             match_id=match_id,
             player1=player1,
             player2=player2,
             player1_accepted=False,
             player2_accepted=False,
-            created_at=time.time(),
+            created_at=created_at,
         )
+        heapq.heappush(self.match_deadlines, (created_at + ACCEPT_TIMEOUT, match_id))
 
         # 유저-매치 매핑
         self.user_match_map[player1.user_id] = match_id
@@ -184,7 +390,7 @@ class MatchmakingService:
             return MatchStatus.DECLINED
 
         # 수락 타임아웃 체크
-        if time.time() - match.created_at > ACCEPT_TIMEOUT:
+        if self.now() - match.created_at > ACCEPT_TIMEOUT:
             self._cleanup_match(match_id)
             return MatchStatus.TIMEOUT
 
@@ -245,6 +451,43 @@ class MatchmakingService:
         if match_id:
             self.decline_match(match_id, user_id)
 
+    def expire_pending_matches(self, now: Optional[float] = None) -> list[PendingMatch]:
+        """
+        수락 제한 시간이 지난 대기 매치를 정리하고 반환 (매칭 루프가 틱마다 호출)
+        마감 시각 힙에서 지난 것만 꺼내므로 아무도 응답하지 않아도 매치가 남지 않음.
+        이미 확정/거절로 정리된 매치의 힙 항목은 그냥 버린다.
+        """
+        if now is None:
+            now = self.now()
+        expired = []
+        heap = self.match_deadlines
+        while heap and heap[0][0] < now:
+            _, match_id = heapq.heappop(heap)
+            match = self.pending_matches.get(match_id)
+            if match:
+                self._cleanup_match(match_id)
+                expired.append(match)
+        return expired
+
+    def expire_queue_entries(self, now: Optional[float] = None) -> list[QueueEntry]:
+        """QUEUE_TIMEOUT 보다 오래 큐에 있던 엔트리를 제거하고 반환"""
+        if now is None:
+            now = self.now()
+        expired = []
+        heap = self.queue_deadlines
+        while heap and heap[0][0] < now:
+            _, user_id, joined_at = heapq.heappop(heap)
+            entry = self.queue.get(user_id)
+            # 나갔다 다시 들어온 유저는 joined_at 이 다름 → 예전 힙 항목은 무시
+            if entry and entry.joined_at == joined_at:
+                self.remove_from_queue(user_id)
+                expired.append(entry)
+        return expired
+
+    def get_pending_count(self) -> int:
+        """대기(수락 전) 매치 수"""
+        return len(self.pending_matches)
+
     def get_queue_size(self) -> int:
         """큐 크기 반환"""
         return len(self.queue)
@@ -257,5 +500,379 @@ class MatchmakingService:
         return "white", "black"
 
 
+class RedisMatchmakingService:
+    """
+    Redis 매칭 서비스 (여러 ASGI 프로세스가 같은 큐를 공유)
+
+    키 구조 (prefix 기본값 "mm")
+    - {prefix}:queue          ZSET  user_id → rating
+    - {prefix}:entries        HASH  user_id → QueueEntry JSON
+    - {prefix}:joined         ZSET  user_id → joined_at (큐 만료용)
+    - {prefix}:match:{id}     HASH  player1/player2(JSON), *_accepted, created_at (TTL)
+    - {prefix}:user_match     HASH  user_id → match_id
+    - {prefix}:match_deadlines ZSET match_id → 수락 마감 시각 (대기 매치 만료용)
+    - {prefix}:tick_leader    STRING 매칭 루프 리더 (TTL)
+
+    큐에서 두 명을 꺼내는 매칭 확정, 매치 정리는 WATCH/MULTI 트랜잭션으로 처리해서
+    여러 프로세스가 동시에 같은 유저를 가져가지 못하게 한다.
+    """
+
+    # 대기 매치 해시 TTL (수락 제한 시간 + 여유)
+    MATCH_TTL = ACCEPT_TIMEOUT + 60
+
+    def __init__(self, client: redis.Redis, prefix: str = "mm"):
+        self.redis = client
+        self.queue_key = f"{prefix}:queue"
+        self.entries_key = f"{prefix}:entries"
+        self.joined_key = f"{prefix}:joined"
+        self.deadlines_key = f"{prefix}:match_deadlines"
+        self.user_match_key = f"{prefix}:user_match"
+        self.leader_key = f"{prefix}:tick_leader"
+        self.match_prefix = f"{prefix}:match:"
+
+    # --- 직렬화 ---
+    @staticmethod
+    def _dump(entry: QueueEntry) -> str:
+        return json.dumps(asdict(entry))
+
+    @staticmethod
+    def _load(raw: Optional[str]) -> Optional[QueueEntry]:
+        return QueueEntry(**json.loads(raw)) if raw else None
+
+    def _match_key(self, match_id: str) -> str:
+        return self.match_prefix + match_id
+
+    def _load_match(self, match_id: str, data: dict) -> Optional[PendingMatch]:
+        if not data:
+            return None
+        return PendingMatch(
+            match_id=match_id,
+            player1=self._load(data["player1"]),
+            player2=self._load(data["player2"]),
+            player1_accepted=data.get("player1_accepted") == "1",
+            player2_accepted=data.get("player2_accepted") == "1",
+            created_at=float(data["created_at"]),
+        )
+
+    # --- 큐 ---
+    def add_to_queue(
+        self,
+        user_id: int,
+        rating: int,
+        channel_name: str,
+        nickname: str,
+        username: str,
+        total_games: int = 0,
+        profile_image: str = "",
+    ) -> bool:
+        """큐에 사용자 추가"""
+        entry = QueueEntry(
+            user_id=user_id,
+            rating=rating,
+            channel_name=channel_name,
+            nickname=nickname,
+            username=username,
+            joined_at=time.time(),
+            total_games=total_games,
+            profile_image=profile_image,
+        )
+        added = False
+
+        def txn(pipe):
+            nonlocal added
+            # 이미 큐에 있거나 매칭 중이면 거부
+            if pipe.zscore(self.queue_key, user_id) is not None:
+                return
+            match_id = pipe.hget(self.user_match_key, user_id)
+            if match_id and pipe.exists(self._match_key(match_id)):
+                return
+            pipe.multi()
+            pipe.zadd(self.queue_key, {user_id: rating})
+            pipe.zadd(self.joined_key, {user_id: entry.joined_at})
+            pipe.hset(self.entries_key, user_id, self._dump(entry))
+            if match_id:
+                pipe.hdel(self.user_match_key, user_id)  # 만료된 매치 매핑 정리
+            added = True
+
+        self.redis.transaction(txn, self.queue_key, self.user_match_key)
+        return added
+
+    def remove_from_queue(self, user_id: int) -> bool:
+        """큐에서 사용자 제거"""
+        pipe = self.redis.pipeline()
+        pipe.zrem(self.queue_key, user_id)
+        pipe.zrem(self.joined_key, user_id)
+        pipe.hdel(self.entries_key, user_id)
+        removed, _, _ = pipe.execute()
+        return bool(removed)
+
+    def get_queue_entry(self, user_id: int) -> Optional[QueueEntry]:
+        """큐 엔트리 조회"""
+        return self._load(self.redis.hget(self.entries_key, user_id))
+
+    def get_queued_user_ids(self) -> set[int]:
+        """큐에 있는 유저 ID 집합"""
+        return {int(uid) for uid in self.redis.zrange(self.queue_key, 0, -1)}
+
+    def get_queue_entries(self) -> list[QueueEntry]:
+        """큐 전체 엔트리 (매칭 루프용)"""
+        return [self._load(raw) for raw in self.redis.hvals(self.entries_key)]
+
+    def acquire_tick_lease(self, owner: str, ttl: float = TICK_LEASE_TTL) -> bool:
+        """
+        매칭 루프 리더 임대 획득/연장.
+        임대를 가진 프로세스만 큐를 짝지어서 같은 유저를 두 프로세스가 동시에 매칭하지 않게 한다.
+        """
+        ttl_ms = int(ttl * 1000)
+        if self.redis.set(self.leader_key, owner, nx=True, px=ttl_ms):
+            return True
+        acquired = False
+
+        def txn(pipe):
+            nonlocal acquired
+            if pipe.get(self.leader_key) != owner:
+                return
+            pipe.multi()
+            pipe.pexpire(self.leader_key, ttl_ms)
+            acquired = True
+
+        self.redis.transaction(txn, self.leader_key)
+        return acquired
+
+    def get_seconds_in_queue(self, user_id: int) -> int:
+        """큐 대기 시간 반환"""
+        entry = self.get_queue_entry(user_id)
+        if entry:
+            return int(time.time() - entry.joined_at)
+        return 0
+
+    def find_match(self, user_id: int) -> Optional[QueueEntry]:
+        """매칭 상대 찾기 (내 Rating 범위 안의 유저만 조회)"""
+        entry = self.get_queue_entry(user_id)
+        if not entry:
+            return None
+
+        now = time.time()
+        min_rating, max_rating = get_rating_range(
+            entry.rating, int(now - entry.joined_at)
+        )
+        candidate_ids = [
+            uid
+            for uid in self.redis.zrangebyscore(self.queue_key, min_rating, max_rating)
+            if int(uid) != user_id
+        ]
+        if not candidate_ids:
+            return None
+
+        # 대기 시간 순으로 검색
+        candidates = [
+            c
+            for c in map(self._load, self.redis.hmget(self.entries_key, candidate_ids))
+            if c
+        ]
+        candidates.sort(key=lambda x: x.joined_at)
+
+        for candidate in candidates:
+            # 상대방의 범위 안에 내가 있는지 확인
+            cand_min, cand_max = get_rating_range(
+                candidate.rating, int(now - candidate.joined_at)
+            )
+            if cand_min <= entry.rating <= cand_max:
+                return candidate
+
+        return None
+
+    # --- 대기 매치 ---
+    def create_pending_match(
+        self, player1: QueueEntry, player2: QueueEntry
+    ) -> Optional[str]:
+        """두 유저를 큐에서 원자적으로 꺼내 대기 매치 생성 (이미 다른 곳에서 가져갔으면 None)"""
+        match_id = str(uuid.uuid4())
+        match_key = self._match_key(match_id)
+        claimed = False
+
+        def txn(pipe):
+            nonlocal claimed
+            for player in (player1, player2):
+                if pipe.zscore(self.queue_key, player.user_id) is None:
+                    return
+            created_at = time.time()
+            pipe.multi()
+            pipe.zrem(self.queue_key, player1.user_id, player2.user_id)
+            pipe.zrem(self.joined_key, player1.user_id, player2.user_id)
+            pipe.hdel(self.entries_key, player1.user_id, player2.user_id)
+            pipe.hset(
+                match_key,
+                mapping={
+                    "player1": self._dump(player1),
+                    "player2": self._dump(player2),
+                    "player1_accepted": "0",
+                    "player2_accepted": "0",
+                    "created_at": created_at,
+                },
+            )
+            pipe.expire(match_key, self.MATCH_TTL)
+            pipe.zadd(self.deadlines_key, {match_id: created_at + ACCEPT_TIMEOUT})
+            pipe.hset(
+                self.user_match_key,
+                mapping={player1.user_id: match_id, player2.user_id: match_id},
+            )
+            claimed = True
+
+        self.redis.transaction(txn, self.queue_key)
+        return match_id if claimed else None
+
+    def get_pending_match(self, match_id: str) -> Optional[PendingMatch]:
+        """대기 매치 조회"""
+        return self._load_match(match_id, self.redis.hgetall(self._match_key(match_id)))
+
+    def get_user_match(self, user_id: int) -> Optional[PendingMatch]:
+        """유저의 대기 매치 조회"""
+        match_id = self.redis.hget(self.user_match_key, user_id)
+        if match_id:
+            return self.get_pending_match(match_id)
+        return None
+
+    def accept_match(self, match_id: str, user_id: int) -> MatchStatus:
+        """매칭 수락"""
+        match = self.get_pending_match(match_id)
+        if not match:
+            return MatchStatus.DECLINED
+
+        # 수락 타임아웃 체크
+        if time.time() - match.created_at > ACCEPT_TIMEOUT:
+            self._cleanup_match(match_id)
+            return MatchStatus.TIMEOUT
+
+        if match.player1.user_id == user_id:
+            field = "player1_accepted"
+        elif match.player2.user_id == user_id:
+            field = "player2_accepted"
+        else:
+            return MatchStatus.WAITING
+
+        # 수락 기록과 양쪽 수락 여부 확인을 한 번에 (매치가 사라졌으면 기록하지 않음)
+        match_key = self._match_key(match_id)
+
+        def txn(pipe):
+            if not pipe.exists(match_key):
+                return
+            pipe.multi()
+            pipe.hset(match_key, field, "1")
+            pipe.hmget(match_key, "player1_accepted", "player2_accepted")
+
+        results = self.redis.transaction(txn, match_key)
+        if not results:
+            return MatchStatus.DECLINED
+        accepted = results[-1]
+
+        # 양쪽 수락 확인
+        if accepted == ["1", "1"]:
+            return MatchStatus.CONFIRMED
+        return MatchStatus.WAITING
+
+    def decline_match(
+        self, match_id: str, user_id: int
+    ) -> tuple[MatchStatus, Optional[QueueEntry]]:
+        """매칭 거절 - 상대방을 다시 큐에 넣음"""
+        match = self._cleanup_match(match_id)
+        if not match:
+            return MatchStatus.DECLINED, None
+
+        # 상대방 정보
+        other_player = (
+            match.player2 if match.player1.user_id == user_id else match.player1
+        )
+        return MatchStatus.DECLINED, other_player
+
+    def confirm_and_cleanup(self, match_id: str) -> Optional[PendingMatch]:
+        """매칭 확정 후 정리 (여러 프로세스 중 한 곳만 매치를 받음)"""
+        return self._cleanup_match(match_id)
+
+    def _cleanup_match(self, match_id: str) -> Optional[PendingMatch]:
+        """매치 정리 - 실제로 지운 호출에만 매치 정보를 반환"""
+        match_key = self._match_key(match_id)
+        removed = None
+
+        def txn(pipe):
+            nonlocal removed
+            match = self._load_match(match_id, pipe.hgetall(match_key))
+            if not match:
+                return
+            # 유저-매치 매핑 제거 (다른 매치로 바뀌지 않은 경우만)
+            user_ids = [
+                player.user_id
+                for player in (match.player1, match.player2)
+                if pipe.hget(self.user_match_key, player.user_id) == match_id
+            ]
+            pipe.multi()
+            pipe.delete(match_key)
+            pipe.zrem(self.deadlines_key, match_id)
+            if user_ids:
+                pipe.hdel(self.user_match_key, *user_ids)
+            removed = match
+
+        self.redis.transaction(txn, match_key, self.user_match_key)
+        return removed
+
+    def cleanup_user(self, user_id: int):
+        """유저 연결 해제 시 정리"""
+        # 큐에서 제거
+        self.remove_from_queue(user_id)
+
+        # 대기 매치가 있으면 거절 처리
+        match_id = self.redis.hget(self.user_match_key, user_id)
+        if match_id:
+            self.decline_match(match_id, user_id)
+
+    def expire_pending_matches(self, now: Optional[float] = None) -> list[PendingMatch]:
+        """수락 제한 시간이 지난 대기 매치를 정리하고 반환 (실제로 지운 프로세스만 받음)"""
+        if now is None:
+            now = time.time()
+        expired = []
+        for match_id in self.redis.zrangebyscore(self.deadlines_key, "-inf", f"({now}"):
+            match = self._cleanup_match(match_id)
+            if match:
+                expired.append(match)
+            else:
+                # 해시 TTL 로 이미 사라진 매치 (user_match 는 add_to_queue 에서 정리됨)
+                self.redis.zrem(self.deadlines_key, match_id)
+        return expired
+
+    def expire_queue_entries(self, now: Optional[float] = None) -> list[QueueEntry]:
+        """QUEUE_TIMEOUT 보다 오래 큐에 있던 엔트리를 제거하고 반환"""
+        if now is None:
+            now = time.time()
+        expired = []
+        stale_ids = self.redis.zrangebyscore(
+            self.joined_key, "-inf", f"({now - QUEUE_TIMEOUT}"
+        )
+        for user_id in stale_ids:
+            entry = self.get_queue_entry(user_id)
+            if self.remove_from_queue(int(user_id)) and entry:
+                expired.append(entry)
+        return expired
+
+    def get_pending_count(self) -> int:
+        """대기(수락 전) 매치 수"""
+        return self.redis.zcard(self.deadlines_key)
+
+    def get_queue_size(self) -> int:
+        """큐 크기 반환"""
+        return self.redis.zcard(self.queue_key)
+
+
+def create_matchmaking_service():
+    """settings.MATCHMAKING_BACKEND ("memory" | "redis") 에 맞는 서비스 생성"""
+    backend = "memory"
+    if settings.configured:
+        backend = getattr(settings, "MATCHMAKING_BACKEND", "memory")
+    if backend == "redis":
+        from app.games.utils.redis_client import get_redis
+
+        return RedisMatchmakingService(get_redis())
+    return MatchmakingService()
+
+
 # 싱글톤 인스턴스
-matchmaking_service = MatchmakingService()
+matchmaking_service = create_matchmaking_service()
@@ -0,0 +1,237 @@
+import heapq
+import itertools
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from app.games import matchmaking
+from app.games.matchmaking import (
+    PAIRING_STRATEGIES,
+    MatchmakingService,
+    MatchStatus,
+    QueueEntry,
+)
+
+# 같은 시각 이벤트 처리 순서 (진입 → 응답 → 틱)
+_ARRIVE, _RESPOND, _TICK = 0, 1, 2
+
+
+@dataclass
+class SimConfig:
+    """매칭 시뮬레이션 설정 (시간 단위는 모두 가상 시계 초)"""
+
+    duration: float = 600.0  # 진입이 발생하는 시간
+    arrival_rate: float = 2.0  # 초당 평균 진입 수 (Poisson)
+    rating_mean: float = 1200.0
+    rating_std: float = 200.0
+    accept_prob: float = 0.9  # 응답하는 유저가 수락할 확률 (아니면 거절)
+    no_response_prob: float = 0.02  # 매칭 알림에 아예 응답하지 않을 확률
+    max_response_delay: float = 5.0  # 응답까지 걸리는 시간 상한 (균등분포)
+    tick_interval: float = matchmaking.TICK_INTERVAL
+    pairing: str = "greedy"  # PAIRING_STRATEGIES 키
+    base_range: int = matchmaking.BASE_RANGE
+    expansion_rate: int = matchmaking.EXPANSION_RATE
+    expansion_interval: int = matchmaking.EXPANSION_INTERVAL
+    max_range: int = matchmaking.MAX_RANGE
+    seed: int = 42
+
+
+@dataclass
+class SimResult:
+    config: SimConfig
+    arrivals: int = 0
+    matches: int = 0  # 양쪽 수락으로 확정된 매치
+    declines: int = 0
+    accept_timeouts: int = 0  # 수락 시간 초과로 만료된 매치
+    queue_timeouts: int = 0  # QUEUE_TIMEOUT 으로 큐에서 빠진 유저
+    latencies: list[float] = field(default_factory=list)  # 첫 진입 → 매치 확정 (유저별)
+    gaps: list[int] = field(default_factory=list)  # 확정 매치의 Rating 차이
+    # (시각, 큐 크기) - 틱마다 기록
+    queue_lengths: list[tuple[float, int]] = field(default_factory=list)
+    tick_cpu: list[float] = field(default_factory=list)  # 틱별 CPU 시간 (초)
+    waiting_at_end: int = 0
+
+    def summary(self) -> dict:
+        """주요 지표 요약"""
+        sizes = [size for _, size in self.queue_lengths] or [0]
+        cpu_ms = [t * 1000 for t in self.tick_cpu] or [0.0]
+        return {
+            "arrivals": self.arrivals,
+            "matches": self.matches,
+            "matches_per_min": self.matches / self.config.duration * 60,
+            "declines": self.declines,
+            "accept_timeouts": self.accept_timeouts,
+            "queue_timeouts": self.queue_timeouts,
+            "waiting_at_end": self.waiting_at_end,
+            "latency_p50": percentile(self.latencies, 50),
+            "latency_p90": percentile(self.latencies, 90),
+            "latency_p99": percentile(self.latencies, 99),
+            "gap_mean": statistics.mean(self.gaps) if self.gaps else 0.0,
+            "gap_p50": percentile(self.gaps, 50),
+            "gap_p95": percentile(self.gaps, 95),
+            "gap_max": max(self.gaps, default=0),
+            "queue_mean": statistics.mean(sizes),
+            "queue_max": max(sizes),
+            "tick_cpu_mean_ms": statistics.mean(cpu_ms),
+            "tick_cpu_p99_ms": percentile(cpu_ms, 99),
+            "tick_cpu_max_ms": max(cpu_ms),
+        }
+
+
+def percentile(values, q: float) -> float:
+    """nearest-rank 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+@contextmanager
+def rating_range_settings(config: SimConfig):
+    """
+    get_rating_range 가 읽는 모듈 상수를 잠시 바꿔치기 (범위 튜닝 실험용)
+    시뮬레이션은 한 스레드에서만 돌리므로 실행 중에만 값을 바꾼다.
+    """
+    values = {
+        "BASE_RANGE": config.base_range,
+        "EXPANSION_RATE": config.expansion_rate,
+        "EXPANSION_INTERVAL": config.expansion_interval,
+        "MAX_RANGE": config.max_range,
+    }
+    original = {name: getattr(matchmaking, name) for name in values}
+    for name, value in values.items():
+        setattr(matchmaking, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(matchmaking, name, value)
+
+
+def _requeue(service: MatchmakingService, player: QueueEntry) -> bool:
+    return service.add_to_queue(
+        user_id=player.user_id,
+        rating=player.rating,
+        channel_name=player.channel_name,
+        nickname=player.nickname,
+        username=player.username,
+    )
+
+
+def simulate(config: SimConfig) -> SimResult:
+    """
+    가상 시계로 MatchmakingService 를 돌리는 이산 이벤트 시뮬레이션
+    - 진입: Poisson 도착, Rating 정규분포
+    - 틱: 중앙 매칭 루프와 같은 순서 (만료 정리 → 짝짓기 → 대기 매치 생성)
+    - 응답: 유저별로 무응답 / 수락 / 거절, 지연은 균등분포
+    - 거절당한 쪽, 수락했는데 상대가 응답하지 않은 쪽은 다시 큐에 들어감 (실제 서버와 동일)
+    싱글톤과 상태를 공유하지 않는 별도 서비스 인스턴스를 사용한다.
+    """
+    rng = random.Random(config.seed)
+    pair = PAIRING_STRATEGIES[config.pairing]
+    result = SimResult(config=config)
+
+    now = 0.0
+    service = MatchmakingService.standalone()
+    service.clock = lambda: now
+
+    events: list[tuple] = []
+    seq = itertools.count()
+
+    def schedule(at: float, kind: int, payload=None):
+        heapq.heappush(events, (at, kind, next(seq), payload))
+
+    # 진입 스트림 미리 생성
+    t = rng.expovariate(config.arrival_rate)
+    user_ids = itertools.count(1)
+    while t < config.duration:
+        schedule(
+            t,
+            _ARRIVE,
+            (next(user_ids), int(rng.gauss(config.rating_mean, config.rating_std))),
+        )
+        t += rng.expovariate(config.arrival_rate)
+
+    # 진입이 끝난 뒤에도 마지막 수락 대기까지 처리되도록 틱을 더 돌림
+    end = config.duration + matchmaking.ACCEPT_TIMEOUT + config.max_response_delay
+    tick_at = config.tick_interval
+    while tick_at <= end:
+        schedule(tick_at, _TICK)
+        tick_at += config.tick_interval
+
+    first_joined: dict[int, float] = {}  # 재진입해도 지연 시간은 첫 진입 기준
+
+    with rating_range_settings(config):
+        while events:
+            now, kind, _, payload = heapq.heappop(events)
+
+            if kind == _ARRIVE:
+                user_id, rating = payload
+                name = f"sim{user_id}"
+                service.add_to_queue(user_id, rating, "", name, name)
+                first_joined[user_id] = now
+                result.arrivals += 1
+
+            elif kind == _RESPOND:
+                match_id, user_id, accept = payload
+                if accept:
+                    if service.accept_match(match_id, user_id) != MatchStatus.CONFIRMED:
+                        continue
+                    match = service.confirm_and_cleanup(match_id)
+                    if match:
+                        result.matches += 1
+                        result.gaps.append(
+                            abs(match.player1.rating - match.player2.rating)
+                        )
+                        for player in (match.player1, match.player2):
+                            result.latencies.append(
+                                now - first_joined.pop(player.user_id)
+                            )
+                else:
+                    _, other = service.decline_match(match_id, user_id)
+                    if other:
+                        result.declines += 1
+                        first_joined.pop(user_id, None)  # 거절한 유저는 떠남
+                        _requeue(service, other)
+
+            else:
+                start = time.process_time()
+                expired = service.expire_pending_matches(now)
+                stale = service.expire_queue_entries(now)
+                for match in expired:
+                    for player, accepted in (
+                        (match.player1, match.player1_accepted),
+                        (match.player2, match.player2_accepted),
+                    ):
+                        if accepted:
+                            _requeue(service, player)
+                        else:
+                            first_joined.pop(player.user_id, None)
+                created = []
+                for player1, player2 in pair(service.get_queue_entries(), now):
+                    match_id = service.create_pending_match(player1, player2)
+                    if match_id:
+                        created.append((match_id, player1, player2))
+                result.tick_cpu.append(time.process_time() - start)
+
+                result.accept_timeouts += len(expired)
+                result.queue_timeouts += len(stale)
+                for entry in stale:
+                    first_joined.pop(entry.user_id, None)
+                result.queue_lengths.append((now, service.get_queue_size()))
+
+                for match_id, *players in created:
+                    for player in players:
+                        if rng.random() < config.no_response_prob:
+                            continue
+                        accept = rng.random() < config.accept_prob
+                        delay = rng.uniform(0, config.max_response_delay)
+                        schedule(
+                            now + delay, _RESPOND, (match_id, player.user_id, accept)
+                        )
+
+    result.waiting_at_end = service.get_queue_size()
+    return result
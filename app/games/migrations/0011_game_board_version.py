@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0010_report_sanction_report_games_repor_status_599af2_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="board_version",
+            field=models.PositiveIntegerField(
+                default=0, help_text="보드 변경 버전 (메모리 보드 세션 동기화용)"
+            ),
+        ),
+    ]
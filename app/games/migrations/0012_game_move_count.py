@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_move_count(apps, schema_editor):
+    """기존 게임의 move_count 를 Move 개수로 채움"""
+    Game = apps.get_model("games", "Game")
+    games = Game.objects.annotate(n_moves=Count("moves")).filter(n_moves__gt=0)
+    for game in games.iterator():
+        Game.objects.filter(pk=game.pk).update(move_count=game.n_moves)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0011_game_board_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="move_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="이번 라운드 착수 수 (Move 생성과 함께 갱신)"
+            ),
+        ),
+        migrations.RunPython(backfill_move_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0012_game_move_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamehistory",
+            name="move_sequence",
+            field=models.BinaryField(
+                default=b"", help_text="수순 (한 수당 1바이트, y * 15 + x)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="gamehistory",
+            name="move_times",
+            field=models.BinaryField(
+                default=b"", help_text="수 간격 (0.1초 단위 varint, 첫 수는 0)"
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from app.games.replay import decode_moves, decode_time_deltas
+
 User = get_user_model()
 
 BOARD_SIZE = 15
@@ -26,6 +28,12 @@ class Game(models.Model):
     board = models.CharField(
         max_length=BOARD_SIZE * BOARD_SIZE, default="." * (BOARD_SIZE * BOARD_SIZE)
     )
+    board_version = models.PositiveIntegerField(
+        default=0, help_text="보드 변경 버전 (메모리 보드 세션 동기화용)"
+    )
+    move_count = models.PositiveIntegerField(
+        default=0, help_text="이번 라운드 착수 수 (Move 생성과 함께 갱신)"
+    )
     # Timer fields: 각 플레이어당 15분 (900초)
     black_time_remaining = models.IntegerField(
         default=900, help_text="흑 플레이어 남은 시간 (초)"
@@ -58,6 +66,7 @@ class Game(models.Model):
         s = list(self.board)
         s[self.idx(x, y)] = val
         self.board = "".join(s)
+        self.board_version += 1
 
     def stone_of_turn(self):
         return "B" if self.turn == "black" else "W"
@@ -84,6 +93,8 @@ class Game(models.Model):
     def reset_for_new_round(self):
         """새 라운드를 위해 게임판, 타이머, 턴을 초기화"""
         self.board = "." * (BOARD_SIZE * BOARD_SIZE)
+        self.board_version += 1
+        self.move_count = 0
         self.turn = "black"
         self.winner = None  # 승자 리셋
         self.black_time_remaining = 900
@@ -93,6 +104,7 @@ class Game(models.Model):
     def clear_moves(self):
         """게임의 모든 수를 삭제"""
         self.moves.all().delete()
+        self.move_count = 0
 
 
 class Move(models.Model):
@@ -130,6 +142,13 @@ class GameHistory(models.Model):
     created_at = models.DateTimeField(help_text="게임 시작 시간")
     finished_at = models.DateTimeField(auto_now_add=True, help_text="게임 종료 시간")
     total_moves = models.IntegerField(help_text="총 수 개수")
+    # 기보: Move 행이 리매치 때 지워져도 다시 볼 수 있도록 압축해서 보관
+    move_sequence = models.BinaryField(
+        default=b"", help_text="수순 (한 수당 1바이트, y * 15 + x)"
+    )
+    move_times = models.BinaryField(
+        default=b"", help_text="수 간격 (0.1초 단위 varint, 첫 수는 0)"
+    )
 
     class Meta:
         ordering = ["-finished_at"]
@@ -141,6 +160,14 @@ class GameHistory(models.Model):
     def __str__(self):
         return f"Game #{self.game_id} - {self.winner} won"
 
+    def get_replay_moves(self):
+        """기보 → [(x, y), ...]"""
+        return decode_moves(self.move_sequence, BOARD_SIZE)
+
+    def get_replay_times(self):
+        """수 간격 → [초, ...] (get_replay_moves 와 같은 길이)"""
+        return decode_time_deltas(self.move_times)
+
 
 class Friend(models.Model):
     """친구 관계 모델 (양방향)"""
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from app.accounts.models import INITIAL_RATING, UserProfile
+
+User = get_user_model()
+
+# 플레이어 카드 캐시 (전적/프로필 변경 시 invalidate_player_cards 로 즉시 삭제)
+PLAYER_CARD_TIMEOUT = 60 * 60
+DEFAULT_PROFILE_IMAGE = "/static/images/default_profile_green.svg"
+
+
+def player_card_key(user_id) -> str:
+    return f"player_card:{user_id}"
+
+
+def load_player_cards(user_ids) -> dict[int, dict]:
+    """유저 + 프로필 한 번에 조회 (쿼리 1회)"""
+    cards = {}
+    for user in User.objects.filter(id__in=user_ids).select_related("profile"):
+        try:
+            profile = user.profile
+        except UserProfile.DoesNotExist:
+            profile = None
+        cards[user.id] = {
+            "nickname": user.first_name or user.username,
+            "username": user.username,
+            "rating": profile.rating if profile else INITIAL_RATING,
+            "total_games": profile.total_games if profile else 0,
+            "profile_image": profile.profile_image_url
+            if profile
+            else DEFAULT_PROFILE_IMAGE,
+        }
+    return cards
+
+
+def get_player_cards(user_ids) -> dict[int, dict]:
+    """
+    user_id → 플레이어 카드 (닉네임, 아이디, 레이팅, 총 게임 수, 프로필 이미지)
+    캐시 조회 1회, 없는 카드만 DB 에서 채워서 저장
+    """
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return {}
+    cached = cache.get_many([player_card_key(user_id) for user_id in user_ids])
+    cards = {}
+    missing = []
+    for user_id in user_ids:
+        card = cached.get(player_card_key(user_id))
+        if card is None:
+            missing.append(user_id)
+        else:
+            cards[user_id] = card
+    if missing:
+        loaded = load_player_cards(missing)
+        cache.set_many(
+            {player_card_key(user_id): card for user_id, card in loaded.items()},
+            timeout=PLAYER_CARD_TIMEOUT,
+        )
+        cards.update(loaded)
+    return cards
+
+
+def invalidate_player_cards(*user_ids):
+    """플레이어 카드 캐시 삭제 (전적 갱신, 프로필 수정 후 호출)"""
+    cache.delete_many([player_card_key(user_id) for user_id in user_ids if user_id])
+
+
+def game_player_fields(game) -> dict:
+    """
+    게임 상태에 들어가는 양쪽 플레이어 정보 (get_both_player_names + 레이팅/프로필)
+    black_id / white_id 만 사용하므로 game.black / game.white 를 불러오지 않음
+    """
+    cards = get_player_cards([game.black_id, game.white_id])
+    fields = {}
+    for color, user_id in (("black", game.black_id), ("white", game.white_id)):
+        card = cards.get(user_id)
+        fields.update(
+            {
+                f"{color}_player": card["nickname"] if card else None,
+                f"{color}_username": card["username"] if card else None,
+                f"{color}_id": user_id,
+                f"{color}_rating": card["rating"] if card else INITIAL_RATING,
+                f"{color}_total_games": card["total_games"] if card else 0,
+                f"{color}_profile_image": card["profile_image"]
+                if card
+                else DEFAULT_PROFILE_IMAGE,
+            }
+        )
+    return fields
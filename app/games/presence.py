@@ -0,0 +1,317 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+# Redis 접속 정보 유지 시간 (초, 프로세스가 죽으면 이 시간 뒤 사라짐)
+PRESENCE_TTL = 60.0
+PRESENCE_REFRESH_INTERVAL = PRESENCE_TTL / 3  # TTL 갱신 주기 (초)
+
+
+class PresenceRegistry:
+    """
+    로비 접속자 레지스트리 (프로세스 메모리)
+    user_id → 유저 정보 / 채널 이름 집합 (탭을 여러 개 열어도 모든 채널을 보관)
+    """
+
+    def __init__(self):
+        self.users: dict[int, dict] = {}
+        self.channels: dict[int, set[str]] = {}
+
+    def add(self, channel_name: str, user_info: dict, now: Optional[float] = None):
+        """채널 접속 등록 (user_info: user_id, nickname, username)"""
+        user_id = user_info["user_id"]
+        self.users[user_id] = user_info
+        self.channels.setdefault(user_id, set()).add(channel_name)
+
+    def remove(self, channel_name: str, user_id: int, now: Optional[float] = None):
+        """채널 접속 해제 - 남은 채널이 없으면 유저도 제거"""
+        channels = self.channels.get(user_id)
+        if channels is None:
+            return
+        channels.discard(channel_name)
+        if not channels:
+            del self.channels[user_id]
+            self.users.pop(user_id, None)
+
+    def get_channels(self, user_id: int, now: Optional[float] = None) -> list[str]:
+        """유저의 접속 채널 목록"""
+        return list(self.channels.get(user_id, ()))
+
+    def get_user(self, user_id: int) -> Optional[dict]:
+        """유저 정보 (접속 중이 아니면 None)"""
+        return self.users.get(user_id)
+
+    def get_online_user_ids(self, now: Optional[float] = None) -> set[int]:
+        """접속 중인 유저 ID 집합"""
+        return set(self.channels)
+
+    def get_online_users(self, now: Optional[float] = None) -> list[dict]:
+        """접속 중인 유저 정보 목록"""
+        return list(self.users.values())
+
+    def ensure_refreshing(self):
+        """TTL 갱신 루프 (메모리 백엔드는 만료가 없으므로 필요 없음)"""
+
+
+class RedisPresenceRegistry:
+    """
+    Redis 로비 접속자 레지스트리 (여러 Daphne 프로세스가 같은 목록을 공유)
+
+    키 구조 (prefix 기본값 "presence")
+    - {prefix}:users              HASH  user_id → 유저 정보 JSON
+    - {prefix}:online             ZSET  user_id → 만료 시각 (가장 늦은 채널 기준)
+    - {prefix}:channels:{user_id} ZSET  channel_name → 만료 시각
+
+    각 프로세스는 자기 채널의 만료 시각을 PRESENCE_REFRESH_INTERVAL 마다 한 번에 연장하고,
+    프로세스가 죽으면 TTL 이 지난 뒤 조회에서 빠진다.
+    """
+
+    def __init__(
+        self, client: redis.Redis, prefix: str = "presence", ttl: float = PRESENCE_TTL
+    ):
+        self.redis = client
+        self.ttl = ttl
+        self.users_key = f"{prefix}:users"
+        self.online_key = f"{prefix}:online"
+        self.channels_prefix = f"{prefix}:channels:"
+        # 이 프로세스가 가진 채널 (channel_name → 유저 정보, TTL 갱신용)
+        self._local: dict[str, dict] = {}
+        self._task = None
+
+    def _channels_key(self, user_id) -> str:
+        return f"{self.channels_prefix}{user_id}"
+
+    def _register(self, pipe, channel_name: str, user_info: dict, now: float):
+        user_id = user_info["user_id"]
+        expires_at = now + self.ttl
+        key = self._channels_key(user_id)
+        pipe.hset(self.users_key, user_id, json.dumps(user_info))
+        pipe.zadd(key, {channel_name: expires_at})
+        pipe.expire(key, int(self.ttl) + 1)
+        pipe.zadd(self.online_key, {user_id: expires_at}, gt=True)
+
+    def add(self, channel_name: str, user_info: dict, now: Optional[float] = None):
+        """채널 접속 등록 (user_info: user_id, nickname, username)"""
+        if now is None:
+            now = time.time()
+        pipe = self.redis.pipeline()
+        self._register(pipe, channel_name, user_info, now)
+        pipe.execute()
+        self._local[channel_name] = user_info
+
+    def remove(self, channel_name: str, user_id: int, now: Optional[float] = None):
+        """채널 접속 해제 - 살아있는 채널이 없으면 유저도 제거"""
+        if now is None:
+            now = time.time()
+        self._local.pop(channel_name, None)
+        key = self._channels_key(user_id)
+
+        def txn(pipe):
+            remaining = [
+                channel
+                for channel in pipe.zrangebyscore(key, now, "+inf")
+                if channel != channel_name
+            ]
+            pipe.multi()
+            if remaining:
+                pipe.zrem(key, channel_name)
+            else:
+                pipe.delete(key)
+                pipe.zrem(self.online_key, user_id)
+                pipe.hdel(self.users_key, user_id)
+
+        self.redis.transaction(txn, key)
+
+    def refresh(self, now: Optional[float] = None):
+        """이 프로세스의 모든 채널 만료 시각 연장 (파이프라인 1회)"""
+        if not self._local:
+            return
+        if now is None:
+            now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for channel_name, user_info in list(self._local.items()):
+            self._register(pipe, channel_name, user_info, now)
+        pipe.execute()
+
+    def get_channels(self, user_id: int, now: Optional[float] = None) -> list[str]:
+        """유저의 살아있는 접속 채널 목록"""
+        if now is None:
+            now = time.time()
+        return self.redis.zrangebyscore(self._channels_key(user_id), now, "+inf")
+
+    def get_user(self, user_id: int) -> Optional[dict]:
+        """유저 정보 (접속 중이 아니면 None)"""
+        raw = self.redis.hget(self.users_key, user_id)
+        return json.loads(raw) if raw else None
+
+    def get_online_user_ids(self, now: Optional[float] = None) -> set[int]:
+        """접속 중인 유저 ID 집합"""
+        if now is None:
+            now = time.time()
+        return {
+            int(user_id)
+            for user_id in self.redis.zrangebyscore(self.online_key, now, "+inf")
+        }
+
+    def get_online_users(self, now: Optional[float] = None) -> list[dict]:
+        """접속 중인 유저 정보 목록 (만료된 유저는 정리)"""
+        if now is None:
+            now = time.time()
+        expired = self.redis.zrangebyscore(self.online_key, "-inf", f"({now}")
+        if expired:
+            pipe = self.redis.pipeline()
+            pipe.zrem(self.online_key, *expired)
+            pipe.hdel(self.users_key, *expired)
+            pipe.execute()
+
+        user_ids = sorted(self.get_online_user_ids(now))
+        if not user_ids:
+            return []
+        return [
+            json.loads(raw) for raw in self.redis.hmget(self.users_key, user_ids) if raw
+        ]
+
+    def ensure_refreshing(self):
+        """접속 등록 후 호출 - TTL 갱신 루프가 없으면 현재 이벤트 루프에서 시작"""
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        # 이 프로세스의 채널이 모두 빠질 때까지 돌고 종료
+        while self._local:
+            await asyncio.sleep(PRESENCE_REFRESH_INTERVAL)
+            try:
+                await sync_to_async(self.refresh)()
+            except Exception as e:
+                print(f"[Presence] refresh error: {repr(e)}")
+
+
+class LastSeenTracker:
+    """
+    하트비트 기반 접속 기록 (프로세스 메모리, REDIS_URL 이 없는 개발 환경용)
+    user_id → 유저 정보 + last_seen, timeout 초 안에 하트비트가 있었으면 접속 중
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.users: dict[int, dict] = {}
+
+    def touch(self, user_info: dict, now: Optional[float] = None):
+        """하트비트 기록 (user_info: user_id, username, nickname)"""
+        if now is None:
+            now = time.time()
+        self.users[user_info["user_id"]] = {**user_info, "last_seen": now}
+
+    def remove(self, user_id: int):
+        """접속 기록 삭제 (로그아웃, AI 게임 종료 등)"""
+        self.users.pop(user_id, None)
+
+    def get_online(self, now: Optional[float] = None) -> dict[int, dict]:
+        """접속 중인 유저 (user_id → 유저 정보 + last_seen), 만료된 기록은 정리"""
+        if now is None:
+            now = time.time()
+        cutoff = now - self.timeout
+        expired = [
+            uid for uid, info in self.users.items() if info["last_seen"] < cutoff
+        ]
+        for user_id in expired:
+            del self.users[user_id]
+        return dict(self.users)
+
+    def count_online(self, now: Optional[float] = None) -> int:
+        """접속 중인 유저 수"""
+        return len(self.get_online(now))
+
+
+class RedisLastSeenTracker:
+    """
+    Redis 하트비트 접속 기록 (유저별 갱신 - 전체 목록을 읽고 다시 쓰지 않음)
+
+    키 구조
+    - {key}       ZSET  user_id → last_seen
+    - {key}:info  HASH  user_id → 유저 정보 JSON
+    하트비트는 O(log N) 쓰기 2개, 조회는 last_seen 범위 조회 1회 + 정보 일괄 조회 1회.
+    """
+
+    def __init__(self, client: redis.Redis, key: str, timeout: float):
+        self.redis = client
+        self.timeout = timeout
+        self.key = key
+        self.info_key = f"{key}:info"
+
+    def touch(self, user_info: dict, now: Optional[float] = None):
+        """하트비트 기록 (user_info: user_id, username, nickname)"""
+        if now is None:
+            now = time.time()
+        user_id = user_info["user_id"]
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zadd(self.key, {user_id: now})
+        pipe.hset(self.info_key, user_id, json.dumps(user_info))
+        pipe.execute()
+
+    def remove(self, user_id: int):
+        """접속 기록 삭제 (로그아웃, AI 게임 종료 등)"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrem(self.key, user_id)
+        pipe.hdel(self.info_key, user_id)
+        pipe.execute()
+
+    def get_online(self, now: Optional[float] = None) -> dict[int, dict]:
+        """접속 중인 유저 (user_id → 유저 정보 + last_seen), 만료된 기록은 정리"""
+        if now is None:
+            now = time.time()
+        cutoff = now - self.timeout
+        expired = self.redis.zrangebyscore(self.key, "-inf", f"({cutoff}")
+        if expired:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem(self.key, *expired)
+            pipe.hdel(self.info_key, *expired)
+            pipe.execute()
+
+        scores = self.redis.zrangebyscore(self.key, cutoff, "+inf", withscores=True)
+        if not scores:
+            return {}
+        infos = self.redis.hmget(self.info_key, [user_id for user_id, _ in scores])
+        return {
+            int(user_id): {**json.loads(raw), "last_seen": last_seen}
+            for (user_id, last_seen), raw in zip(scores, infos)
+            if raw
+        }
+
+    def count_online(self, now: Optional[float] = None) -> int:
+        """접속 중인 유저 수"""
+        if now is None:
+            now = time.time()
+        return self.redis.zcount(self.key, now - self.timeout, "+inf")
+
+
+def create_last_seen_tracker(key: str, timeout: float):
+    """REDIS_URL 이 있으면 Redis(모든 프로세스 공유), 없으면 프로세스 메모리"""
+    if settings.configured and getattr(settings, "REDIS_URL", None):
+        from app.games.utils.redis_client import get_redis
+
+        return RedisLastSeenTracker(get_redis(), f"heartbeat:{key}", timeout)
+    return LastSeenTracker(timeout)
+
+
+def create_presence_registry():
+    """settings.PRESENCE_BACKEND ("memory" | "redis") 에 맞는 레지스트리 생성"""
+    backend = "memory"
+    if settings.configured:
+        backend = getattr(settings, "PRESENCE_BACKEND", "memory")
+    if backend == "redis":
+        from app.games.utils.redis_client import get_redis
+
+        return RedisPresenceRegistry(get_redis())
+    return PresenceRegistry()
+
+
+# 로비 접속자 레지스트리 (프로세스 전역 인스턴스)
+lobby_presence = create_presence_registry()
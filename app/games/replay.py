@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Iterable
+
+# 수 간격 기록 단위 (0.1초)
+TIME_UNIT = 0.1
+
+
+def encode_moves(moves: Iterable[tuple[int, int]], size: int = 15) -> bytes:
+    """
+    수순을 한 수당 1바이트로 압축 (Game.idx 와 같은 y * size + x)
+    15x15 보드는 칸 번호가 0~224 라서 1바이트에 들어감
+    """
+    if size * size > 256:
+        raise ValueError(f"board too large for byte encoding: {size}")
+    return bytes(y * size + x for x, y in moves)
+
+
+def decode_moves(data: bytes, size: int = 15) -> list[tuple[int, int]]:
+    """encode_moves 의 역변환 → [(x, y), ...]"""
+    return [(i % size, i // size) for i in bytes(data)]
+
+
+def encode_time_deltas(deltas: Iterable[float]) -> bytes:
+    """
+    수 간격(초)을 0.1초 단위 varint 로 압축
+    12.7초 이하는 1바이트, 15분(9000)까지는 2바이트
+    """
+    out = bytearray()
+    for delta in deltas:
+        value = max(0, round(delta / TIME_UNIT))
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_time_deltas(data: bytes) -> list[float]:
+    """encode_time_deltas 의 역변환 → 초 단위 리스트"""
+    deltas = []
+    value = shift = 0
+    for byte in bytes(data):
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        deltas.append(round(value * TIME_UNIT, 1))
+        value = shift = 0
+    if shift:
+        raise ValueError("truncated time delta")
+    return deltas
+
+
+def move_time_deltas(times: Iterable[datetime]) -> list[float]:
+    """
+    착수 시각 → 직전 수 이후 걸린 시간(초)
+    게임 시작 시각은 따로 남지 않으므로 첫 수는 0
+    """
+    deltas = []
+    previous = None
+    for moved_at in times:
+        deltas.append((moved_at - previous).total_seconds() if previous else 0.0)
+        previous = moved_at
+    return deltas
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+
+from ..board_session import BoardSessionCache
+from ..utils.omok import BLACK, EMPTY, WHITE
+
+N = 15
+
+
+def game(pk=1, board=None, version=0):
+    """Game 행 대신 쓰는 최소 객체 (pk, board, board_version, move_count)"""
+    board = board or EMPTY * (N * N)
+    return SimpleNamespace(
+        pk=pk,
+        board=board,
+        board_version=version,
+        move_count=len(board) - board.count(EMPTY),
+    )
+
+
+def set_cell(g, x, y, stone):
+    """Game.set_cell 과 동일하게 보드 갱신 + 버전 +1"""
+    i = y * N + x
+    g.board = g.board[:i] + stone + g.board[i + 1 :]
+    g.board_version += 1
+    g.move_count += 1
+
+
+class BoardSessionCacheTests(unittest.TestCase):
+    def test_session_is_reused_while_versions_match(self):
+        cache = BoardSessionCache()
+        g = game()
+        session = cache.get(g, N)
+        self.assertEqual(session.move_count, 0)
+
+        set_cell(g, 7, 7, BLACK)
+        session.apply_move(7, 7, BLACK)
+        again = cache.get(g, N)
+        self.assertIs(again, session)
+        self.assertEqual(again.move_count, 1)
+        self.assertEqual(again.board.get(7, 7), BLACK)
+
+    def test_version_mismatch_rebuilds_from_db_board(self):
+        cache = BoardSessionCache()
+        g = game()
+        session = cache.get(g, N)
+
+        # 다른 프로세스가 두 수를 둔 상황
+        set_cell(g, 7, 7, BLACK)
+        set_cell(g, 8, 8, WHITE)
+        rebuilt = cache.get(g, N)
+        self.assertIsNot(rebuilt, session)
+        self.assertEqual(rebuilt.version, 2)
+        self.assertEqual(rebuilt.move_count, 2)
+        self.assertEqual(rebuilt.board.get(8, 8), WHITE)
+
+    def test_discard_and_lru_eviction(self):
+        cache = BoardSessionCache(max_size=2)
+        g1, g2, g3 = game(1), game(2), game(3)
+        s1 = cache.get(g1, N)
+        cache.get(g2, N)
+        cache.get(g1, N)  # g1 최근 사용
+        cache.get(g3, N)  # g2 밀려남
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(g1, N), s1)
+
+        cache.discard(1)
+        self.assertIsNot(cache.get(g1, N), s1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from ..clock import DeadlineQueue, clock_deadline
+
+
+def game(turn="black", black_time=900, white_time=900, started_at=1000.0, **kwargs):
+    """Game 행 대신 쓰는 최소 객체 (시계 계산에 필요한 필드만)"""
+    fields = dict(
+        pk=1,
+        turn=turn,
+        winner=None,
+        black_id=1,
+        white_id=2,
+        black_time_remaining=black_time,
+        white_time_remaining=white_time,
+        last_move_time=datetime.fromtimestamp(started_at, tz=timezone.utc),
+    )
+    fields.update(kwargs)
+    return SimpleNamespace(**fields)
+
+
+class ClockDeadlineTests(unittest.TestCase):
+    def test_deadline_uses_current_turn_time(self):
+        self.assertEqual(clock_deadline(game("black", 300, 100)), 1300.0)
+        self.assertEqual(clock_deadline(game("white", 300, 100)), 1100.0)
+
+    def test_stopped_clock_has_no_deadline(self):
+        self.assertIsNone(clock_deadline(game(winner="white")))
+        self.assertIsNone(clock_deadline(game(white_id=None)))
+        self.assertIsNone(clock_deadline(game(last_move_time=None)))
+
+
+class DeadlineQueueTests(unittest.TestCase):
+    def test_pop_due_in_deadline_order(self):
+        queue = DeadlineQueue()
+        queue.schedule(1, 30.0)
+        queue.schedule(2, 10.0)
+        queue.schedule(3, 20.0)
+        self.assertEqual(queue.next_deadline(), 10.0)
+        self.assertEqual(queue.pop_due(25.0), [2, 3])
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.pop_due(25.0), [])
+        self.assertEqual(queue.pop_due(30.0), [1])
+        self.assertIsNone(queue.next_deadline())
+
+    def test_reschedule_and_cancel_drop_old_entries(self):
+        queue = DeadlineQueue()
+        self.assertTrue(queue.schedule(1, 10.0))
+        self.assertFalse(queue.schedule(2, 20.0))  # 가장 이른 마감은 그대로
+        self.assertFalse(queue.schedule(1, 50.0))  # 착수로 마감이 뒤로 밀림
+        self.assertEqual(queue.next_deadline(), 20.0)
+        queue.cancel(2)
+        self.assertEqual(queue.pop_due(40.0), [])
+        self.assertEqual(queue.pop_due(50.0), [1])
+
+    def test_earlier_deadline_reports_wakeup(self):
+        queue = DeadlineQueue()
+        queue.schedule(1, 100.0)
+        self.assertTrue(queue.schedule(2, 50.0))
+        self.assertFalse(queue.schedule(2, 50.0))  # 같은 값 재등록은 무시
+
+    def test_many_updates_keep_heap_bounded(self):
+        rng = random.Random(7)
+        queue = DeadlineQueue()
+        latest = {}
+        for _ in range(20000):
+            game_id = rng.randrange(100)
+            latest[game_id] = rng.uniform(0, 1000)
+            queue.schedule(game_id, latest[game_id])
+        self.assertLessEqual(len(queue.heap), 2 * len(queue) + 65)
+
+        expected = sorted(latest, key=latest.get)
+        self.assertEqual(queue.pop_due(1000.0), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
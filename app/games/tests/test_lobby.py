@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+from unittest.mock import patch
+
+from django.conf import settings
+
+if not settings.configured:  # DB/캐시가 필요한 테스트 - python manage.py test 로 실행
+    raise unittest.SkipTest("requires Django settings (python manage.py test)")
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test import TestCase  # noqa: E402
+
+from ..models import Game  # noqa: E402
+from ..utils import lobby  # noqa: E402
+
+User = get_user_model()
+
+
+class WaitingRoomsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(username="host", first_name="방장")
+
+    def open_room(self, title):
+        return Game.objects.create(title=title, black=self.host)
+
+    def room_titles(self):
+        return [room["title"] for room in lobby.get_waiting_rooms()]
+
+    def test_cached_until_invalidated(self):
+        self.open_room("첫 방")
+        self.assertEqual(self.room_titles(), ["첫 방"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.room_titles(), ["첫 방"])
+
+        # 캐시가 살아 있으면 새 방은 invalidate 전까지 보이지 않음
+        self.open_room("둘째 방")
+        self.assertEqual(self.room_titles(), ["첫 방"])
+
+        lobby.invalidate_waiting_rooms()
+        self.assertEqual(self.room_titles(), ["둘째 방", "첫 방"])
+
+    def test_invalidate_without_generation_key(self):
+        cache.delete(lobby.WAITING_ROOMS_GENERATION_KEY)
+        self.assertEqual(self.room_titles(), [])
+        self.open_room("방")
+        lobby.invalidate_waiting_rooms()
+        self.assertEqual(self.room_titles(), ["방"])
+
+    def test_read_overlapping_invalidate_does_not_cache_stale_list(self):
+        self.open_room("첫 방")
+        load = lobby.load_waiting_rooms
+
+        def load_then_room_opens():
+            # 조회가 DB 를 읽은 직후, 저장하기 전에 다른 요청이 방을 만들고 알림을 보냄
+            rooms = load()
+            self.open_room("둘째 방")
+            lobby.invalidate_waiting_rooms()
+            return rooms
+
+        with patch.object(lobby, "load_waiting_rooms", load_then_room_opens):
+            self.assertEqual(self.room_titles(), ["첫 방"])
+
+        # 늦게 저장된 옛 목록은 다음 조회에 쓰이지 않음
+        self.assertEqual(self.room_titles(), ["둘째 방", "첫 방"])
+
+
+def user(user_id, status="online", rating=1500, nickname=None):
+    return {
+        "user_id": user_id,
+        "nickname": nickname or f"user{user_id}",
+        "status": status,
+        "rating": rating,
+    }
+
+
+def by_id(*users):
+    return {u["user_id"]: u for u in users}
+
+
+class DiffUsersTests(unittest.TestCase):
+    def test_added(self):
+        self.assertEqual(
+            lobby.diff_users(by_id(user(1)), by_id(user(1), user(2))),
+            [{"op": "user_added", "user": user(2)}],
+        )
+
+    def test_removed(self):
+        self.assertEqual(
+            lobby.diff_users(by_id(user(1), user(2)), by_id(user(2))),
+            [{"op": "user_removed", "user_id": 1}],
+        )
+
+    def test_status_only(self):
+        self.assertEqual(
+            lobby.diff_users(by_id(user(1)), by_id(user(1, status="in_game"))),
+            [{"op": "user_status", "user_id": 1, "status": "in_game"}],
+        )
+
+    def test_profile_change_replaces_user(self):
+        # 상태 외 정보가 바뀌면 (상태가 같이 바뀌어도) 유저 전체를 다시 보냄
+        changed = user(1, status="in_game", rating=1520, nickname="새 닉네임")
+        self.assertEqual(
+            lobby.diff_users(by_id(user(1)), by_id(changed)),
+            [{"op": "user_added", "user": changed}],
+        )
+
+    def test_no_change(self):
+        self.assertEqual(lobby.diff_users(by_id(user(1)), by_id(user(1))), [])
+
+
+class UsersDeltaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [user(1)]
+        lobby_users = patch.object(lobby, "get_lobby_users", lambda: list(self.users))
+        lobby_users.start()
+        self.addCleanup(lobby_users.stop)
+
+    def build(self):
+        text = lobby.build_users_delta()
+        return json.loads(text) if text else None
+
+    def test_snapshot_then_delta(self):
+        first = self.build()
+        self.assertEqual((first["type"], first["users"]), ("users", [user(1)]))
+        self.assertIsNone(self.build())
+
+        self.users = [user(1), user(2)]
+        delta = self.build()
+        self.assertEqual(delta["type"], "users_delta")
+        self.assertEqual(
+            (delta["base"], delta["seq"]), (first["seq"], first["seq"] + 1)
+        )
+        self.assertEqual(delta["patches"], [{"op": "user_added", "user": user(2)}])
+        self.assertEqual(lobby.get_users_state()["seq"], delta["seq"])
+
+    def test_concurrent_save_rebases_delta(self):
+        base = self.build()["seq"]
+        self.users = [user(1), user(2)]
+        load = lobby.get_lobby_users
+        other = {}
+
+        def load_while_other_process_saves():
+            users = load()
+            if "delta" not in other:
+                # 이 프로세스가 목록을 읽은 뒤 저장 전에 다른 프로세스가 먼저 반영
+                other["delta"] = None
+                self.users = [user(1), user(2), user(3)]
+                other["delta"] = self.build()
+                self.users = [user(1), user(2), user(3), user(4)]
+            return users
+
+        with patch.object(lobby, "get_lobby_users", load_while_other_process_saves):
+            delta = self.build()
+
+        # 밀린 쪽은 옛 상태 기준 델타를 덮어쓰지 않고 다른 프로세스의 상태 위에서 다시 계산
+        self.assertEqual(other["delta"]["base"], base)
+        self.assertEqual(delta["base"], other["delta"]["seq"])
+        self.assertEqual(delta["patches"], [{"op": "user_added", "user": user(4)}])
+        state = lobby.get_users_state()
+        self.assertEqual(state["seq"], delta["seq"])
+        self.assertEqual(sorted(state["users"]), [1, 2, 3, 4])
+
+    def test_lost_race_does_not_skip_versions(self):
+        first = self.build()
+        self.users = [user(1), user(2)]
+        # 다른 프로세스가 다음 번호를 선점하고 아직 저장하지 않은 상태
+        cache.add(f"{lobby.USERS_SEQ_KEY}:{first['seq'] + 1}", True)
+        self.assertIsNone(self.build())
+        self.assertEqual(lobby.get_users_state()["seq"], first["seq"])
+
+        # 밀린 쪽은 번호를 소모하지 않음 → 이후 델타는 이어지는 번호로 저장됨
+        cache.set(lobby.USERS_STATE_KEY, {"seq": first["seq"] + 1, "users": {}})
+        delta = self.build()
+        self.assertEqual(
+            (delta["base"], delta["seq"]), (first["seq"] + 1, first["seq"] + 2)
+        )
+
+    def test_lost_state_continues_numbering(self):
+        first = self.build()
+        cache.delete(lobby.USERS_STATE_KEY)
+        snapshot = self.build()
+        self.assertEqual(snapshot["type"], "users")
+        self.assertEqual(snapshot["seq"], first["seq"] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from ..matchmaking import (
+    ACCEPT_TIMEOUT,
+    QUEUE_TIMEOUT,
+    MatchmakingService,
+    MatchStatus,
+    QueueEntry,
+    RedisMatchmakingService,
+    get_rating_range,
+    pair_queue,
+    pair_queue_optimal,
+)
+
+try:
+    import fakeredis
+except ImportError:  # 개발 의존성 (pip install -e ".[dev]")
+    fakeredis = None
+
+
+def join(service, user_id, rating=1000):
+    return service.add_to_queue(
+        user_id=user_id,
+        rating=rating,
+        channel_name=f"channel-{user_id}",
+        nickname=f"user{user_id}",
+        username=f"user{user_id}",
+    )
+
+
+def entry(user_id, rating, joined_at):
+    return QueueEntry(
+        user_id=user_id,
+        rating=rating,
+        channel_name="",
+        nickname="",
+        username="",
+        joined_at=joined_at,
+    )
+
+
+class PairQueueTests(unittest.TestCase):
+    def test_pairs_closest_mutual_candidate_oldest_first(self):
+        now = 1000.0
+        entries = [
+            entry(1, 1000, now - 10),  # 가장 오래 기다림 → 먼저 고름
+            entry(2, 1040, now - 5),
+            entry(3, 1010, now - 1),
+            entry(4, 1500, now - 1),  # 범위 밖
+        ]
+        pairs = pair_queue(entries, now)
+        self.assertEqual([(a.user_id, b.user_id) for a, b in pairs], [(1, 3)])
+
+    def test_candidate_range_must_cover_me(self):
+        now = 1000.0
+        # 1번은 오래 기다려 범위가 넓지만, 2번은 막 들어와서 ±50 범위
+        entries = [entry(1, 1000, now - 200), entry(2, 1100, now)]
+        self.assertEqual(pair_queue(entries, now), [])
+
+    def test_random_queue_pairs_are_valid(self):
+        rng = random.Random(7)
+        now = 10000.0
+        entries = [
+            entry(uid, int(rng.gauss(1200, 150)), now - rng.uniform(0, 120))
+            for uid in range(500)
+        ]
+        pairs = pair_queue(entries, now)
+        self.assertValidPairs(pairs, now)
+        self.assertGreater(len(pairs), 200)
+
+    def assertValidPairs(self, pairs, now):
+        seen = set()
+        for a, b in pairs:
+            self.assertTrue(seen.isdisjoint((a.user_id, b.user_id)))
+            seen.update((a.user_id, b.user_id))
+            for me, other in ((a, b), (b, a)):
+                lo, hi = get_rating_range(me.rating, int(now - me.joined_at))
+                self.assertTrue(lo <= other.rating <= hi)
+
+    def test_optimal_pairs_more_players_than_greedy(self):
+        now = 1000.0
+        # 그리디: 가장 오래 기다린 1000 이 가장 가까운 1040 을 가져가서 950/1090 이 남음
+        entries = [
+            entry(1, 1000, now - 10),
+            entry(2, 950, now - 1),
+            entry(3, 1040, now - 1),
+            entry(4, 1090, now - 1),
+        ]
+        self.assertEqual(len(pair_queue(entries, now)), 1)
+        pairs = pair_queue_optimal(entries, now)
+        self.assertEqual(
+            sorted((a.user_id, b.user_id) for a, b in pairs), [(2, 1), (3, 4)]
+        )
+
+    def test_optimal_prefers_long_waiting_players(self):
+        now = 1000.0
+        # 1010 은 1000/1020 누구와도 짝 가능 → 오래 기다린 1020 과 짝지음
+        entries = [
+            entry(1, 1000, now - 1),
+            entry(2, 1010, now - 1),
+            entry(3, 1020, now - 30),
+        ]
+        pairs = pair_queue_optimal(entries, now)
+        self.assertEqual([(a.user_id, b.user_id) for a, b in pairs], [(2, 3)])
+
+    def test_optimal_long_wait_does_not_reduce_pair_count(self):
+        now = 10000.0
+        # 600초 넘게 기다린 유저의 대기 점수가 커도 짝 수(2)를 줄이지 않음
+        entries = [
+            entry(1, 1261, now),
+            entry(2, 1189, now - 5),
+            entry(3, 1154, now - 5),
+            entry(4, 1154, now - 600),
+            entry(5, 1064, now - 600),
+            entry(6, 1364, now - 1500),
+        ]
+        pairs = pair_queue_optimal(entries, now)
+        self.assertValidPairs(pairs, now)
+        self.assertEqual(len(pairs), 2)
+
+    def test_optimal_pair_count_matches_unweighted(self):
+        # 대기 가중치는 같은 짝 수 안에서 누구를 고를지만 바꿈
+        rng = random.Random(5)
+        for _ in range(2000):
+            now = 10000.0
+            entries = [
+                entry(
+                    uid,
+                    int(rng.gauss(1200, 100)),
+                    now - rng.choice([0, 5, 60, 600, 1500]),
+                )
+                for uid in range(rng.randint(2, 8))
+            ]
+            weighted = len(pair_queue_optimal(entries, now))
+            with patch("app.games.matchmaking.OPTIMAL_WAIT_WEIGHT", 0.0):
+                unweighted = len(pair_queue_optimal(entries, now))
+            self.assertEqual(weighted, unweighted)
+
+    def test_optimal_random_queue_pairs_are_valid(self):
+        rng = random.Random(11)
+        now = 10000.0
+        entries = [
+            entry(uid, int(rng.gauss(1200, 150)), now - rng.uniform(0, 120))
+            for uid in range(500)
+        ]
+        optimal = pair_queue_optimal(entries, now)
+        self.assertValidPairs(optimal, now)
+        self.assertGreaterEqual(len(optimal), len(pair_queue(entries, now)))
+
+
+class MatchmakingBackendTests:
+    """두 백엔드가 같은 동작을 하는지 확인하는 공통 테스트"""
+
+    def make_service(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.service = self.make_service()
+
+    def test_queue_add_remove(self):
+        self.assertTrue(join(self.service, 1))
+        self.assertFalse(join(self.service, 1))  # 중복 진입 거부
+        self.assertEqual(self.service.get_queue_size(), 1)
+        self.assertEqual(self.service.get_queued_user_ids(), {1})
+        self.assertEqual(self.service.get_queue_entry(1).channel_name, "channel-1")
+        self.assertTrue(self.service.remove_from_queue(1))
+        self.assertFalse(self.service.remove_from_queue(1))
+        self.assertIsNone(self.service.get_queue_entry(1))
+
+    def test_find_match_respects_rating_range(self):
+        join(self.service, 1, rating=1000)
+        join(self.service, 2, rating=1400)  # 범위 밖
+        self.assertIsNone(self.service.find_match(1))
+        join(self.service, 3, rating=1030)
+        self.assertEqual(self.service.find_match(1).user_id, 3)
+
+    def test_match_can_only_be_claimed_once(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        join(self.service, 3)
+        p1, p2, p3 = (self.service.get_queue_entry(uid) for uid in (1, 2, 3))
+
+        match_id = self.service.create_pending_match(p1, p2)
+        self.assertIsNotNone(match_id)
+        self.assertEqual(self.service.get_queue_size(), 1)
+        # 이미 매칭된 유저는 다시 가져갈 수 없음
+        self.assertIsNone(self.service.create_pending_match(p3, p2))
+        self.assertEqual(self.service.get_queued_user_ids(), {3})
+        # 매칭 중에는 큐에 다시 들어갈 수 없음
+        self.assertFalse(join(self.service, 1))
+        self.assertEqual(self.service.get_user_match(2).match_id, match_id)
+
+    def test_accept_then_confirm_once(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        match_id = self.service.create_pending_match(
+            self.service.get_queue_entry(1), self.service.get_queue_entry(2)
+        )
+        self.assertEqual(self.service.accept_match(match_id, 1), MatchStatus.WAITING)
+        self.assertEqual(self.service.accept_match(match_id, 2), MatchStatus.CONFIRMED)
+
+        match = self.service.confirm_and_cleanup(match_id)
+        self.assertEqual({match.player1.user_id, match.player2.user_id}, {1, 2})
+        self.assertIsNone(self.service.get_pending_match(match_id))
+        self.assertTrue(join(self.service, 1))  # 매칭 종료 후 다시 진입 가능
+
+    def test_decline_returns_other_player(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        match_id = self.service.create_pending_match(
+            self.service.get_queue_entry(1), self.service.get_queue_entry(2)
+        )
+        status, other = self.service.decline_match(match_id, 1)
+        self.assertEqual(status, MatchStatus.DECLINED)
+        self.assertEqual(other.user_id, 2)
+        self.assertEqual(other.channel_name, "channel-2")
+        # 두 번째 거절은 아무 것도 돌려주지 않음
+        self.assertEqual(
+            self.service.decline_match(match_id, 2), (MatchStatus.DECLINED, None)
+        )
+        self.assertEqual(self.service.accept_match(match_id, 2), MatchStatus.DECLINED)
+
+    def test_cleanup_user_declines_pending_match(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        match_id = self.service.create_pending_match(
+            self.service.get_queue_entry(1), self.service.get_queue_entry(2)
+        )
+        self.service.cleanup_user(1)
+        self.assertIsNone(self.service.get_pending_match(match_id))
+        self.assertIsNone(self.service.get_user_match(2))
+
+    def test_queue_entries_snapshot(self):
+        join(self.service, 1, rating=1000)
+        join(self.service, 2, rating=1010)
+        entries = self.service.get_queue_entries()
+        self.assertEqual(sorted(e.user_id for e in entries), [1, 2])
+        pairs = pair_queue(entries, max(e.joined_at for e in entries))
+        self.assertEqual(len(pairs), 1)
+
+    def make_match(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        return self.service.create_pending_match(
+            self.service.get_queue_entry(1), self.service.get_queue_entry(2)
+        )
+
+    def test_unanswered_match_expires(self):
+        match_id = self.make_match()
+        self.service.accept_match(match_id, 2)
+        self.assertEqual(self.service.get_pending_count(), 1)
+
+        # 마감 전에는 그대로
+        self.assertEqual(self.service.expire_pending_matches(time.time()), [])
+        later = time.time() + ACCEPT_TIMEOUT + 1
+        [expired] = self.service.expire_pending_matches(later)
+        self.assertEqual(expired.match_id, match_id)
+        self.assertFalse(expired.player1_accepted)
+        self.assertTrue(expired.player2_accepted)
+
+        self.assertEqual(self.service.get_pending_count(), 0)
+        self.assertIsNone(self.service.get_user_match(1))
+        self.assertEqual(self.service.expire_pending_matches(later), [])
+        self.assertTrue(join(self.service, 1))  # 더 이상 막히지 않음
+
+    def test_finished_match_is_not_expired(self):
+        match_id = self.make_match()
+        self.service.decline_match(match_id, 1)
+        later = time.time() + ACCEPT_TIMEOUT + 1
+        self.assertEqual(self.service.expire_pending_matches(later), [])
+        self.assertEqual(self.service.get_pending_count(), 0)
+
+    def test_stale_queue_entries_expire(self):
+        join(self.service, 1)
+        joined_at = self.service.get_queue_entry(1).joined_at
+        join(self.service, 2)
+        self.service.remove_from_queue(2)
+
+        self.assertEqual(self.service.expire_queue_entries(joined_at + 1), [])
+        expired = self.service.expire_queue_entries(joined_at + QUEUE_TIMEOUT + 1)
+        self.assertEqual([e.user_id for e in expired], [1])
+        self.assertEqual(self.service.get_queue_size(), 0)
+
+
+class InMemoryMatchmakingTests(MatchmakingBackendTests, unittest.TestCase):
+    def make_service(self):
+        service = MatchmakingService()
+        # 싱글톤 상태 초기화
+        service.reset()
+        return service
+
+    def test_rating_index_tracks_queue(self):
+        for uid, rating in [(1, 1200), (2, 900), (3, 1050)]:
+            join(self.service, uid, rating)
+        self.assertEqual([key[2] for key in self.service.rating_index], [2, 3, 1])
+        self.service.remove_from_queue(3)
+        self.assertEqual([key[2] for key in self.service.rating_index], [2, 1])
+
+    def test_longest_waiting_candidate_wins(self):
+        # 2번이 3번보다 먼저 들어옴 → Rating 이 더 가까운 3번이 아닌 2번과 매칭
+        with patch("time.time", side_effect=[100.0, 101.0, 102.0, 103.0]):
+            join(self.service, 2, rating=1040)
+            join(self.service, 3, rating=1010)
+            join(self.service, 1, rating=1000)
+            self.assertEqual(self.service.find_match(1).user_id, 2)
+
+    def test_requeued_user_keeps_new_deadline(self):
+        # 나갔다 다시 들어오면 예전 마감 시각으로 쫓겨나지 않음
+        with patch("time.time", side_effect=[100.0, 200.0]):
+            join(self.service, 1)
+            self.service.remove_from_queue(1)
+            join(self.service, 1)
+        self.assertEqual(
+            self.service.expire_queue_entries(100.0 + QUEUE_TIMEOUT + 1), []
+        )
+        self.assertEqual(
+            len(self.service.expire_queue_entries(200.0 + QUEUE_TIMEOUT + 1)), 1
+        )
+        self.assertEqual(self.service.queue_deadlines, [])
+
+
+@unittest.skipUnless(fakeredis, "fakeredis 미설치")
+class RedisMatchmakingTests(MatchmakingBackendTests, unittest.TestCase):
+    def make_service(self):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        return RedisMatchmakingService(client, prefix="test-mm")
+
+    def test_two_services_share_one_queue(self):
+        # 서로 다른 프로세스를 흉내: 같은 Redis, 다른 서비스 인스턴스
+        other = RedisMatchmakingService(self.service.redis, prefix="test-mm")
+        join(self.service, 1)
+        join(other, 2)
+        opponent = other.find_match(2)
+        self.assertEqual(opponent.channel_name, "channel-1")
+        me = other.get_queue_entry(2)
+        self.assertIsNotNone(other.create_pending_match(me, opponent))
+        self.assertIsNone(self.service.create_pending_match(opponent, me))
+
+    def test_tick_lease_has_single_owner(self):
+        self.assertTrue(self.service.acquire_tick_lease("a", ttl=5))
+        self.assertTrue(self.service.acquire_tick_lease("a", ttl=5))  # 연장
+        self.assertFalse(self.service.acquire_tick_lease("b", ttl=5))
+        self.service.redis.delete(self.service.leader_key)  # 만료
+        self.assertTrue(self.service.acquire_tick_lease("b", ttl=5))
+
+    def test_pending_match_has_ttl(self):
+        join(self.service, 1)
+        join(self.service, 2)
+        match_id = self.service.create_pending_match(
+            self.service.get_queue_entry(1), self.service.get_queue_entry(2)
+        )
+        ttl = self.service.redis.ttl(self.service._match_key(match_id))
+        self.assertTrue(0 < ttl <= RedisMatchmakingService.MATCH_TTL)
+
+
+if __name__ == "__main__":
+    unittest.main()
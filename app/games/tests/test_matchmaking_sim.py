@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from .. import matchmaking
+from ..matchmaking import MatchmakingService, get_rating_range
+from ..matchmaking_sim import SimConfig, percentile, simulate
+
+
+class SimulationTests(unittest.TestCase):
+    def test_same_seed_same_result(self):
+        config = SimConfig(duration=120, arrival_rate=1.0)
+        a, b = simulate(config).summary(), simulate(config).summary()
+        for key in (
+            "arrivals",
+            "matches",
+            "declines",
+            "accept_timeouts",
+            "latency_p90",
+        ):
+            self.assertEqual(a[key], b[key])
+
+    def test_every_arrival_is_accounted_for(self):
+        config = SimConfig(duration=300, arrival_rate=1.0, no_response_prob=0.1)
+        result = simulate(config)
+        self.assertGreater(result.matches, 0)
+        self.assertGreater(result.accept_timeouts, 0)
+        self.assertEqual(len(result.latencies), 2 * result.matches)
+        self.assertEqual(len(result.gaps), result.matches)
+        # 확정 매치는 항상 최대 범위 안
+        self.assertLessEqual(max(result.gaps), config.max_range)
+        self.assertEqual(len(result.tick_cpu), len(result.queue_lengths))
+
+    def test_range_settings_are_restored(self):
+        before = get_rating_range(1000, 600)
+        result = simulate(SimConfig(duration=60, max_range=80))
+        self.assertLessEqual(max(result.gaps, default=0), 80)
+        self.assertEqual(get_rating_range(1000, 600), before)
+        self.assertEqual(matchmaking.MAX_RANGE, SimConfig().max_range)
+
+    def test_singleton_is_untouched(self):
+        service = MatchmakingService()
+        service.reset()
+        simulate(SimConfig(duration=30))
+        self.assertEqual(service.get_queue_size(), 0)
+        self.assertIsNone(service.clock)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+        self.assertEqual(percentile([5], 99), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
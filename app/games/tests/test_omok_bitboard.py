@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from ..utils.omok import (
+    BLACK,
+    DIRECTIONS,
+    EMPTY,
+    WHITE,
+    BitBoard,
+    _has_open_four_on_dir,
+    _has_open_three_on_dir,
+    _run_length_from,
+)
+
+
+def random_board(rng, n=15, density=0.35):
+    """무작위 보드 (흑/백 비율 반반)"""
+    return [
+        [
+            rng.choice((BLACK, WHITE)) if rng.random() < density else EMPTY
+            for _ in range(n)
+        ]
+        for _ in range(n)
+    ]
+
+
+# --- 문자열 기반 참조 판정 (비트보드 도입 전 구현) ---
+def ref_exact_five(board, x, y, stone):
+    exact = False
+    for dx, dy in DIRECTIONS:
+        run = _run_length_from(board, x, y, dx, dy, stone)
+        if run >= 6:
+            return False
+        if run == 5:
+            exact = True
+    return exact
+
+
+def ref_open_four_dirs(board, x, y, stone):
+    board[x][y] = stone
+    try:
+        return sum(
+            _has_open_four_on_dir(board, x, y, dx, dy, stone) for dx, dy in DIRECTIONS
+        )
+    finally:
+        board[x][y] = EMPTY
+
+
+def ref_double_three(board, x, y, stone):
+    board[x][y] = stone
+    try:
+        dirs = sum(
+            _has_open_three_on_dir(board, x, y, dx, dy, stone) for dx, dy in DIRECTIONS
+        )
+        return dirs >= 2
+    finally:
+        board[x][y] = EMPTY
+
+
+class BitBoardEquivalenceTests(unittest.TestCase):
+    """비트보드 판정이 기존 문자열 기반 판정과 같은지 무작위 보드로 검증"""
+
+    def test_string_and_2d_constructors_agree(self):
+        rng = random.Random(0)
+        bd = random_board(rng)
+        n = len(bd)
+        # Game.board 문자열 인덱스 = y * n + x
+        s = "".join(bd[i % n][i // n] for i in range(n * n))
+        self.assertEqual(BitBoard.from_string(s, n).to_board(), bd)
+
+    def test_rules_match_reference(self):
+        rng = random.Random(42)
+        for density in (0.1, 0.25, 0.4):
+            for _ in range(40):
+                bd = random_board(rng, density=density)
+                bb = BitBoard.from_board(bd)
+                n = len(bd)
+                for _ in range(15):
+                    x, y = rng.randrange(n), rng.randrange(n)
+                    if bd[x][y] != EMPTY:
+                        continue
+                    for stone in (BLACK, WHITE):
+                        with self.subTest(density=density, x=x, y=y, stone=stone):
+                            for d, (dx, dy) in enumerate(DIRECTIONS):
+                                self.assertEqual(
+                                    bb.run_length(x, y, d, stone),
+                                    _run_length_from(bd, x, y, dx, dy, stone),
+                                )
+                            self.assertEqual(
+                                bb.has_exact_five(x, y, stone),
+                                ref_exact_five(bd, x, y, stone),
+                            )
+                            self.assertEqual(
+                                bb.count_open_four_dirs(x, y, stone),
+                                ref_open_four_dirs(bd, x, y, stone),
+                            )
+                    self.assertEqual(
+                        bb.is_forbidden_double_three(x, y, BLACK),
+                        ref_double_three(bd, x, y, BLACK),
+                    )
+
+    def test_winning_line_matches_full_board_check(self):
+        # 무작위 대국을 진행하며 마지막 수 기준 판정과 보드 전체 판정을 비교
+        rng = random.Random(3)
+        for _ in range(60):
+            bb = BitBoard()
+            cells = [(x, y) for x in range(15) for y in range(15)]
+            rng.shuffle(cells)
+            stone = BLACK
+            for x, y in cells:
+                bd = bb.to_board()
+                bd[x][y] = stone
+                bb.place(x, y, stone)
+                line = bb.winning_line(x, y, stone)
+                if stone == BLACK:
+                    self.assertEqual(bool(line), ref_exact_five(bd, x, y, BLACK))
+                else:
+                    self.assertEqual(bool(line), bb.has_five(WHITE))
+                if line:
+                    self.assertIn((x, y), line)
+                    self.assertTrue(all(bd[i][j] == stone for i, j in line))
+                    break
+                if stone == BLACK and bb.has_five(BLACK):
+                    break  # 흑 장목 등으로 게임이 의미 없어진 경우
+                stone = WHITE if stone == BLACK else BLACK
+
+    def test_place_and_remove_roundtrip(self):
+        bb = BitBoard()
+        bb.place(7, 7, BLACK)
+        self.assertEqual(bb.get(7, 7), BLACK)
+        bb.remove(7, 7, BLACK)
+        self.assertEqual(bb.get(7, 7), EMPTY)
+        self.assertFalse(any(bb.masks[BLACK]))
+
+    def test_small_board_edges(self):
+        # 작은 보드에서도 경계 밖 칸이 돌/빈칸으로 새지 않아야 한다
+        rng = random.Random(7)
+        for _ in range(200):
+            bd = random_board(rng, n=5, density=0.5)
+            bb = BitBoard.from_board(bd)
+            for x in range(5):
+                for y in range(5):
+                    if bd[x][y] != EMPTY:
+                        continue
+                    self.assertEqual(
+                        bb.is_forbidden_double_three(x, y, BLACK),
+                        ref_double_three(bd, x, y, BLACK),
+                    )
+                    self.assertEqual(
+                        bb.count_open_four_dirs(x, y, BLACK),
+                        ref_open_four_dirs(bd, x, y, BLACK),
+                    )
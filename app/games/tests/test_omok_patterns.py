@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import unittest
+from itertools import product
+
+from ..utils.omok import (
+    PAT_FIVE,
+    PAT_OPEN_FOUR,
+    PAT_OVERLINE,
+    PAT_THREE,
+    PATTERN_TABLE,
+    SPAN,
+    WINDOW_CELLS,
+    _has_open_four_on_dir_str,
+    window_key,
+)
+
+# 3진수 digit → 문자열 셀 (0 = 막힘, 1 = 내 돌, 2 = 빈칸)
+CELLS = "XB."
+THREES = (".BBB.", ".BB.B.", ".B.BB.")
+
+
+def center_run(s):
+    """문자열 윈도우 중심을 지나는 'B' 연속 길이"""
+    if s[SPAN] != "B":
+        return 0
+    lo = hi = SPAN
+    while lo > 0 and s[lo - 1] == "B":
+        lo -= 1
+    while hi < len(s) - 1 and s[hi + 1] == "B":
+        hi += 1
+    return hi - lo + 1
+
+
+def expected_flags(s):
+    flags = 0
+    if _has_open_four_on_dir_str(s, None, "B"):
+        flags |= PAT_OPEN_FOUR
+    if any(p in s for p in THREES):
+        flags |= PAT_THREE
+    run = center_run(s)
+    if run >= 5:
+        flags |= PAT_FIVE
+    if run >= 6:
+        flags |= PAT_OVERLINE
+    return flags
+
+
+class PatternTableTests(unittest.TestCase):
+    def test_table_matches_string_rules_exhaustively(self):
+        # product 는 마지막 자리가 가장 빨리 변하므로 enumerate 순서 = 3진수 키 순서
+        self.assertEqual(len(PATTERN_TABLE), 3**WINDOW_CELLS)
+        mismatches = []
+        for key, digits in enumerate(product(CELLS, repeat=WINDOW_CELLS)):
+            s = "".join(reversed(digits))
+            if PATTERN_TABLE[key] != expected_flags(s):
+                mismatches.append(s)
+                if len(mismatches) >= 10:
+                    break
+        self.assertEqual(mismatches, [])
+
+    def test_window_key_matches_base3_encoding(self):
+        cases = ["XXXXXXXXXXXXX", ".............", "BBBBBBBBBBBBB", "X.B.BB.BBX..B"]
+        for s in cases:
+            mine = sum(1 << i for i, c in enumerate(s) if c == "B")
+            empty = sum(1 << i for i, c in enumerate(s) if c == ".")
+            expected = sum(CELLS.index(c) * 3**i for i, c in enumerate(s))
+            with self.subTest(s=s):
+                self.assertEqual(window_key(mine, empty), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
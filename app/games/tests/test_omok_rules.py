@@ -7,6 +7,7 @@ from ..utils.omok import (
     EMPTY,
     WHITE,
     check_five,
+    find_winning_line,
     has_exact_five,
     is_forbidden_double_four,
     is_forbidden_double_three,
@@ -54,6 +55,29 @@ class OmokRuleTests(unittest.TestCase):
         put(bd, [(3, 3), (3, 4), (3, 5), (3, 6), (3, 7)], WHITE)
         self.assertTrue(check_five(bd, WHITE))
 
+    # ---------- 마지막 수 기준 승리 줄 ----------
+    def test_winning_line_returns_coords(self):
+        bd = board()
+        put(bd, [(2, 2), (3, 3), (4, 4), (5, 5), (6, 6)], WHITE)
+        self.assertEqual(
+            find_winning_line(bd, 4, 4, WHITE),
+            [(2, 2), (3, 3), (4, 4), (5, 5), (6, 6)],
+        )
+        # 5목과 무관한 곳에 둔 수는 승리 줄이 없음
+        put(bd, [(10, 10)], WHITE)
+        self.assertIsNone(find_winning_line(bd, 10, 10, WHITE))
+
+    def test_winning_line_black_exact_white_overline(self):
+        bd = board()
+        coords = [(7, 9), (6, 10), (5, 11), (4, 12), (3, 13), (2, 14)]  # ↗ 6목
+        put(bd, coords, WHITE)
+        self.assertEqual(find_winning_line(bd, 5, 11, WHITE), sorted(coords))
+        # 흑 장목은 승리가 아님
+        bd2 = put(board(), coords, BLACK)
+        self.assertIsNone(find_winning_line(bd2, 5, 11, BLACK))
+        bd3 = put(board(), coords[:5], BLACK)
+        self.assertEqual(len(find_winning_line(bd3, 3, 13, BLACK)), 5)
+
     # ---------- 33(쌍삼) ----------
     def test_double_three_black_only(self):
         # 동일 배치에서 백은 금수 아님, 흑은 금수
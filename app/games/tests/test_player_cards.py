@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from django.conf import settings
+
+if not settings.configured:  # DB/캐시가 필요한 테스트 - python manage.py test 로 실행
+    raise unittest.SkipTest("requires Django settings (python manage.py test)")
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test import TestCase  # noqa: E402
+
+from app.accounts.forms import ProfileEditForm  # noqa: E402
+from app.accounts.models import UserProfile  # noqa: E402
+from ..models import Game  # noqa: E402
+from ..player_cards import player_card_key  # noqa: E402
+from ..utils.consumers import build_game_state, update_user_stats  # noqa: E402
+
+User = get_user_model()
+
+
+class PlayerCardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.black = User.objects.create(username="black", first_name="흑돌")
+        self.white = User.objects.create(username="white", first_name="백돌")
+        UserProfile.objects.create(user=self.black, rating=1300)
+        UserProfile.objects.create(user=self.white, rating=1300)
+        game = Game.objects.create(title="대국", black=self.black, white=self.white)
+        # 소켓에서 쓰는 것처럼 플레이어를 불러오지 않은 게임
+        self.game = Game.objects.get(pk=game.pk)
+
+    def state(self):
+        return build_game_state(self.game)
+
+    def test_warm_cache_state_has_no_queries(self):
+        with self.assertNumQueries(1):
+            cold = self.state()
+        with self.assertNumQueries(0):
+            warm = self.state()
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm["black_player"], "흑돌")
+        self.assertEqual(warm["white_rating"], 1300)
+
+    def test_result_evicts_cards_after_commit(self):
+        before = self.state()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = update_user_stats(self.black, self.white, "black")
+            # 커밋 전에는 카드 유지 (다른 요청이 커밋 전 값을 다시 캐시하지 않도록)
+            self.assertIsNotNone(cache.get(player_card_key(self.black.id)))
+        self.assertIsNone(cache.get(player_card_key(self.black.id)))
+        self.assertIsNone(cache.get(player_card_key(self.white.id)))
+
+        after = self.state()
+        self.assertEqual(after["black_rating"], result["black_rating"])
+        self.assertEqual(after["white_rating"], result["white_rating"])
+        self.assertNotEqual(after["black_rating"], before["black_rating"])
+        self.assertEqual(after["black_total_games"], before["black_total_games"] + 1)
+
+    def test_profile_edit_evicts_card(self):
+        self.state()
+        form = ProfileEditForm(data={"nickname": "새 닉네임"}, user=self.black)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(self.state()["black_player"], "새 닉네임")
+
+
+if __name__ == "__main__":
+    unittest.main()
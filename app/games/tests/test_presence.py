@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from ..presence import (
+    PRESENCE_TTL,
+    LastSeenTracker,
+    PresenceRegistry,
+    RedisLastSeenTracker,
+    RedisPresenceRegistry,
+)
+
+try:
+    import fakeredis
+except ImportError:  # 개발 의존성 (pip install -e ".[dev]")
+    fakeredis = None
+
+
+def user(user_id):
+    return {
+        "user_id": user_id,
+        "nickname": f"user{user_id}",
+        "username": f"user{user_id}",
+    }
+
+
+class PresenceRegistryTests:
+    """두 백엔드가 같은 동작을 하는지 확인하는 공통 테스트"""
+
+    def make_registry(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.registry = self.make_registry()
+
+    def test_add_and_lookup(self):
+        self.registry.add("ch-1", user(1))
+        self.registry.add("ch-2", user(2))
+        self.assertEqual(self.registry.get_channels(1), ["ch-1"])
+        self.assertEqual(self.registry.get_channels(3), [])
+        self.assertEqual(self.registry.get_user(2)["nickname"], "user2")
+        self.assertIsNone(self.registry.get_user(3))
+        self.assertEqual(self.registry.get_online_user_ids(), {1, 2})
+        self.assertEqual(
+            sorted(u["user_id"] for u in self.registry.get_online_users()), [1, 2]
+        )
+
+    def test_user_stays_online_until_last_channel_leaves(self):
+        self.registry.add("tab-a", user(1))
+        self.registry.add("tab-b", user(1))
+        self.assertEqual(sorted(self.registry.get_channels(1)), ["tab-a", "tab-b"])
+
+        self.registry.remove("tab-a", 1)
+        self.assertEqual(self.registry.get_channels(1), ["tab-b"])
+        self.assertEqual(self.registry.get_online_user_ids(), {1})
+
+        self.registry.remove("tab-b", 1)
+        self.assertEqual(self.registry.get_online_user_ids(), set())
+        self.assertIsNone(self.registry.get_user(1))
+        self.registry.remove("tab-b", 1)  # 두 번 해제해도 문제 없음
+
+
+class InMemoryPresenceTests(PresenceRegistryTests, unittest.TestCase):
+    def make_registry(self):
+        return PresenceRegistry()
+
+
+@unittest.skipUnless(fakeredis, "fakeredis 미설치")
+class RedisPresenceTests(PresenceRegistryTests, unittest.TestCase):
+    def make_registry(self):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        return RedisPresenceRegistry(client, prefix="test-presence")
+
+    def test_processes_share_registry(self):
+        # 서로 다른 프로세스를 흉내: 같은 Redis, 다른 레지스트리 인스턴스
+        other = RedisPresenceRegistry(self.registry.redis, prefix="test-presence")
+        self.registry.add("proc1-ch", user(1))
+        other.add("proc2-ch", user(1))
+        other.add("proc2-ch2", user(2))
+        self.assertEqual(
+            sorted(self.registry.get_channels(1)), ["proc1-ch", "proc2-ch"]
+        )
+        self.assertEqual(self.registry.get_online_user_ids(), {1, 2})
+        other.remove("proc2-ch", 1)
+        self.assertEqual(self.registry.get_online_user_ids(), {1, 2})
+
+    def test_dead_process_expires_after_ttl(self):
+        now = time.time()
+        self.registry.add("ch-1", user(1), now=now)
+        self.registry.add("ch-2", user(2), now=now)
+        later = now + PRESENCE_TTL + 1
+
+        # 1번 채널을 가진 프로세스만 살아서 갱신
+        self.registry._local.pop("ch-2")
+        self.registry.refresh(now=later - 2)
+        self.assertEqual(self.registry.get_online_user_ids(now=later), {1})
+        self.assertEqual(self.registry.get_channels(2, now=later), [])
+        self.assertEqual(
+            [u["user_id"] for u in self.registry.get_online_users(now=later)], [1]
+        )
+        self.assertIsNone(self.registry.get_user(2))  # 만료된 유저 정보 정리됨
+
+
+class LastSeenTrackerTests:
+    """하트비트 기록 공통 테스트 (timeout 60초)"""
+
+    def make_tracker(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tracker = self.make_tracker()
+
+    def test_touch_updates_only_own_entry(self):
+        now = 1000.0
+        self.tracker.touch(user(1), now=now)
+        self.tracker.touch(user(2), now=now + 10)
+        self.tracker.touch(user(1), now=now + 20)
+
+        online = self.tracker.get_online(now=now + 30)
+        self.assertEqual(sorted(online), [1, 2])
+        self.assertEqual(online[1]["last_seen"], now + 20)
+        self.assertEqual(online[2]["nickname"], "user2")
+        self.assertEqual(self.tracker.count_online(now=now + 30), 2)
+
+    def test_expired_entries_drop_out(self):
+        now = 1000.0
+        self.tracker.touch(user(1), now=now)
+        self.tracker.touch(user(2), now=now + 50)
+        self.assertEqual(list(self.tracker.get_online(now=now + 70)), [2])
+        self.assertEqual(self.tracker.count_online(now=now + 70), 1)
+        self.assertEqual(self.tracker.get_online(now=now + 200), {})
+
+    def test_remove(self):
+        self.tracker.touch(user(1))
+        self.tracker.remove(1)
+        self.tracker.remove(1)  # 없는 유저 삭제도 문제 없음
+        self.assertEqual(self.tracker.get_online(), {})
+
+
+class InMemoryLastSeenTests(LastSeenTrackerTests, unittest.TestCase):
+    def make_tracker(self):
+        return LastSeenTracker(timeout=60)
+
+
+@unittest.skipUnless(fakeredis, "fakeredis 미설치")
+class RedisLastSeenTests(LastSeenTrackerTests, unittest.TestCase):
+    def make_tracker(self):
+        client = fakeredis.FakeRedis(decode_responses=True)
+        return RedisLastSeenTracker(client, "test-heartbeat", timeout=60)
+
+    def test_expired_entries_are_pruned(self):
+        self.tracker.touch(user(1), now=1000.0)
+        self.tracker.get_online(now=2000.0)
+        self.assertEqual(self.tracker.redis.zcard("test-heartbeat"), 0)
+        self.assertEqual(self.tracker.redis.hlen("test-heartbeat:info"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import datetime, timedelta
+
+from ..replay import (
+    decode_moves,
+    decode_time_deltas,
+    encode_moves,
+    encode_time_deltas,
+    move_time_deltas,
+)
+
+N = 15
+
+
+class MoveEncodingTests(unittest.TestCase):
+    def test_one_byte_per_move_round_trip(self):
+        moves = [(7, 7), (0, 0), (14, 14), (14, 0), (0, 14)]
+        data = encode_moves(moves, N)
+        self.assertEqual(len(data), len(moves))
+        self.assertEqual(data[0], 7 * N + 7)
+        self.assertEqual(decode_moves(data, N), moves)
+
+    def test_full_board_fits_in_bytes(self):
+        moves = [(x, y) for y in range(N) for x in range(N)]
+        self.assertEqual(decode_moves(encode_moves(moves, N), N), moves)
+        self.assertEqual(decode_moves(b"", N), [])
+
+    def test_rejects_board_larger_than_byte(self):
+        with self.assertRaises(ValueError):
+            encode_moves([(0, 0)], 17)
+
+
+class TimeDeltaTests(unittest.TestCase):
+    def test_varint_round_trip(self):
+        deltas = [0.0, 0.1, 12.7, 12.8, 95.4, 900.0]
+        data = encode_time_deltas(deltas)
+        self.assertEqual(decode_time_deltas(data), deltas)
+        self.assertEqual(len(encode_time_deltas([12.7])), 1)
+        self.assertEqual(len(encode_time_deltas([900.0])), 2)
+
+    def test_negative_delta_clamped(self):
+        self.assertEqual(decode_time_deltas(encode_time_deltas([-3.0])), [0.0])
+
+    def test_truncated_data_raises(self):
+        with self.assertRaises(ValueError):
+            decode_time_deltas(encode_time_deltas([900.0])[:1])
+
+    def test_move_time_deltas_from_timestamps(self):
+        start = datetime(2026, 1, 1, 12, 0, 0)
+        times = [start, start + timedelta(seconds=3), start + timedelta(seconds=10.5)]
+        self.assertEqual(move_time_deltas(times), [0.0, 3.0, 7.5])
+        self.assertEqual(move_time_deltas([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
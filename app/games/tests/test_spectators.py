@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from ..utils.spectators import SendWindow, SpectatorHub
+
+N = 15
+DELAY = 0.05
+
+
+def game_state(seq=0, board=None, turn="black"):
+    """load_spectator_state 가 만드는 상태 중 중계에 필요한 필드만"""
+    return {
+        "board": board or "." * (N * N),
+        "seq": seq,
+        "turn": turn,
+        "winner": None,
+        "size": N,
+        "white_id": 2,
+        "black_time": 900,
+        "white_time": 900,
+    }
+
+
+def move(seq, x, y, stone="B", turn="white"):
+    text = json.dumps(
+        {
+            "type": "move",
+            "seq": seq,
+            "x": x,
+            "y": y,
+            "stone": stone,
+            "turn": turn,
+            "black_time": 900,
+            "white_time": 900,
+        }
+    )
+    return {"type": "spectator.message", "text": text}
+
+
+class Viewer:
+    """SpectatorConsumer 대신 쓰는 관전자 (push 된 메시지를 모아둠)"""
+
+    def __init__(self, game_id=1):
+        self.game_id = game_id
+        self.received = []
+
+    def push(self, text):
+        self.received.append(json.loads(text))
+
+
+class Loader:
+    """DB 대신 쓰는 상태 로더 - 호출 횟수 기록, 현재 상태를 바꿔가며 사용"""
+
+    def __init__(self, state):
+        self.state = state
+        self.calls = 0
+
+    async def __call__(self, game_id):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return dict(self.state), True
+
+
+async def idle_relay(game_id):
+    """채널 레이어 없이 쓰는 중계 자리 (취소될 때까지 대기)"""
+    await asyncio.Event().wait()
+
+
+class SpectatorHubTests(unittest.IsolatedAsyncioTestCase):
+    def make_hub(self, state, delay=0.0):
+        loader = Loader(state)
+        hub = SpectatorHub(loader=loader, delay=lambda: delay)
+        # 채널 레이어 중계는 띄우지 않고 _handle 로 그룹 메시지를 직접 넣음
+        relay = patch.object(hub, "_relay", idle_relay)
+        relay.start()
+        self.addCleanup(relay.stop)
+        return hub, loader
+
+    async def settle(self, seconds=0.0):
+        await asyncio.sleep(seconds)
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def asyncTearDown(self):
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+
+    async def test_delta_patches_cached_state(self):
+        hub, loader = self.make_hub(game_state())
+        first = Viewer()
+        await hub.join(1, first)
+        await self.settle()
+        self.assertEqual([m["type"] for m in first.received], ["state"])
+
+        hub._handle(1, move(1, 7, 7))
+        self.assertEqual(first.received[-1]["type"], "move")
+
+        # 늦게 온 관전자 / 재동기화는 보관 상태로 응답 (DB 조회 없음)
+        late = Viewer()
+        await hub.join(1, late)
+        hub.send_state(first)
+        await self.settle()
+        self.assertEqual(loader.calls, 1)
+        for viewer in (late, first):
+            state = viewer.received[-1]
+            self.assertEqual((state["type"], state["seq"]), ("state", 1))
+            self.assertEqual(state["board"][7 * N + 7], "B")
+
+    async def test_applied_move_is_ignored(self):
+        hub, loader = self.make_hub(game_state(seq=3))
+        viewer = Viewer()
+        await hub.join(1, viewer)
+        await self.settle()
+        hub._handle(1, move(2, 0, 0))
+        self.assertEqual(len(viewer.received), 1)
+        self.assertEqual(loader.calls, 1)
+
+    async def test_gap_reloads_once_per_process(self):
+        hub, loader = self.make_hub(game_state())
+        viewers = [Viewer() for _ in range(50)]
+        for viewer in viewers:
+            await hub.join(1, viewer)
+        await self.settle()
+        self.assertEqual(loader.calls, 1)
+
+        # seq 1 을 놓치고 seq 2 도착 → 관전자에게 보내지 않고 보관 상태를 다시 불러옴
+        loader.state = game_state(seq=2, turn="black")
+        hub._handle(1, move(2, 1, 1, stone="W", turn="black"))
+        # 그 사이 모든 관전자가 resync 해도 로드는 1회
+        for viewer in viewers:
+            hub.send_state(viewer)
+        await self.settle()
+        self.assertEqual(loader.calls, 2)
+        for viewer in viewers:
+            self.assertEqual([m["type"] for m in viewer.received], ["state", "state"])
+            self.assertEqual(viewer.received[-1]["seq"], 2)
+
+        # 다시 불러온 상태 뒤로는 델타가 그대로 이어짐
+        hub._handle(1, move(3, 2, 2))
+        self.assertEqual(viewers[0].received[-1]["type"], "move")
+        self.assertEqual(hub.states[1]["state"]["seq"], 3)
+
+    async def test_refresh_loads_after_pending_load(self):
+        hub, loader = self.make_hub(game_state())
+        viewer = Viewer()
+        await hub.join(1, viewer)  # 로드 진행 중
+        loader.state = dict(game_state(), black_ready=True)
+        hub._handle(1, {"type": "spectator.refresh"})
+        await self.settle()
+        self.assertEqual(loader.calls, 2)
+        self.assertTrue(viewer.received[-1]["black_ready"])
+
+    async def test_delay_hides_live_state(self):
+        hub, loader = self.make_hub(game_state(), delay=DELAY)
+        first = Viewer()
+        await hub.join(1, first)
+        await self.settle()
+        # 처음 불러온 상태도 지연 후에야 전송
+        self.assertEqual(first.received, [])
+        await self.settle(DELAY * 2)
+        self.assertEqual([m["seq"] for m in first.received], [0])
+
+        # 실시간 착수 직후: 새 관전자/재동기화는 지연된 보관 상태만 받음
+        loader.state = game_state(seq=1)
+        hub._handle(1, move(1, 7, 7))
+        late = Viewer()
+        await hub.join(1, late)
+        hub.send_state(first)
+        await self.settle()
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(late.received[-1]["seq"], 0)
+        self.assertEqual(first.received[-1]["seq"], 0)
+        self.assertEqual(late.received[-1]["board"][7 * N + 7], ".")
+
+        # 지연이 지나면 델타가 보관 상태에 반영되고 전달됨
+        await self.settle(DELAY * 2)
+        self.assertEqual(late.received[-1]["type"], "move")
+        self.assertEqual(hub.states[1]["state"]["seq"], 1)
+
+    async def test_delayed_reload_after_gap(self):
+        hub, loader = self.make_hub(game_state(), delay=DELAY)
+        viewer = Viewer()
+        await hub.join(1, viewer)
+        await self.settle(DELAY * 2)
+
+        loader.state = game_state(seq=2)
+        hub._handle(1, move(2, 1, 1))
+        await self.settle(DELAY * 1.5)
+        # 순서 어긋남을 지연 후에 발견 → 다시 불러온 상태도 다시 지연 후 전송
+        self.assertEqual(loader.calls, 2)
+        self.assertEqual([m["seq"] for m in viewer.received], [0])
+        await self.settle(DELAY * 2)
+        self.assertEqual([m["seq"] for m in viewer.received], [0, 2])
+
+    async def test_last_viewer_leaving_clears_cache(self):
+        hub, _ = self.make_hub(game_state())
+        viewer = Viewer()
+        await hub.join(1, viewer)
+        await self.settle()
+        hub.leave(1, viewer)
+        self.assertEqual((hub.viewers, hub.states, hub.relays), ({}, {}, {}))
+
+
+class SendWindowTests(unittest.TestCase):
+    def test_unacked_limit(self):
+        window = SendWindow(limit=3)
+        self.assertTrue(all(window.try_send() for _ in range(3)))
+        self.assertFalse(window.try_send())
+        window.ack(2)
+        self.assertTrue(window.try_send())
+        self.assertEqual(window.sent - window.acked, 2)
+
+    def test_ack_ignores_bad_values(self):
+        window = SendWindow(limit=3)
+        window.try_send()
+        window.ack(10)  # 보낸 것보다 많이 ack 해도 창이 넓어지지 않음
+        window.ack(0)
+        window.ack("x")
+        self.assertEqual(window.acked, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
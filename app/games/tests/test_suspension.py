@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from django.conf import settings
+
+if not settings.configured:  # DB/캐시가 필요한 테스트 - python manage.py test 로 실행
+    raise unittest.SkipTest("requires Django settings (python manage.py test)")
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import Client, RequestFactory, TestCase  # noqa: E402
+
+from app.accounts.middleware import (  # noqa: E402
+    SuspensionCheckMiddleware,
+    get_suspension,
+    suspension_cache_key,
+)
+from ..models import Report  # noqa: E402
+
+User = get_user_model()
+
+
+class SuspensionCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", is_staff=True)
+        self.target = User.objects.create(username="target")
+        self.client = Client(HTTP_HOST="localhost")
+        self.client.force_login(self.admin)
+
+    def check(self, user):
+        """미들웨어만 통과시킴 (정지면 안내 페이지, 아니면 뷰 응답 "ok")"""
+        middleware = SuspensionCheckMiddleware(lambda request: HttpResponse("ok"))
+        request = RequestFactory().get("/games/")
+        request.user = user
+        return middleware(request)
+
+    def cached(self):
+        return cache.get(suspension_cache_key(self.target.id))
+
+    def assert_blocked(self, blocked):
+        response = self.check(self.target)
+        self.assertEqual(response.content == b"ok", not blocked)
+
+    def test_second_request_skips_profile_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.check(self.target).content, b"ok")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.check(self.target).content, b"ok")
+
+    def test_report_action_clears_cache_after_commit(self):
+        self.assert_blocked(False)
+        report = Report.objects.create(
+            reporter=self.admin,
+            reported_user=self.target,
+            report_type="user",
+            reason="abuse",
+        )
+        url = f"/games/admin-panel/api/reports/{report.id}/action/"
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                url,
+                json.dumps({"action": "permanent_ban"}),
+                content_type="application/json",
+            )
+            # 커밋 전에는 옛 기록 유지 (다른 요청이 커밋 전 값을 다시 캐시하지 않도록)
+            self.assertEqual(self.cached(), {"permanent": False, "until": None})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(self.cached())
+        self.assert_blocked(True)
+
+    def test_user_sanction_clears_cache_after_commit(self):
+        url = f"/games/admin-panel/api/users/{self.target.id}/sanction/"
+        self.assert_blocked(False)
+        for action, blocked in (("suspend", True), ("unsanction", False)):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    url,
+                    json.dumps({"action": action, "duration_days": 3}),
+                    content_type="application/json",
+                )
+                self.assertIsNotNone(self.cached())
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(self.cached())
+            self.assert_blocked(blocked)
+            self.assertEqual(
+                get_suspension(self.target.id)["until"] is not None, blocked
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
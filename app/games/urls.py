@@ -11,6 +11,9 @@ urlpatterns = [
     path("ai/status/", views.ai_game_status, name="ai_game_status"),  # AI 대전 상태
     path("ai/leave/", views.ai_game_leave, name="ai_game_leave"),  # AI 대전 종료
     path("history/", views.game_history, name="history"),  # 전적 조회
+    path(
+        "api/replays/<int:history_id>/", views.game_replay, name="game_replay"
+    ),  # 기보 조회
     path("<int:pk>/join/", views.join_game, name="join"),  # 방 참가
     path("<int:pk>/leave/", views.leave_game, name="leave"),  # 방 나가기
     path("<int:pk>/", views.game_room, name="room"),  # 게임 방
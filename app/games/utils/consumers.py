@@ -1,29 +1,32 @@
-import time
+import json
 import uuid
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
-from django.db.models import Q
 from datetime import timedelta
 
 from app.games.models import LobbyMessage
 from ..models import BOARD_SIZE, Game, GameHistory, Move
 from app.accounts.models import UserProfile, calculate_elo, INITIAL_RATING
-from app.accounts.views import ONLINE_USERS_KEY, ONLINE_TIMEOUT, AI_GAME_USERS_KEY
-from ..matchmaking import matchmaking_service
-from .omok import (
-    BLACK,
-    WHITE,
-    check_five,
-    debug_double_three,
-    has_exact_five,
-    is_forbidden_double_four,
-    is_forbidden_double_three,
-    is_overline,
+from ..board_session import board_sessions
+from ..player_cards import game_player_fields, invalidate_player_cards
+from ..presence import lobby_presence
+from ..replay import encode_moves, encode_time_deltas, move_time_deltas
+from .game_clock import game_clock
+from .heartbeat import HeartbeatMixin
+from .spectators import spectator_hub
+from .lobby import (
+    build_users_message,
+    get_lobby_users,
+    get_user_game_status,
+    get_visible_rooms,
+    lobby_notifier,
 )
+from .omok import BLACK, WHITE, debug_double_three
 
 User = get_user_model()
 
@@ -137,6 +140,8 @@ def update_user_stats(black_user, white_user, winner):
 
     black_profile.save(update_fields=["wins", "losses", "rating"])
     white_profile.save(update_fields=["wins", "losses", "rating"])
+    # 착수/시간 초과 트랜잭션 안에서 호출됨 - 커밋 전에 지우면 다른 연결이 이전 전적을 다시 캐시함
+    transaction.on_commit(lambda: invalidate_player_cards(black_user.id, white_user.id))
 
     # 새 티어 계산
     new_black_tier = get_tier_from_rating(black_profile.rating)
@@ -170,30 +175,70 @@ def record_game_result(game):
     게임 종료 시 전적 기록 및 통계 업데이트
     Returns: dict with rating changes
     """
-    total_moves = game.moves.count()
+    # 기보 압축 저장 (Move 행은 리매치 때 삭제되므로 여기서 보존)
+    moves = list(game.moves.values_list("x", "y", "created_at"))
     GameHistory.objects.create(
         game_id=game.id,
         black=game.black,
         white=game.white,
         winner=game.winner,
         created_at=game.created_at,
-        total_moves=total_moves,
+        total_moves=game.move_count,
+        move_sequence=encode_moves(((x, y) for x, y, _ in moves), BOARD_SIZE),
+        move_times=encode_time_deltas(
+            move_time_deltas(moved_at for _, _, moved_at in moves)
+        ),
     )
     return update_user_stats(game.black, game.white, game.winner)
 
 
-class GameConsumer(AsyncJsonWebsocketConsumer):
+def build_game_state(game: Game) -> dict:
+    """게임 전체 상태 (연결/재동기화/관전자 캐시용)"""
+    # 타이머 계산: 현재 턴인 플레이어의 시간 차감
+    black_time = game.black_time_remaining
+    white_time = game.white_time_remaining
+
+    if game.last_move_time and not game.winner:
+        # 마지막 착수 이후 경과 시간 계산
+        elapsed = (timezone.now() - game.last_move_time).total_seconds()
+        if game.turn == "black":
+            black_time = max(0, black_time - int(elapsed))
+        else:
+            white_time = max(0, white_time - int(elapsed))
+
+    return {
+        "board": game.board,
+        "seq": game.board_version,  # 착수 델타 기준 버전
+        "turn": game.turn,
+        "winner": game.winner,
+        "size": BOARD_SIZE,
+        # 플레이어 이름/레이팅/총 게임 수/프로필 이미지 (카드 캐시 - 보통 조회 없음)
+        **game_player_fields(game),
+        "black_time": black_time,
+        "white_time": white_time,
+        "black_ready": game.black_ready,
+        "white_ready": game.white_ready,
+        "game_started": game.game_started,
+    }
+
+
+class GameConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
     async def connect(self):
         try:
             self.game_id = self.scope["url_route"]["kwargs"]["game_id"]
             self.group = f"game_{self.game_id}"
             await self.channel_layer.group_add(self.group, self.channel_name)
             await self.accept()
+            await self.touch_online()
 
             game = await self.get_game()
             state = await self.game_state(game)
             await self.send_json({"type": "state", **state})
 
+            # 서버 게임 시계 (진행 중이면 마감 시각 등록)
+            game_clock.track(game)
+            game_clock.ensure_running()
+
             # 로비에 사용자 상태 변경 알림 (게임방 입장)
             await self.notify_lobby_status_change()
         except Exception as e:
@@ -215,6 +260,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             # 브라우저 뒤로가기 등으로 연결이 끊긴 경우 게임 정리
             if user and user.is_authenticated:
                 await self.cleanup_game_on_disconnect(user)
+                await spectator_hub.refresh(self.game_id)
 
             # 로비에 사용자 상태 변경 알림 (게임방 퇴장)
             await self.notify_lobby_status_change()
@@ -222,13 +268,16 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             pass
 
     async def receive_json(self, content, **kwargs):
+        if await self.handle_ping(content):
+            return
         try:
             if content.get("type") == "play":
                 x = int(content["x"])
                 y = int(content["y"])
                 user = self.scope.get("user")
 
-                ok, msg, final_state = await self.try_play(user, x, y)
+                ok, msg, final_state, move = await self.try_play(user, x, y)
+                game_clock.ensure_running()
                 if not ok:
                     await self.send_json({"type": "error", "message": msg})
                     return
@@ -236,21 +285,23 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 # final_state가 있으면 게임 종료 (승자 정보 포함)
                 if final_state:
                     # 게임이 삭제되었으므로 저장된 상태를 직접 broadcast
-                    await self.channel_layer.group_send(
-                        self.group, {"type": "broadcast_final", "state": final_state}
-                    )
+                    await self.broadcast_final_state(final_state)
                 else:
-                    # 게임 진행 중이면 일반 broadcast
+                    # 게임 진행 중이면 착수 델타만 broadcast (소켓별 DB 조회 없음)
                     await self.channel_layer.group_send(
-                        self.group, {"type": "broadcast_state"}
+                        self.group, {"type": "broadcast_move", "text": move}
                     )
+                    await spectator_hub.publish(self.game_id, move)
+            elif content.get("type") == "resync":
+                # 델타 순서가 어긋난 클라이언트 - 전체 상태 다시 전송
+                game = await self.get_game()
+                state = await self.game_state(game)
+                await self.send_json({"type": "state", **state})
             elif content.get("type") == "surrender":
                 user = self.scope.get("user")
                 final_state = await self.handle_surrender(user)
                 if final_state:
-                    await self.channel_layer.group_send(
-                        self.group, {"type": "broadcast_final", "state": final_state}
-                    )
+                    await self.broadcast_final_state(final_state)
                 else:
                     await self.send_json(
                         {"type": "error", "message": "항복할 수 없습니다"}
@@ -261,6 +312,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 await self.channel_layer.group_send(
                     self.group, {"type": "broadcast_state"}
                 )
+                await spectator_hub.refresh(self.game_id)
             elif content.get("type") == "player_ready":
                 # 플레이어 준비 완료
                 user = self.scope.get("user")
@@ -273,9 +325,11 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 user = self.scope.get("user")
                 success = await self.handle_start_game(user)
                 if success:
+                    game_clock.ensure_running()
                     await self.channel_layer.group_send(
                         self.group, {"type": "broadcast_game_start"}
                     )
+                    await spectator_hub.refresh(self.game_id)
                 else:
                     await self.send_json(
                         {"type": "error", "message": "게임을 시작할 수 없습니다"}
@@ -303,6 +357,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     await self.channel_layer.group_send(
                         self.group, {"type": "broadcast_state"}
                     )
+                    await spectator_hub.refresh(self.game_id)
             elif content.get("type") == "decline_rematch":
                 # 리매치 거절
                 user = self.scope.get("user")
@@ -316,9 +371,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 timeout_player = content.get("player")
                 final_state = await self.handle_timeout(timeout_player)
                 if final_state:
-                    await self.channel_layer.group_send(
-                        self.group, {"type": "broadcast_final", "state": final_state}
-                    )
+                    await self.broadcast_final_state(final_state)
             elif content.get("type") == "quick_chat":
                 # 빠른 채팅 메시지 브로드캐스트
                 message = content.get("message", "").strip()
@@ -349,6 +402,22 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         except Exception as e:
             print("[WS][broadcast_state] ERROR:", repr(e))
 
+    async def broadcast_final_state(self, final_state):
+        """게임 종료 상태를 플레이어 그룹과 관전 그룹에 전송"""
+        await self.channel_layer.group_send(
+            self.group, {"type": "broadcast_final", "state": final_state}
+        )
+        await spectator_hub.publish(
+            self.game_id, json.dumps({"type": "state", **final_state})
+        )
+
+    async def broadcast_move(self, event):
+        """미리 직렬화된 착수 델타를 그대로 전송"""
+        try:
+            await self.send(text_data=event["text"])
+        except Exception as e:
+            print("[WS][broadcast_move] ERROR:", repr(e))
+
     async def broadcast_final(self, event):
         """게임 종료 시 최종 상태 전송 (게임이 이미 삭제됨)"""
         try:
@@ -391,71 +460,28 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
 
     @database_sync_to_async
     def game_state(self, game: Game):
-        # 타이머 계산: 현재 턴인 플레이어의 시간 차감
-        black_time = game.black_time_remaining
-        white_time = game.white_time_remaining
-
-        if game.last_move_time and not game.winner:
-            # 마지막 착수 이후 경과 시간 계산
-            elapsed = (timezone.now() - game.last_move_time).total_seconds()
-            if game.turn == "black":
-                black_time = max(0, black_time - int(elapsed))
-            else:
-                white_time = max(0, white_time - int(elapsed))
-
-        # 플레이어 레이팅, 총 게임 수, 프로필 이미지 조회
-        black_rating = INITIAL_RATING
-        white_rating = INITIAL_RATING
-        black_total_games = 0
-        white_total_games = 0
-        black_profile_image = "/static/images/default_profile_green.svg"
-        white_profile_image = "/static/images/default_profile_green.svg"
-        if game.black:
-            black_profile = UserProfile.objects.filter(user=game.black).first()
-            if black_profile:
-                black_rating = black_profile.rating
-                black_total_games = black_profile.total_games
-                black_profile_image = black_profile.profile_image_url
-        if game.white:
-            white_profile = UserProfile.objects.filter(user=game.white).first()
-            if white_profile:
-                white_rating = white_profile.rating
-                white_total_games = white_profile.total_games
-                white_profile_image = white_profile.profile_image_url
-
-        return {
-            "board": game.board,
-            "turn": game.turn,
-            "winner": game.winner,
-            "size": BOARD_SIZE,
-            **game.get_both_player_names(),
-            "black_id": game.black_id,
-            "white_id": game.white_id,
-            "black_time": black_time,
-            "white_time": white_time,
-            "black_ready": game.black_ready,
-            "white_ready": game.white_ready,
-            "game_started": game.game_started,
-            "black_rating": black_rating,
-            "white_rating": white_rating,
-            "black_total_games": black_total_games,
-            "white_total_games": white_total_games,
-            "black_profile_image": black_profile_image,
-            "white_profile_image": white_profile_image,
-        }
+        return build_game_state(game)
 
     @database_sync_to_async
     def try_play(self, user, x, y):
+        try:
+            return self._try_play(user, x, y)
+        except Exception:
+            # 롤백된 착수가 보드 세션에 남지 않도록 버린다 (다음 수에서 DB로 재생성)
+            board_sessions.discard(self.game_id)
+            raise
+
+    def _try_play(self, user, x, y):
         with transaction.atomic():
             game = Game.objects.select_for_update().get(pk=self.game_id)
 
             # 기본 검증
             if game.winner:
-                return False, "game finished", None
+                return False, "game finished", None, None
             if not (0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE):
-                return False, "out of bounds", None
+                return False, "out of bounds", None, None
             if game.get_cell(x, y) != ".":
-                return False, "이미 착수가 된 자리입니다.", None
+                return False, "이미 착수가 된 자리입니다.", None, None
 
             # 타이머 업데이트: 현재 턴 플레이어의 시간 차감
             if game.last_move_time and game.black and game.white:
@@ -491,7 +517,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                             "white_time_remaining",
                         ]
                     )
-                    return False, "시간 초과로 패배하였습니다", final_state
+                    transaction.on_commit(lambda: game_clock.track(game))
+                    return False, "시간 초과로 패배하였습니다", final_state, None
                 elif game.turn == "white" and game.white_time_remaining <= 0:
                     game.winner = "black"
                     final_state = {
@@ -512,7 +539,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                             "white_time_remaining",
                         ]
                     )
-                    return False, "시간 초과로 패배하였습니다", final_state
+                    transaction.on_commit(lambda: game_clock.track(game))
+                    return False, "시간 초과로 패배하였습니다", final_state, None
 
             # 턴 검증(선택)
             expected_user = game.black if game.turn == "black" else game.white
@@ -521,75 +549,68 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 and getattr(user, "is_authenticated", False)
                 and user != expected_user
             ):
-                return False, "현재 상대 턴 입니다.", None
+                return False, "현재 상대 턴 입니다.", None, None
 
             # 이번 수의 돌 문자 통일 ("B"/"W")
             stone = game.stone_of_turn()
             if stone in ("black", "white"):
                 stone = BLACK if stone == "black" else WHITE
 
-            # 2D 스냅샷 생성 (판정기는 2D 기대)
-            board2d = [
-                [game.get_cell(i, j) for j in range(BOARD_SIZE)]
-                for i in range(BOARD_SIZE)
-            ]
+            # 메모리 보드 세션 (Game.board_version 으로 DB와 동기화)
+            session = board_sessions.get(game, BOARD_SIZE)
+            bb = session.board
 
             # --- 렌주 정석 금수: 흑만 ---
             if stone == BLACK:
                 # 정확히 5목이면 승리 → 33/44 금수 무시 (장목은 여전히 금수)
-                board2d[x][y] = BLACK
-                exact_five = has_exact_five(board2d, x, y, BLACK)
-                board2d[x][y] = "."
+                exact_five = bb.has_exact_five(x, y, BLACK)
 
                 # 장목 금수 (5목 완성이어도 6목 이상이면 금수)
-                if is_overline(board2d, x, y, BLACK):
-                    return False, "장목 금수입니다. (6+)", None
+                if bb.would_be_overline(x, y, BLACK):
+                    return False, "장목 금수입니다. (6+)", None, None
 
                 # 정확히 5목이면 33/44 금수 면제
                 if not exact_five:
                     # 44 금수
-                    if is_forbidden_double_four(board2d, x, y, BLACK):
-                        return False, "44 금수입니다. (44)", None
+                    if bb.is_forbidden_double_four(x, y, BLACK):
+                        return False, "44 금수입니다. (44)", None, None
                     # 33 금수
-                    if is_forbidden_double_three(board2d, x, y, BLACK):
-                        dbg = debug_double_three(board2d, x, y, BLACK)
+                    if bb.is_forbidden_double_three(x, y, BLACK):
+                        dbg = debug_double_three(bb.to_board(), x, y, BLACK)
                         print(
                             f"[33-DEBUG] try=({x},{y}) dirs={dbg['dirs']} spots={dbg['spots']} is33={dbg['is33']}"
                         )
-                        return False, "33 금수입니다. (33)", None
+                        return False, "33 금수입니다. (33)", None, None
 
             # 실제 착수
             game.set_cell(x, y, stone)
 
-            # 수 기록
-            move_order = Move.objects.filter(game=game).count() + 1
+            # 수 기록 (move_count 는 잠긴 Game 행과 함께 저장)
+            game.move_count += 1
             Move.objects.create(
                 game=game,
                 player=user if getattr(user, "is_authenticated", False) else None,
                 x=x,
                 y=y,
-                order=move_order,
+                order=game.move_count,
             )
+            session.apply_move(x, y, stone)  # 세션도 같은 버전으로 갱신
 
-            # 승리 판정
-            board2d[x][y] = stone  # 스냅샷도 업데이트
-            if stone == BLACK:
-                # 흑은 '정확 5목'만 승리 (장목은 위에서 이미 금수 처리)
-                if has_exact_five(board2d, x, y, BLACK):
-                    game.winner = game.turn
-                else:
-                    game.swap_turn()
+            # 승리 판정: 방금 둔 수를 지나는 네 줄만 확인
+            # (흑은 '정확 5목'만, 백은 5목 이상 승리 - 장목은 위에서 이미 금수 처리)
+            win_line = bb.winning_line(x, y, stone)
+            if win_line:
+                game.winner = game.turn
             else:
-                # 백은 5목 이상 승리
-                if check_five(board2d, WHITE):
-                    game.winner = game.turn
-                else:
-                    game.swap_turn()
+                game.swap_turn()
 
             # last_move_time 업데이트 (양쪽 플레이어가 있을 때만)
             if game.black and game.white:
                 game.last_move_time = timezone.now()
 
+            # 서버 게임 시계: 커밋 후 다음 턴 마감 시각 등록 (게임이 끝났으면 삭제)
+            transaction.on_commit(lambda: game_clock.track(game))
+
             # 게임 종료 시 전적 기록 생성 및 게임 삭제
             if game.winner:
                 final_state = {
@@ -600,6 +621,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     **game.get_both_player_names(),
                     "black_time": game.black_time_remaining,
                     "white_time": game.white_time_remaining,
+                    "win_line": [list(pos) for pos in win_line],
                 }
 
                 # 양쪽 플레이어가 모두 있는 경우만 전적 기록
@@ -610,6 +632,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     game.save(
                         update_fields=[
                             "board",
+                            "board_version",
+                            "move_count",
                             "turn",
                             "winner",
                             "black_time_remaining",
@@ -617,13 +641,15 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                             "last_move_time",
                         ]
                     )
-                    return True, "ok", final_state  # 최종 상태 반환
+                    return True, "ok", final_state, None  # 최종 상태 반환
                 else:
                     # 혼자 플레이(연습 모드): 게임을 삭제하지 않고 상태만 반환
                     # 프론트엔드에서 리셋 처리
                     game.save(
                         update_fields=[
                             "board",
+                            "board_version",
+                            "move_count",
                             "turn",
                             "winner",
                             "black_time_remaining",
@@ -631,12 +657,14 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                             "last_move_time",
                         ]
                     )
-                    return True, "ok", final_state
+                    return True, "ok", final_state, None
 
             # 저장
             game.save(
                 update_fields=[
                     "board",
+                    "board_version",
+                    "move_count",
                     "turn",
                     "winner",
                     "black_time_remaining",
@@ -644,7 +672,21 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     "last_move_time",
                 ]
             )
-            return True, "ok", None  # 게임 진행 중
+
+            # 착수 델타 (한 번만 직렬화해서 그룹에 그대로 전달, seq = board_version)
+            move = json.dumps(
+                {
+                    "type": "move",
+                    "seq": game.board_version,
+                    "x": x,
+                    "y": y,
+                    "stone": stone,
+                    "turn": game.turn,
+                    "black_time": game.black_time_remaining,
+                    "white_time": game.white_time_remaining,
+                }
+            )
+            return True, "ok", None, move  # 게임 진행 중
 
     @database_sync_to_async
     def reset_practice_game(self):
@@ -658,6 +700,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             game.save(
                 update_fields=[
                     "board",
+                    "board_version",
+                    "move_count",
                     "turn",
                     "winner",
                     "black_time_remaining",
@@ -741,6 +785,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             game.game_started = True
             game.last_move_time = timezone.now()  # 타이머 시작
             game.save(update_fields=["game_started", "last_move_time"])
+            transaction.on_commit(lambda: game_clock.track(game))
             return True
 
     @database_sync_to_async
@@ -780,6 +825,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
 
             # 게임 저장 (리매치를 위해 삭제하지 않음)
             game.save(update_fields=["winner"])
+            transaction.on_commit(lambda: game_clock.track(game))
             return final_state
 
     @database_sync_to_async
@@ -824,6 +870,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 game.save(
                     update_fields=[
                         "board",
+                        "board_version",
+                        "move_count",
                         "turn",
                         "winner",
                         "black",
@@ -904,6 +952,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 game.save(
                     update_fields=[
                         "board",
+                        "board_version",
+                        "move_count",
                         "turn",
                         "winner",
                         "black",
@@ -986,6 +1036,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     "white_time_remaining",
                 ]
             )
+            transaction.on_commit(lambda: game_clock.track(game))
             return final_state
 
     async def broadcast_quick_chat(self, event):
@@ -1033,11 +1084,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     async def notify_lobby_status_change(self):
         """로비에 사용자 상태 변경 알림"""
         try:
-            await self.channel_layer.group_send(
-                "lobby", {"type": "user_status_changed"}
-            )
-            # 게임 방 목록도 업데이트
-            await self.channel_layer.group_send("lobby", {"type": "room_list_changed"})
+            # 접속자 목록 + 게임 방 목록 (짧은 창 안의 알림은 한 번으로 병합)
+            await lobby_notifier.notify("users", "rooms")
         except Exception as e:
             print("[WS][notify_lobby_status_change] ERROR:", repr(e))
 
@@ -1137,6 +1185,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                         game.save(
                             update_fields=[
                                 "board",
+                                "board_version",
+                                "move_count",
                                 "turn",
                                 "winner",
                                 "white",
@@ -1206,11 +1256,11 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             print(f"[CLEANUP] ERROR: {repr(e)}")
 
 
-class LobbyConsumer(AsyncJsonWebsocketConsumer):
-    """로비 실시간 접속자 목록 관리"""
-
-    # 클래스 레벨에서 접속자 관리 (channel_name -> user_id 매핑)
-    connected_users = {}
+class LobbyConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
+    """
+    로비 실시간 접속자 목록 관리 (접속자는 lobby_presence 레지스트리에 등록)
+    lobby_presence 호출은 Redis 백엔드에서 네트워크 I/O 이므로 sync_to_async 로 실행
+    """
 
     async def connect(self):
         try:
@@ -1230,16 +1280,17 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
             await self.channel_layer.group_add(self.group_name, self.channel_name)
             await self.accept()
 
-            # 접속자 목록에 추가
-            LobbyConsumer.connected_users[self.channel_name] = {
-                "user_id": self.user_id,
-                "nickname": self.user_nickname,
-                "username": self.username,
-            }
-
-            # 현재 접속자 목록 전송
-            users = await self.get_online_users()
-            await self.send_json({"type": "users", "users": users})
+            # 접속자 레지스트리에 추가
+            await sync_to_async(lobby_presence.add)(
+                self.channel_name,
+                {
+                    "user_id": self.user_id,
+                    "nickname": self.user_nickname,
+                    "username": self.username,
+                },
+            )
+            lobby_presence.ensure_refreshing()
+            await self.touch_online()
 
             # 최근 24시간 로비 메시지 전송
             recent_messages = await self.get_recent_lobby_messages()
@@ -1248,17 +1299,9 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
                     {"type": "chat_history", "messages": recent_messages}
                 )
 
-            # 다른 사용자들에게 새 접속자 알림
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    "type": "user_joined",
-                    "user_info": {
-                        "user_id": self.user_id,
-                        "nickname": self.user_nickname,
-                    },
-                },
-            )
+            # 나에게는 현재 버전의 전체 스냅샷, 로비 전체에는 (나를 포함한) 변경분만 전송
+            await self.send_users_snapshot()
+            await lobby_notifier.notify("users")
 
         except Exception as e:
             print("[LobbyWS][connect] ERROR:", repr(e))
@@ -1269,21 +1312,34 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
 
     async def disconnect(self, code):
         try:
-            # 접속자 목록에서 제거
-            if self.channel_name in LobbyConsumer.connected_users:
-                del LobbyConsumer.connected_users[self.channel_name]
+            # 접속자 레지스트리에서 제거 (connect 에서 인증 실패로 닫힌 경우 제외)
+            if hasattr(self, "user_id"):
+                await sync_to_async(lobby_presence.remove)(
+                    self.channel_name, self.user_id
+                )
 
             # 그룹에서 제거
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-            # 다른 사용자들에게 퇴장 알림
-            await self.channel_layer.group_send(
-                self.group_name, {"type": "user_left", "user_id": self.user_id}
-            )
+            # 다른 사용자들에게 퇴장 알림 (스냅샷 1회 계산)
+            await lobby_notifier.notify("users")
 
         except Exception as e:
             print("[LobbyWS][disconnect] ERROR:", repr(e))
 
+    async def send_users_snapshot(self):
+        """접속자 목록 전체 스냅샷 (seq 포함) 전송"""
+        text = await database_sync_to_async(build_users_message)()
+        await self.send(text_data=text)
+
+    async def users_snapshot(self, event):
+        """미리 직렬화된 접속자 목록 메시지(스냅샷/델타)를 그대로 전송"""
+        try:
+            await self.send(text_data=event["text"])
+        except Exception as e:
+            print("[LobbyWS][users_snapshot] ERROR:", repr(e))
+
+    # --- 이전 방식 이벤트 (배포 중 다른 프로세스가 보낸 메시지 호환용) ---
     async def user_joined(self, event):
         """새 사용자 접속 알림"""
         try:
@@ -1314,6 +1370,8 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
 
     async def receive_json(self, content):
         """클라이언트로부터 메시지 수신"""
+        if await self.handle_ping(content):
+            return
         try:
             message_type = content.get("type")
 
@@ -1357,6 +1415,10 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
                         },
                     )
 
+            elif message_type == "users_resync":
+                # 클라이언트가 델타 버전 누락을 감지 - 전체 스냅샷 재전송
+                await self.send_users_snapshot()
+
             elif message_type == "game_invite":
                 # 게임 초대
                 target_user_id = content.get("target_user_id")
@@ -1387,14 +1449,11 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
                 )
                 return
 
-            # 대상 유저가 로비에 있는지 확인
-            target_channel = None
-            for channel_name, user_info in LobbyConsumer.connected_users.items():
-                if user_info["user_id"] == target_user_id:
-                    target_channel = channel_name
-                    break
-
-            if not target_channel:
+            # 대상 유저가 로비에 있는지 확인 (모든 프로세스의 접속 채널)
+            target_channels = await sync_to_async(lobby_presence.get_channels)(
+                target_user_id
+            )
+            if not target_channels:
                 await self.send_json(
                     {"type": "invite_error", "message": "상대방이 로비에 없습니다."}
                 )
@@ -1430,19 +1489,22 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
                 timeout=60,
             )
 
-            # 대상에게 초대 전송
-            await self.channel_layer.send(
-                target_channel,
-                {
-                    "type": "send_game_invite",
-                    "invite_id": invite_id,
-                    "from_user_id": self.user_id,
-                    "from_nickname": self.user_nickname,
-                },
-            )
+            # 대상에게 초대 전송 (로비 탭이 여러 개면 모두)
+            for target_channel in target_channels:
+                await self.channel_layer.send(
+                    target_channel,
+                    {
+                        "type": "send_game_invite",
+                        "invite_id": invite_id,
+                        "from_user_id": self.user_id,
+                        "from_nickname": self.user_nickname,
+                    },
+                )
 
             # 초대자에게 확인 메시지
-            target_info = LobbyConsumer.connected_users.get(target_channel, {})
+            target_info = (
+                await sync_to_async(lobby_presence.get_user)(target_user_id) or {}
+            )
             await self.send_json(
                 {
                     "type": "invite_sent",
@@ -1600,140 +1662,11 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
 
     async def get_online_users(self):
         """현재 접속 중인 사용자 목록 반환 (중복 제거) + 게임 상태 + RP"""
-        unique_users = {}
-
-        # 1. 캐시에서 하트비트 온라인 유저 (다른 페이지에 있는 유저)
-        current_time = time.time()
-        heartbeat_users = cache.get(ONLINE_USERS_KEY, {})
-        for user_id, info in heartbeat_users.items():
-            # 만료되지 않은 유저만 추가
-            if current_time - info.get("last_seen", 0) < ONLINE_TIMEOUT:
-                unique_users[user_id] = {
-                    "user_id": info["user_id"],
-                    "nickname": info["nickname"],
-                    "username": info.get("username", ""),
-                }
-
-        # 2. 로비에 연결된 사용자 (WebSocket)
-        for user_info in LobbyConsumer.connected_users.values():
-            user_id = user_info["user_id"]
-            if user_id not in unique_users:
-                unique_users[user_id] = user_info
-
-        # 3. 게임 중인 사용자 추가 (DB)
-        game_users = await self.get_users_in_games()
-        for user_info in game_users:
-            user_id = user_info["user_id"]
-            if user_id not in unique_users:
-                unique_users[user_id] = user_info
-
-        # 각 사용자의 게임 상태 및 RP 확인
-        user_ids = [info["user_id"] for info in unique_users.values()]
-        profiles = await self.get_users_ratings(user_ids)
-
-        users_with_status = []
-        for user_info in unique_users.values():
-            user_id = user_info["user_id"]
-            status = await self.get_user_game_status(user_id)
-            profile_data = profiles.get(user_id, {})
-            users_with_status.append(
-                {
-                    "user_id": user_id,
-                    "nickname": user_info["nickname"],
-                    "username": user_info.get("username", ""),
-                    "status": status,
-                    "rating": profile_data.get("rating", INITIAL_RATING),
-                    "total_games": profile_data.get("total_games", 0),
-                    "profile_image": profile_data.get(
-                        "profile_image", "/static/images/default_profile_green.svg"
-                    ),
-                }
-            )
-
-        return users_with_status
-
-    @database_sync_to_async
-    def get_users_ratings(self, user_ids: list[int]) -> dict[int, dict]:
-        """여러 사용자의 RP, 총 게임 수, 프로필 이미지 URL 조회"""
-        result = {}
-        profiles = UserProfile.objects.filter(user_id__in=user_ids)
-        for profile in profiles:
-            result[profile.user_id] = {
-                "rating": profile.rating,
-                "total_games": profile.total_games,
-                "profile_image": profile.profile_image_url,
-            }
-        return result
-
-    @database_sync_to_async
-    def get_users_in_games(self):
-        """진행 중인 게임의 모든 플레이어 조회"""
-        # 승자가 없는 모든 게임 (진행 중인 게임)
-        games = Game.objects.filter(winner__isnull=True).select_related(
-            "black", "white"
-        )
-
-        users = []
-        seen_user_ids = set()
-
-        for game in games:
-            # 흑 플레이어
-            if game.black and game.black.id not in seen_user_ids:
-                users.append(
-                    {
-                        "user_id": game.black.id,
-                        "nickname": game.black.first_name or game.black.username,
-                        "username": game.black.username,
-                    }
-                )
-                seen_user_ids.add(game.black.id)
-
-            # 백 플레이어
-            if game.white and game.white.id not in seen_user_ids:
-                users.append(
-                    {
-                        "user_id": game.white.id,
-                        "nickname": game.white.first_name or game.white.username,
-                        "username": game.white.username,
-                    }
-                )
-                seen_user_ids.add(game.white.id)
-
-        return users
+        return await database_sync_to_async(get_lobby_users)()
 
     async def get_user_game_status(self, user_id):
         """사용자의 게임 상태 반환: online, waiting, playing, matchmaking, ai_playing"""
-        # 먼저 매칭 큐에 있는지 확인 (in-memory)
-        if matchmaking_service.get_queue_entry(user_id):
-            return "matchmaking"
-
-        # AI 게임 중인지 확인 (캐시)
-        ai_users = cache.get(AI_GAME_USERS_KEY, {})
-        if str(user_id) in ai_users:
-            user_info = ai_users[str(user_id)]
-            if time.time() - user_info.get("last_seen", 0) < ONLINE_TIMEOUT:
-                return "ai_playing"
-
-        # DB에서 게임 상태 확인
-        return await self._get_user_game_status_from_db(user_id)
-
-    @database_sync_to_async
-    def _get_user_game_status_from_db(self, user_id):
-        """DB에서 사용자의 게임 상태 확인"""
-        # 진행 중인 게임 찾기 (승자가 없는 게임)
-        game = Game.objects.filter(
-            Q(black_id=user_id) | Q(white_id=user_id), winner__isnull=True
-        ).first()
-
-        if not game:
-            return "online"  # 게임 없음
-
-        # 양쪽 플레이어가 모두 있으면 "게임중"
-        if game.black and game.white:
-            return "playing"
-
-        # 한쪽만 있으면 "게임룸 대기중"
-        return "waiting"
+        return await database_sync_to_async(get_user_game_status)(user_id)
 
     @database_sync_to_async
     def get_recent_lobby_messages(self):
@@ -1811,8 +1744,15 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
                 "profile_image": "/static/images/default_profile_green.svg",
             }
 
+    async def room_list_snapshot(self, event):
+        """미리 직렬화된 방 목록을 그대로 전송"""
+        try:
+            await self.send(text_data=event["text"])
+        except Exception as e:
+            print("[LobbyWS][room_list_snapshot] ERROR:", repr(e))
+
     async def room_list_changed(self, event):
-        """게임 방 목록 변경 알림"""
+        """게임 방 목록 변경 알림 (이전 방식 이벤트 호환용)"""
         try:
             waiting_games = await self.get_waiting_games()
             await self.send_json({"type": "room_list", "games": waiting_games})
@@ -1821,50 +1761,5 @@ class LobbyConsumer(AsyncJsonWebsocketConsumer):
 
     @database_sync_to_async
     def get_waiting_games(self):
-        """대기 중인 게임 방 목록 조회"""
-        from app.accounts.views import ONLINE_USERS_KEY, ONLINE_TIMEOUT
-
-        current_time = time.time()
-        online_users = cache.get(ONLINE_USERS_KEY, {})
-        online_user_ids = set()
-        for user_id, info in online_users.items():
-            if current_time - info.get("last_seen", 0) < ONLINE_TIMEOUT:
-                online_user_ids.add(int(user_id))
-
-        # 로비에 연결된 사용자도 온라인으로 간주
-        for user_info in LobbyConsumer.connected_users.values():
-            online_user_ids.add(user_info["user_id"])
-
-        # 대기 중인 게임 (white가 null)
-        waiting_games = (
-            Game.objects.filter(white__isnull=True)
-            .select_related("black")
-            .order_by("-created_at")
-        )
-
-        games_list = []
-        for game in waiting_games:
-            # 방장이 온라인인 방만 포함
-            if game.black_id in online_user_ids:
-                # 방장의 RP 조회
-                try:
-                    profile = UserProfile.objects.get(user=game.black)
-                    rating = profile.rating
-                    total_games = profile.total_games
-                except UserProfile.DoesNotExist:
-                    rating = INITIAL_RATING
-                    total_games = 0
-
-                games_list.append(
-                    {
-                        "id": game.id,
-                        "title": game.title,
-                        "has_password": bool(game.password),
-                        "black_nickname": game.black.first_name or game.black.username,
-                        "black_username": game.black.username,
-                        "black_rating": rating,
-                        "black_total_games": total_games,
-                    }
-                )
-
-        return games_list
+        """대기 중인 게임 방 목록 조회 (방장이 온라인인 방만, 캐시 사용)"""
+        return get_visible_rooms()
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from app.games.clock import DeadlineQueue, clock_deadline
+from app.games.models import BOARD_SIZE, Game
+from app.games.utils.lobby import lobby_notifier
+from app.games.utils.spectators import spectator_hub
+
+
+def finish_on_time(game_id: int, now: float):
+    """
+    마감 시각이 지난 게임을 시간 초과 패배로 종료
+    Returns: (새 마감 시각, 최종 상태) - 그사이 착수가 있었으면 새 마감 시각만 반환
+    """
+    from app.games.utils.consumers import record_game_result
+
+    with transaction.atomic():
+        game = Game.objects.select_for_update().filter(pk=game_id).first()
+        if not game:
+            return None, None
+
+        # 다른 프로세스에서 착수했거나 게임이 끝났으면 DB 기준 마감 시각 사용
+        deadline = clock_deadline(game)
+        if deadline is None or deadline > now:
+            return deadline, None
+
+        if game.turn == "black":
+            game.winner = "white"
+            game.black_time_remaining = 0
+        else:
+            game.winner = "black"
+            game.white_time_remaining = 0
+
+        rating_info = record_game_result(game)
+        final_state = {
+            "board": game.board,
+            "turn": game.turn,
+            "winner": game.winner,
+            "size": BOARD_SIZE,
+            **game.get_both_player_names(),
+            "black_time": game.black_time_remaining,
+            "white_time": game.white_time_remaining,
+            **rating_info,
+        }
+
+        # 게임 저장 (리매치를 위해 삭제하지 않음)
+        game.save(
+            update_fields=[
+                "winner",
+                "black_time_remaining",
+                "white_time_remaining",
+            ]
+        )
+        return None, final_state
+
+
+def load_running_games() -> list[tuple[int, float]]:
+    """시계가 돌고 있는 게임 전체의 (game_id, 마감 시각) - 프로세스 재시작 후 복구용"""
+    games = Game.objects.filter(
+        winner__isnull=True,
+        black__isnull=False,
+        white__isnull=False,
+        last_move_time__isnull=False,
+    ).only(
+        "turn",
+        "winner",
+        "black_id",
+        "white_id",
+        "black_time_remaining",
+        "white_time_remaining",
+        "last_move_time",
+    )
+    return [(game.pk, clock_deadline(game)) for game in games]
+
+
+class GameClock:
+    """
+    프로세스당 1개의 서버 게임 시계
+    - 진행 중인 모든 게임의 마감 시각을 DeadlineQueue 하나로 관리하고
+      가장 이른 마감까지만 잠들었다가 깨어나 시간 초과 처리 (게임 수와 무관하게 태스크 1개)
+    - 클라이언트가 모두 나가도 마감 시각에 게임을 끝내고 결과 기록 + 최종 상태 전송
+    - 여러 프로세스가 같은 게임을 등록해도 행 잠금 후 DB 기준으로 다시 판정하므로 한 번만 종료됨
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.queue = DeadlineQueue()
+        self._task = None
+        self._loop = None
+        self._wake = None
+        self._loaded = False
+
+    def track(self, game):
+        """게임 저장 후 호출 - 마감 시각 등록/갱신, 시계가 멈췄으면 삭제 (스레드 안전)"""
+        deadline = clock_deadline(game)
+        if deadline is None:
+            self.queue.cancel(game.pk)
+        elif self.queue.schedule(game.pk, deadline):
+            self._wakeup()
+
+    def ensure_running(self):
+        """게임 컨슈머에서 호출 - 시계 루프가 없으면 현재 이벤트 루프에서 시작"""
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def _wakeup(self):
+        # 더 이른 마감이 등록됨 → 잠든 루프를 깨워 대기 시간 재계산
+        if self._loop and self._wake and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                for game_id, deadline in await database_sync_to_async(
+                    load_running_games
+                )():
+                    self.queue.schedule(game_id, deadline)
+            except Exception as e:
+                print(f"[GameClock] load error: {repr(e)}")
+
+        # 등록된 마감이 모두 처리될 때까지 돌고 종료 (다음 게임 시작 때 다시 시작)
+        while (deadline := self.queue.next_deadline()) is not None:
+            delay = deadline - self.clock()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"[GameClock] tick error: {repr(e)}")
+
+    async def tick(self) -> int:
+        """마감된 게임 시간 초과 처리. 종료된 게임 수 반환"""
+        now = self.clock()
+        channel_layer = get_channel_layer()
+        finished = 0
+        for game_id in self.queue.pop_due(now):
+            deadline, final_state = await database_sync_to_async(finish_on_time)(
+                game_id, now
+            )
+            if deadline is not None:
+                self.queue.schedule(game_id, deadline)
+            if final_state:
+                finished += 1
+                await channel_layer.group_send(
+                    f"game_{game_id}",
+                    {"type": "broadcast_final", "state": final_state},
+                )
+                await spectator_hub.publish(
+                    game_id, json.dumps({"type": "state", **final_state})
+                )
+        if finished:
+            await lobby_notifier.notify("users", "rooms")
+        return finished
+
+
+# 프로세스 전역 인스턴스
+game_clock = GameClock()
@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+
+from app.accounts.views import online_users_tracker
+
+
+class HeartbeatMixin:
+    """
+    WebSocket 하트비트 (HTTP heartbeat 요청 대신)
+    connect 와 클라이언트 ping 메시지마다 온라인 기록 갱신 - 미들웨어/DB 조회 없이 기록 1회
+    (Redis 백엔드는 네트워크 I/O 이므로 sync_to_async 로 이벤트 루프 밖에서 기록)
+    """
+
+    async def touch_online(self):
+        """접속 유저의 온라인 기록 갱신 (익명 유저는 무시)"""
+        user = self.scope.get("user")
+        if not user or not user.is_authenticated:
+            return
+        try:
+            await sync_to_async(online_users_tracker.touch)(
+                {
+                    "user_id": user.id,
+                    "username": user.username,
+                    "nickname": user.first_name or user.username,
+                }
+            )
+        except Exception as e:
+            print(f"[Heartbeat] touch error: user_id={user.id} {repr(e)}")
+
+    async def handle_ping(self, content) -> bool:
+        """ping 메시지면 온라인 기록을 갱신하고 True (다른 처리 없이 종료)"""
+        if content.get("type") != "ping":
+            return False
+        await self.touch_online()
+        return True
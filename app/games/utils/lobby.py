@@ -0,0 +1,475 @@
+import asyncio
+import json
+from collections import Counter
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from app.accounts.models import INITIAL_RATING, UserProfile
+from app.accounts.views import ai_game_users_tracker, get_online_users
+from ..matchmaking import matchmaking_service
+from ..presence import lobby_presence
+from ..models import Game
+
+LOBBY_GROUP = "lobby"
+DEFAULT_PROFILE_IMAGE = "/static/images/default_profile_green.svg"
+
+# 대기 방 목록 캐시 (방 생성/입장/퇴장/삭제 알림 때 세대를 올리고 다시 만듦)
+WAITING_ROOMS_CACHE_KEY = "lobby_waiting_rooms"
+WAITING_ROOMS_GENERATION_KEY = "lobby_waiting_rooms:generation"
+WAITING_ROOMS_CACHE_TIMEOUT = 60  # 알림이 빠진 경우 대비 최대 보관 시간 (초)
+# 로비로 보내는 방 정보 필드
+ROOM_FIELDS = (
+    "id",
+    "title",
+    "has_password",
+    "black_nickname",
+    "black_username",
+    "black_rating",
+    "black_total_games",
+)
+
+
+def get_active_games():
+    """진행 중인(승자가 없는) 게임 목록 (pk 순, 플레이어 포함)"""
+    return list(
+        Game.objects.filter(winner__isnull=True)
+        .select_related("black", "white")
+        .order_by("pk")
+    )
+
+
+def get_users_in_games(games=None):
+    """진행 중인 게임의 모든 플레이어 조회"""
+    if games is None:
+        games = get_active_games()
+
+    users = []
+    seen_user_ids = set()
+
+    for game in games:
+        for player in (game.black, game.white):
+            if player and player.id not in seen_user_ids:
+                users.append(
+                    {
+                        "user_id": player.id,
+                        "nickname": player.first_name or player.username,
+                        "username": player.username,
+                    }
+                )
+                seen_user_ids.add(player.id)
+
+    return users
+
+
+def get_users_ratings(user_ids: list[int]) -> dict[int, dict]:
+    """여러 사용자의 RP, 총 게임 수, 프로필 이미지 URL 조회"""
+    result = {}
+    profiles = UserProfile.objects.filter(user_id__in=user_ids)
+    for profile in profiles:
+        result[profile.user_id] = {
+            "rating": profile.rating,
+            "total_games": profile.total_games,
+            "profile_image": profile.profile_image_url,
+        }
+    return result
+
+
+def resolve_user_statuses(user_ids, games=None) -> dict[int, str]:
+    """
+    여러 사용자의 게임 상태를 한 번에 판정: online, waiting, playing, matchmaking, ai_playing
+    - 매칭 큐(in-memory) / AI 게임(캐시 1회) / 진행 중 게임(DB 최대 1회)
+    - games 를 넘기면(get_active_games 결과) DB 조회 없이 그것으로 판정
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    statuses = {}
+
+    # 먼저 매칭 큐에 있는지 확인
+    queued = matchmaking_service.get_queued_user_ids()
+
+    # AI 게임 중인지 확인 (하트비트 기록, 조회 1회)
+    ai_users = ai_game_users_tracker.get_online()
+
+    remaining = []
+    for user_id in user_ids:
+        if user_id in queued:
+            statuses[user_id] = "matchmaking"
+            continue
+        if user_id in ai_users:
+            statuses[user_id] = "ai_playing"
+            continue
+        remaining.append(user_id)
+
+    if not remaining:
+        return statuses
+
+    # 진행 중인 게임 (pk 순으로 유저당 첫 번째 게임 기준)
+    if games is None:
+        pairs = (
+            Game.objects.filter(
+                Q(black_id__in=remaining) | Q(white_id__in=remaining),
+                winner__isnull=True,
+            )
+            .order_by("pk")
+            .values_list("black_id", "white_id")
+        )
+    else:
+        pairs = [(game.black_id, game.white_id) for game in games]
+
+    game_status = {}
+    for black_id, white_id in pairs:
+        # 양쪽 플레이어가 모두 있으면 "게임중", 한쪽만 있으면 "게임룸 대기중"
+        status = "playing" if black_id and white_id else "waiting"
+        for player_id in (black_id, white_id):
+            if player_id is not None:
+                game_status.setdefault(player_id, status)
+
+    for user_id in remaining:
+        statuses[user_id] = game_status.get(user_id, "online")
+    return statuses
+
+
+def get_user_game_status(user_id):
+    """사용자 한 명의 게임 상태 (resolve_user_statuses 참고)"""
+    return resolve_user_statuses([user_id])[user_id]
+
+
+def get_online_user_ids() -> set[int]:
+    """하트비트 + 로비 WebSocket 접속자 ID"""
+    return set(get_online_users()) | lobby_presence.get_online_user_ids()
+
+
+def load_waiting_rooms() -> list[dict]:
+    """
+    대기 중인(white 없음) 방 전체, 최신순
+    방장 정보는 select_related, 방장 RP 는 한 번에 조회 (쿼리 2회)
+    """
+    games = list(
+        Game.objects.filter(white__isnull=True)
+        .select_related("black")
+        .order_by("-created_at")
+    )
+    profiles = get_users_ratings([game.black_id for game in games if game.black_id])
+
+    rooms = []
+    for game in games:
+        black = game.black
+        profile_data = profiles.get(game.black_id, {})
+        rooms.append(
+            {
+                "id": game.id,
+                "title": game.title,
+                "has_password": bool(game.password),
+                "created_at": game.created_at,
+                "black_id": game.black_id,
+                "black_nickname": (black.first_name or black.username) if black else "",
+                "black_username": black.username if black else "",
+                "black_rating": profile_data.get("rating", INITIAL_RATING),
+                "black_total_games": profile_data.get("total_games", 0),
+            }
+        )
+    return rooms
+
+
+def waiting_rooms_key(generation) -> str:
+    return f"{WAITING_ROOMS_CACHE_KEY}:{generation}"
+
+
+def get_waiting_rooms() -> list[dict]:
+    """
+    캐시된 대기 방 목록 (없으면 DB 에서 만들어 캐시)
+    조회를 시작한 세대의 키에만 저장 - 그 사이 invalidate 되었으면 아무도 읽지 않는 옛 키에 들어감
+    """
+    generation = cache.get(WAITING_ROOMS_GENERATION_KEY, 0)
+    key = waiting_rooms_key(generation)
+    rooms = cache.get(key)
+    if rooms is None:
+        rooms = load_waiting_rooms()
+        cache.add(key, rooms, WAITING_ROOMS_CACHE_TIMEOUT)
+    return rooms
+
+
+def invalidate_waiting_rooms():
+    """방 생성/입장/퇴장/삭제 후 호출 - 세대를 올려서 다음 조회 때 다시 만듦"""
+    try:
+        cache.incr(WAITING_ROOMS_GENERATION_KEY)
+    except ValueError:
+        # 세대 키가 없으면 (처음 / 캐시 초기화) 기본값 0 과 다른 값으로 시작
+        cache.set(WAITING_ROOMS_GENERATION_KEY, 1, None)
+
+
+def get_visible_rooms(online_user_ids=None) -> list[dict]:
+    """로비에 보여줄 방 목록 (방장이 온라인인 방만, 전송용 필드만)"""
+    if online_user_ids is None:
+        online_user_ids = get_online_user_ids()
+    return [
+        {field: room[field] for field in ROOM_FIELDS}
+        for room in get_waiting_rooms()
+        if room["black_id"] in online_user_ids
+    ]
+
+
+def build_rooms_message() -> str:
+    """로비 방 목록 메시지를 한 번만 직렬화"""
+    return json.dumps({"type": "room_list", "games": get_visible_rooms()})
+
+
+def get_lobby_users():
+    """현재 접속 중인 사용자 목록 (중복 제거) + 게임 상태 + RP"""
+    unique_users = {}
+
+    # 1. 하트비트 온라인 유저 (다른 페이지에 있는 유저, 만료된 기록은 조회에서 빠짐)
+    for user_id, info in get_online_users().items():
+        unique_users[user_id] = {
+            "user_id": info["user_id"],
+            "nickname": info["nickname"],
+            "username": info.get("username", ""),
+        }
+
+    # 2. 로비에 연결된 사용자 (WebSocket, 모든 프로세스)
+    for user_info in lobby_presence.get_online_users():
+        unique_users.setdefault(user_info["user_id"], user_info)
+
+    # 3. 게임 중인 사용자 추가 (DB)
+    active_games = get_active_games()
+    for user_info in get_users_in_games(active_games):
+        unique_users.setdefault(user_info["user_id"], user_info)
+
+    # 각 사용자의 게임 상태 및 RP 확인 (게임 목록 재사용 → 프로필 조회 1회만 추가)
+    user_ids = [info["user_id"] for info in unique_users.values()]
+    statuses = resolve_user_statuses(user_ids, games=active_games)
+    profiles = get_users_ratings(user_ids)
+
+    users_with_status = []
+    for user_info in unique_users.values():
+        user_id = user_info["user_id"]
+        profile_data = profiles.get(user_id, {})
+        users_with_status.append(
+            {
+                "user_id": user_id,
+                "nickname": user_info["nickname"],
+                "username": user_info.get("username", ""),
+                "status": statuses[user_id],
+                "rating": profile_data.get("rating", INITIAL_RATING),
+                "total_games": profile_data.get("total_games", 0),
+                "profile_image": profile_data.get(
+                    "profile_image", DEFAULT_PROFILE_IMAGE
+                ),
+            }
+        )
+
+    return users_with_status
+
+
+# ------------------------------
+# 접속자 목록 버전 관리 (스냅샷 + 델타)
+# ------------------------------
+# 마지막으로 보낸 목록과 버전 (여러 프로세스가 같은 번호를 쓰도록 캐시에 보관)
+USERS_STATE_KEY = "lobby_users_state"  # {"seq": int, "users": {user_id: user}}
+USERS_SEQ_KEY = (
+    "lobby_users_seq"  # 마지막으로 저장한 버전 (상태가 유실돼도 번호를 이어감)
+)
+USERS_SEQ_CLAIM_TIMEOUT = 60  # 버전 선점 기록 보관 시간 (초)
+# 다른 프로세스와 경합해 저장에 밀렸을 때 다시 계산하는 횟수
+USERS_SAVE_ATTEMPTS = 3
+
+
+def _save_users_state(users: list[dict], base_seq: int) -> Optional[dict]:
+    """
+    base_seq 다음 버전으로 저장 (seq 로 compare-and-set)
+    같은 번호는 cache.add 로 먼저 선점한 프로세스만 저장 - 밀린 쪽은 None (번호를 소모하지 않음)
+    """
+    seq = base_seq + 1
+    if not cache.add(f"{USERS_SEQ_KEY}:{seq}", True, USERS_SEQ_CLAIM_TIMEOUT):
+        return None
+    state = {"seq": seq, "users": {u["user_id"]: u for u in users}}
+    cache.set(USERS_STATE_KEY, state, timeout=None)
+    cache.set(USERS_SEQ_KEY, seq, timeout=None)
+    return state
+
+
+def get_users_state() -> dict:
+    """마지막으로 보낸 접속자 목록과 그 버전 (없으면 새로 만듦)"""
+    users = None
+    for _ in range(USERS_SAVE_ATTEMPTS):
+        state = cache.get(USERS_STATE_KEY)
+        if state is not None:
+            return state
+        users = get_lobby_users()
+        state = _save_users_state(users, cache.get(USERS_SEQ_KEY, 0))
+        if state is not None:
+            return state
+    # 다른 프로세스가 저장 중 - 저장하지 않고 마지막 번호로 보냄 (어긋나면 클라이언트가 resync)
+    return {
+        "seq": cache.get(USERS_SEQ_KEY, 0),
+        "users": {u["user_id"]: u for u in users},
+    }
+
+
+def build_users_message(state: Optional[dict] = None) -> str:
+    """전체 스냅샷 메시지 (접속 시 / 클라이언트가 버전 누락을 감지했을 때)"""
+    if state is None:
+        state = get_users_state()
+    return json.dumps(
+        {"type": "users", "seq": state["seq"], "users": list(state["users"].values())}
+    )
+
+
+def diff_users(old: dict[int, dict], new: dict[int, dict]) -> list[dict]:
+    """
+    두 목록의 차이를 패치 목록으로
+    - user_added: 새 유저, 또는 상태 외 정보(RP, 프로필 등)가 바뀐 유저 (클라이언트는 덮어씀)
+    - user_removed: 나간 유저
+    - user_status: 상태만 바뀐 유저
+    """
+    patches = [
+        {"op": "user_removed", "user_id": user_id}
+        for user_id in old
+        if user_id not in new
+    ]
+    for user_id, user in new.items():
+        before = old.get(user_id)
+        if before == user:
+            continue
+        if before is not None and {**before, "status": user["status"]} == user:
+            patches.append(
+                {"op": "user_status", "user_id": user_id, "status": user["status"]}
+            )
+        else:
+            patches.append({"op": "user_added", "user": user})
+    return patches
+
+
+def build_users_delta() -> Optional[str]:
+    """
+    현재 목록을 마지막으로 보낸 상태와 비교해 델타 메시지를 만들고 상태를 갱신.
+    바뀐 것이 없으면 None, 이전 상태가 없으면(캐시 유실 등) 전체 스냅샷.
+    클라이언트는 base 가 자기 seq 와 같을 때만 적용하고, 아니면 users_resync 를 요청한다.
+
+    읽기 → 비교 → 저장은 여러 프로세스에서 동시에 돌 수 있으므로 _save_users_state 가
+    읽은 상태의 seq + 1 을 선점한 경우에만 저장 - 그 사이 다른 프로세스가 먼저 저장했으면
+    그 상태를 기준으로 다시 계산 (계속 밀리면 None, 이긴 쪽들이 이미 보냄).
+    """
+    for _ in range(USERS_SAVE_ATTEMPTS):
+        # 상태를 먼저 읽어야 목록을 읽는 사이에 저장된 상태와 경합이 잡힘
+        old = cache.get(USERS_STATE_KEY)
+        users = get_lobby_users()
+        if old is None:
+            state = _save_users_state(users, cache.get(USERS_SEQ_KEY, 0))
+            if state is not None:
+                return build_users_message(state)
+            continue
+
+        patches = diff_users(old["users"], {u["user_id"]: u for u in users})
+        if not patches:
+            return None
+        state = _save_users_state(users, old["seq"])
+        if state is not None:
+            return json.dumps(
+                {
+                    "type": "users_delta",
+                    "seq": state["seq"],
+                    "base": old["seq"],
+                    "patches": patches,
+                }
+            )
+    return None
+
+
+async def broadcast_lobby_users(channel_layer):
+    """
+    접속자 변경분을 한 번 계산/직렬화해서 로비 그룹 전체에 전송.
+    (각 LobbyConsumer 는 받은 텍스트를 그대로 내보내기만 함)
+    """
+    text = await database_sync_to_async(build_users_delta)()
+    if text:
+        await channel_layer.group_send(
+            LOBBY_GROUP, {"type": "users_snapshot", "text": text}
+        )
+
+
+# ------------------------------
+# 로비 알림 병합 (debounce)
+# ------------------------------
+DEFAULT_NOTIFY_WINDOWS = {"users": 0.25, "rooms": 0.25}
+
+
+async def broadcast_lobby_rooms(channel_layer):
+    """방 목록을 한 번 만들고 직렬화해서 로비 그룹 전체에 전송 (캐시는 notify 때 세대가 올라감)"""
+    text = await database_sync_to_async(build_rooms_message)()
+    await channel_layer.group_send(
+        LOBBY_GROUP, {"type": "room_list_snapshot", "text": text}
+    )
+
+
+class LobbyNotifier:
+    """
+    로비 알림 병합기.
+    이벤트 종류별 창(window) 안에 들어온 알림을 모아서 창이 끝날 때 한 번만 전송한다.
+    (재접속 폭주 시 같은 목록을 수천 번 다시 보내는 것을 방지)
+    """
+
+    SENDERS = {"users": broadcast_lobby_users, "rooms": broadcast_lobby_rooms}
+
+    def __init__(self, windows: dict[str, float] | None = None):
+        self._windows = windows
+        self._pending: dict[str, asyncio.Task] = {}
+        self.received: Counter[str] = Counter()  # 들어온 알림 수
+        self.emitted: Counter[str] = Counter()  # 실제 전송(fan-out) 수
+
+    @property
+    def windows(self) -> dict[str, float]:
+        if self._windows is None:
+            return getattr(settings, "LOBBY_NOTIFY_WINDOWS", DEFAULT_NOTIFY_WINDOWS)
+        return self._windows
+
+    async def notify(self, *kinds: str):
+        """kinds = "users" / "rooms" 중 하나 이상"""
+        loop = asyncio.get_running_loop()
+        for kind in kinds:
+            self.received[kind] += 1
+            if kind == "rooms":
+                # 전송은 모아서 해도, 캐시는 바로 무효화해서 그 사이 조회가 옛 목록을 보지 않게 함
+                await sync_to_async(invalidate_waiting_rooms)()
+            window = self.windows.get(kind, 0)
+            if window <= 0:
+                await self._emit(kind)
+                continue
+
+            # 같은 이벤트 루프에 예약된 전송이 있으면 거기에 합쳐짐
+            task = self._pending.get(kind)
+            if task and not task.done() and task.get_loop() is loop:
+                continue
+            self._pending[kind] = loop.create_task(self._flush_later(kind, window))
+
+    async def _flush_later(self, kind: str, window: float):
+        try:
+            await asyncio.sleep(window)
+        finally:
+            # 취소되어도 모아둔 알림은 버리지 않음
+            if self._pending.get(kind) is asyncio.current_task():
+                del self._pending[kind]
+            await self._emit(kind)
+
+    async def _emit(self, kind: str):
+        self.emitted[kind] += 1
+        try:
+            await self.SENDERS[kind](get_channel_layer())
+        except Exception as e:
+            print(f"[LobbyNotifier] {kind} fan-out error: {repr(e)}")
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """이벤트 종류별 수신/전송 카운터"""
+        return {
+            kind: {"received": self.received[kind], "emitted": self.emitted[kind]}
+            for kind in sorted(set(self.received) | set(self.emitted))
+        }
+
+
+# 프로세스 전역 인스턴스
+lobby_notifier = LobbyNotifier()
@@ -0,0 +1,155 @@
+import asyncio
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+
+from app.games.matchmaking import (
+    ACCEPT_TIMEOUT,
+    TICK_INTERVAL,
+    get_pairing_strategy,
+    matchmaking_service,
+)
+from app.games.utils.lobby import lobby_notifier
+
+# 큐에 있는 MatchmakingConsumer 들이 들어가는 그룹 (틱마다 상태 업데이트 1회 전송)
+MATCHMAKING_GROUP = "matchmaking_queue"
+
+
+async def notify_match_found(channel_layer, match_id, player1, player2):
+    """매칭 성공 알림 전송 (채널 이름은 큐 엔트리에 저장된 값 사용)"""
+    for me, opponent in ((player1, player2), (player2, player1)):
+        if not me.channel_name:
+            continue
+        await channel_layer.send(
+            me.channel_name,
+            {
+                "type": "send_match_found",
+                "match_id": match_id,
+                "opponent_nickname": opponent.nickname,
+                "opponent_rating": opponent.rating,
+                "opponent_total_games": opponent.total_games,
+                "opponent_profile_image": opponent.profile_image,
+                "accept_timeout": ACCEPT_TIMEOUT,
+            },
+        )
+
+
+class Matchmaker:
+    """
+    프로세스당 1개의 중앙 매칭 루프
+    - 매 틱마다 큐 전체를 한 번에 짝짓고 (settings.MATCHMAKING_PAIRING), 대기 상태는 그룹 메시지 1개로 전송
+    - 유저별 태스크가 각자 find_match 하던 방식의 중복 매칭 경쟁이 없음
+    - Redis 백엔드에서는 리더 임대를 가진 프로세스만 짝지음
+    - 틱마다 수락 시간이 지난 대기 매치 / 너무 오래된 큐 엔트리도 정리 (clock 주입 가능)
+    - 서비스 호출(Redis 백엔드는 블로킹 I/O)과 짝짓기 계산은 sync_to_async 로 이벤트 루프 밖에서 실행
+    """
+
+    def __init__(
+        self,
+        service=matchmaking_service,
+        interval: float = TICK_INTERVAL,
+        clock=time.time,
+    ):
+        self.service = service
+        self.interval = interval
+        self.clock = clock
+        self.owner = uuid.uuid4().hex
+        self._task = None
+
+    def ensure_running(self):
+        """큐 진입 시 호출 - 루프가 없으면 현재 이벤트 루프에서 시작"""
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        # 큐와 대기 매치가 모두 빌 때까지 돌고 종료 (다음 진입 때 다시 시작)
+        while await sync_to_async(self.has_work)():
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"[Matchmaker] tick error: {repr(e)}")
+            await asyncio.sleep(self.interval)
+
+    def has_work(self) -> bool:
+        """큐나 대기 매치가 남아 있는지"""
+        return self.service.get_queue_size() > 0 or self.service.get_pending_count() > 0
+
+    def pair_queue(self, now: float) -> list:
+        """큐 전체 짝짓기 + 대기 매치 생성 → [(match_id, player1, player2), ...]"""
+        pair = get_pairing_strategy()
+        matches = []
+        for player1, player2 in pair(self.service.get_queue_entries(), now):
+            match_id = self.service.create_pending_match(player1, player2)
+            if match_id:
+                matches.append((match_id, player1, player2))
+        return matches
+
+    async def tick(self) -> int:
+        """큐 한 번 짝짓기 + 대기 상태 전송. 성사된 매치 수 반환"""
+        if not await sync_to_async(self.service.acquire_tick_lease)(self.owner):
+            return 0
+
+        channel_layer = get_channel_layer()
+        now = self.clock()
+        await self.sweep(channel_layer, now)
+
+        matches = await sync_to_async(self.pair_queue)(now)
+        for match_id, player1, player2 in matches:
+            await notify_match_found(channel_layer, match_id, player1, player2)
+
+        # 남은 대기자에게 경과 시간/범위 갱신 (각 컨슈머가 자기 대기 시간으로 계산)
+        await channel_layer.group_send(
+            MATCHMAKING_GROUP,
+            {
+                "type": "queue_tick",
+                "now": now,
+                "queue_size": await sync_to_async(self.service.get_queue_size)(),
+            },
+        )
+        return len(matches)
+
+    async def sweep(self, channel_layer, now: float):
+        """
+        만료 처리
+        - 수락 시간 초과 매치: 수락한 쪽은 다시 큐에 넣고, 양쪽에 match_timeout 전송
+        - QUEUE_TIMEOUT 지난 큐 엔트리: 큐에서 빼고 queue_timeout 전송
+        """
+        changed = False
+        for match in await sync_to_async(self.service.expire_pending_matches)(now):
+            changed = True
+            for player, accepted in (
+                (match.player1, match.player1_accepted),
+                (match.player2, match.player2_accepted),
+            ):
+                requeued = accepted and await sync_to_async(self.service.add_to_queue)(
+                    user_id=player.user_id,
+                    rating=player.rating,
+                    channel_name=player.channel_name,
+                    nickname=player.nickname,
+                    username=player.username,
+                    total_games=player.total_games,
+                    profile_image=player.profile_image,
+                )
+                if player.channel_name:
+                    await channel_layer.send(
+                        player.channel_name,
+                        {"type": "send_match_timeout", "requeued": bool(requeued)},
+                    )
+
+        for entry in await sync_to_async(self.service.expire_queue_entries)(now):
+            changed = True
+            if entry.channel_name:
+                await channel_layer.send(
+                    entry.channel_name, {"type": "send_queue_expired"}
+                )
+
+        if changed:
+            await lobby_notifier.notify("users")
+
+
+# 프로세스 전역 인스턴스
+matchmaker = Matchmaker()
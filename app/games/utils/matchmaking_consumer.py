@@ -1,6 +1,6 @@
-import asyncio
 import random
 
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.contrib.auth import get_user_model
@@ -8,21 +8,23 @@ from django.db.models import Q
 
 from app.accounts.models import INITIAL_RATING, UserProfile
 from app.games.matchmaking import (
-    ACCEPT_TIMEOUT,
     MatchStatus,
     get_current_range,
     matchmaking_service,
 )
 from app.games.models import Game
+from app.games.utils.heartbeat import HeartbeatMixin
+from app.games.utils.lobby import lobby_notifier
+from app.games.utils.matchmaker import MATCHMAKING_GROUP, matchmaker
 
 User = get_user_model()
 
 
-class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
-    """매칭 WebSocket 컨슈머"""
-
-    # 유저별 채널 매핑 (브로드캐스트용)
-    user_channels: dict[int, str] = {}
+class MatchmakingConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
+    """
+    매칭 WebSocket 컨슈머 (상대 채널은 큐 엔트리의 channel_name 사용 - 다른 프로세스여도 전달됨)
+    matchmaking_service 호출은 Redis 백엔드에서 네트워크 I/O 이므로 모두 sync_to_async 로 이벤트 루프 밖에서 실행
+    """
 
     async def connect(self):
         """WebSocket 연결"""
@@ -35,31 +37,22 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
         self.user = user
         self.user_id = user.id
         self.in_queue = False
-        self.queue_task = None
-
-        # 채널 매핑
-        MatchmakingConsumer.user_channels[self.user_id] = self.channel_name
+        self.queue_joined_at = 0.0
 
         await self.accept()
+        await self.touch_online()
 
     async def disconnect(self, code):
         """WebSocket 연결 해제"""
-        # 큐 업데이트 태스크 취소
-        if self.queue_task:
-            self.queue_task.cancel()
-            try:
-                await self.queue_task
-            except asyncio.CancelledError:
-                pass
+        await self.channel_layer.group_discard(MATCHMAKING_GROUP, self.channel_name)
 
         # 매칭 서비스 정리
-        matchmaking_service.cleanup_user(self.user_id)
-
-        # 채널 매핑 제거
-        MatchmakingConsumer.user_channels.pop(self.user_id, None)
+        await sync_to_async(matchmaking_service.cleanup_user)(self.user_id)
 
     async def receive_json(self, content):
         """메시지 수신 처리"""
+        if await self.handle_ping(content):
+            return
         msg_type = content.get("type")
 
         if msg_type == "join_queue":
@@ -94,7 +87,7 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
         nickname = self.user.first_name or self.user.username
 
         # 큐에 추가
-        success = matchmaking_service.add_to_queue(
+        success = await sync_to_async(matchmaking_service.add_to_queue)(
             user_id=self.user_id,
             rating=rating,
             channel_name=self.channel_name,
@@ -113,117 +106,58 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
             )
             return
 
-        self.in_queue = True
+        await self.enter_queue()
 
         # 큐 진입 확인
         await self.send_json(
             {
                 "type": "queue_joined",
                 "rating": rating,
-                "queue_size": matchmaking_service.get_queue_size(),
+                "queue_size": await sync_to_async(matchmaking_service.get_queue_size)(),
             }
         )
 
         # 로비에 매칭 상태 변경 알림
         await self.notify_lobby_matchmaking_change()
 
-        # 주기적 업데이트 및 매칭 체크 시작
-        self.queue_task = asyncio.create_task(self.queue_update_loop())
+    async def enter_queue(self):
+        """큐에 들어간 상태로 전환 - 틱 그룹 참가 + 중앙 매칭 루프 시작"""
+        entry = await sync_to_async(matchmaking_service.get_queue_entry)(self.user_id)
+        if not entry:
+            return
+        self.in_queue = True
+        self.queue_joined_at = entry.joined_at
+        await self.channel_layer.group_add(MATCHMAKING_GROUP, self.channel_name)
+        matchmaker.ensure_running()
 
     async def handle_leave_queue(self):
         """큐 이탈 처리"""
-        if self.queue_task:
-            self.queue_task.cancel()
-            try:
-                await self.queue_task
-            except asyncio.CancelledError:
-                pass
-            self.queue_task = None
-
-        matchmaking_service.remove_from_queue(self.user_id)
+        await sync_to_async(matchmaking_service.remove_from_queue)(self.user_id)
         self.in_queue = False
+        await self.channel_layer.group_discard(MATCHMAKING_GROUP, self.channel_name)
 
         await self.send_json({"type": "queue_left"})
 
         # 로비에 매칭 상태 변경 알림
         await self.notify_lobby_matchmaking_change()
 
-    async def queue_update_loop(self):
-        """큐 업데이트 루프 (매초 실행)"""
-        try:
-            while self.in_queue:
-                # 매칭 상대 찾기
-                opponent = matchmaking_service.find_match(self.user_id)
-
-                if opponent:
-                    # 매칭 성공!
-                    my_entry = matchmaking_service.get_queue_entry(self.user_id)
-                    if my_entry:
-                        await self.create_match(my_entry, opponent)
-                        return
-
-                # 큐 상태 업데이트 전송
-                seconds = matchmaking_service.get_seconds_in_queue(self.user_id)
-                current_range = get_current_range(seconds)
-
-                await self.send_json(
-                    {
-                        "type": "queue_update",
-                        "elapsed_seconds": seconds,
-                        "current_range": current_range,
-                        "queue_size": matchmaking_service.get_queue_size(),
-                    }
-                )
-
-                await asyncio.sleep(1)
-
-        except asyncio.CancelledError:
-            pass
-
-    async def create_match(self, player1, player2):
-        """매칭 생성 및 알림"""
-        match_id = matchmaking_service.create_pending_match(player1, player2)
-        self.in_queue = False
-
-        # 양쪽에게 매칭 성공 알림
-        await self.notify_match_found(match_id, player1, player2)
-
-    async def notify_match_found(self, match_id, player1, player2):
-        """매칭 성공 알림 전송"""
-        # Player1에게 전송
-        p1_channel = MatchmakingConsumer.user_channels.get(player1.user_id)
-        if p1_channel:
-            await self.channel_layer.send(
-                p1_channel,
-                {
-                    "type": "send_match_found",
-                    "match_id": match_id,
-                    "opponent_nickname": player2.nickname,
-                    "opponent_rating": player2.rating,
-                    "opponent_total_games": player2.total_games,
-                    "opponent_profile_image": player2.profile_image,
-                    "accept_timeout": ACCEPT_TIMEOUT,
-                },
-            )
-
-        # Player2에게 전송
-        p2_channel = MatchmakingConsumer.user_channels.get(player2.user_id)
-        if p2_channel:
-            await self.channel_layer.send(
-                p2_channel,
-                {
-                    "type": "send_match_found",
-                    "match_id": match_id,
-                    "opponent_nickname": player1.nickname,
-                    "opponent_rating": player1.rating,
-                    "opponent_total_games": player1.total_games,
-                    "opponent_profile_image": player1.profile_image,
-                    "accept_timeout": ACCEPT_TIMEOUT,
-                },
-            )
+    async def queue_tick(self, event):
+        """중앙 매칭 루프의 틱 - 큐 상태 업데이트 전송"""
+        if not self.in_queue:
+            return
+        seconds = max(0, int(event["now"] - self.queue_joined_at))
+        await self.send_json(
+            {
+                "type": "queue_update",
+                "elapsed_seconds": seconds,
+                "current_range": get_current_range(seconds),
+                "queue_size": event["queue_size"],
+            }
+        )
 
     async def send_match_found(self, event):
         """매칭 성공 메시지 전송 핸들러"""
+        self.in_queue = False
         await self.send_json(
             {
                 "type": "match_found",
@@ -243,18 +177,22 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
         if not match_id:
             return
 
-        status = matchmaking_service.accept_match(match_id, self.user_id)
+        status = await sync_to_async(matchmaking_service.accept_match)(
+            match_id, self.user_id
+        )
 
         if status == MatchStatus.CONFIRMED:
             # 양쪽 수락 완료 - 게임 생성
-            match = matchmaking_service.confirm_and_cleanup(match_id)
+            match = await sync_to_async(matchmaking_service.confirm_and_cleanup)(
+                match_id
+            )
             if match:
                 game = await self.create_game(match.player1, match.player2)
 
                 # 양쪽에게 게임 시작 알림
                 await self.notify_match_confirmed(
-                    match.player1.user_id,
-                    match.player2.user_id,
+                    match.player1.channel_name,
+                    match.player2.channel_name,
                     game.pk,
                 )
 
@@ -281,7 +219,9 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
         if not match_id:
             return
 
-        status, other_player = matchmaking_service.decline_match(match_id, self.user_id)
+        status, other_player = await sync_to_async(matchmaking_service.decline_match)(
+            match_id, self.user_id
+        )
 
         # 본인에게 거절 확인
         await self.send_json(
@@ -294,7 +234,7 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
         # 상대방에게 알림 + 다시 큐에 넣기
         if other_player:
             # 상대방을 다시 큐에 넣기
-            matchmaking_service.add_to_queue(
+            await sync_to_async(matchmaking_service.add_to_queue)(
                 user_id=other_player.user_id,
                 rating=other_player.rating,
                 channel_name=other_player.channel_name,
@@ -304,16 +244,38 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
                 profile_image=other_player.profile_image,
             )
 
-            other_channel = MatchmakingConsumer.user_channels.get(other_player.user_id)
-            if other_channel:
+            if other_player.channel_name:
                 await self.channel_layer.send(
-                    other_channel,
+                    other_player.channel_name,
                     {
                         "type": "send_match_declined",
                         "reason": "opponent_declined",
                     },
                 )
 
+    async def send_match_timeout(self, event):
+        """수락 시간 초과 (매칭 루프가 전송) - 수락했던 쪽은 이미 큐에 다시 등록되어 있음"""
+        await self.send_json(
+            {
+                "type": "match_timeout",
+                "message": "수락 시간이 초과되었습니다.",
+                "requeued": event["requeued"],
+            }
+        )
+        if event["requeued"]:
+            await self.enter_queue()
+
+    async def send_queue_expired(self, event):
+        """큐 최대 대기 시간 초과로 자동 이탈"""
+        self.in_queue = False
+        await self.channel_layer.group_discard(MATCHMAKING_GROUP, self.channel_name)
+        await self.send_json(
+            {
+                "type": "queue_timeout",
+                "message": "매칭 대기 시간이 초과되었습니다.",
+            }
+        )
+
     async def send_match_declined(self, event):
         """매칭 거절 메시지 전송 핸들러 - 다시 큐 루프 시작"""
         await self.send_json(
@@ -323,20 +285,14 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
             }
         )
 
-        # 다시 큐 업데이트 루프 시작 (상대방이 거절한 경우)
-        # 이미 큐에 다시 등록되어 있음
-        if matchmaking_service.get_queue_entry(self.user_id):
-            self.in_queue = True
-            if self.queue_task:
-                self.queue_task.cancel()
-            self.queue_task = asyncio.create_task(self.queue_update_loop())
+        # 다시 큐 대기 상태로 (상대방이 거절한 경우, 이미 큐에 다시 등록되어 있음)
+        await self.enter_queue()
 
     async def notify_match_confirmed(
-        self, player1_id: int, player2_id: int, game_id: int
+        self, player1_channel: str, player2_channel: str, game_id: int
     ):
         """매칭 확정 알림"""
-        for player_id in [player1_id, player2_id]:
-            channel = MatchmakingConsumer.user_channels.get(player_id)
+        for channel in [player1_channel, player2_channel]:
             if channel:
                 await self.channel_layer.send(
                     channel,
@@ -404,8 +360,6 @@ class MatchmakingConsumer(AsyncJsonWebsocketConsumer):
     async def notify_lobby_matchmaking_change(self):
         """로비에 매칭 상태 변경 알림"""
         try:
-            await self.channel_layer.group_send(
-                "lobby", {"type": "user_status_changed"}
-            )
+            await lobby_notifier.notify("users")
         except Exception as e:
             print(f"[MatchmakingConsumer] notify_lobby error: {repr(e)}")
@@ -1,7 +1,9 @@
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+from .heartbeat import HeartbeatMixin
 
-class NotificationConsumer(AsyncJsonWebsocketConsumer):
+
+class NotificationConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
     """개인 알림용 WebSocket Consumer
 
     로비 등에서 실시간 알림을 받기 위한 채널.
@@ -23,6 +25,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         await self.channel_layer.group_add(self.notification_group, self.channel_name)
 
         await self.accept()
+        await self.touch_online()
 
     async def disconnect(self, close_code):
         """WebSocket 연결 해제"""
@@ -32,8 +35,8 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             )
 
     async def receive_json(self, content):
-        """클라이언트에서 메시지 수신 (현재는 사용하지 않음)"""
-        pass
+        """클라이언트에서 메시지 수신 (하트비트 ping 만 사용)"""
+        await self.handle_ping(content)
 
     async def dm_notification(self, event):
         """DM 알림을 클라이언트에 전송"""
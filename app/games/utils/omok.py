@@ -1,3 +1,5 @@
+from functools import cache
+
 EMPTY = "."
 BLACK = "B"
 WHITE = "W"
@@ -49,19 +51,370 @@ def _line_as_string_with_coords(board, x, y, dx, dy, span=6):
 
 
 # ------------------------------
-# 5목/장목
+# 비트보드
 # ------------------------------
-def check_five(board, stone):
-    """보드에 stone의 5목 이상이 하나라도 존재하면 True."""
-    n = len(board)
-    for i in range(n):
-        for j in range(n):
-            if board[i][j] != stone:
+SPAN = 6  # 판정 윈도우 반경 (중심 ±6 = 13칸, _line_as_string_with_coords 와 동일)
+WINDOW_MASK = (1 << (2 * SPAN + 1)) - 1
+# 열린3 판정은 중심에서 ±5칸 떨어진 빈칸의 ±SPAN 윈도우까지 보므로 반경 11까지 필요
+_WIDE = SPAN + 5
+_LOW_MASK = (1 << SPAN) - 1
+_OPPONENT = {BLACK: WHITE, WHITE: BLACK}
+
+
+def _line_coord(n, d, x, y):
+    """(x,y)가 d 방향으로 몇 번째 줄의 몇 번째 칸인지 반환."""
+    dx, dy = DIRECTIONS[d]
+    if (dx, dy) == (1, 0):
+        return y, x
+    if (dx, dy) == (0, 1):
+        return x, y
+    if (dx, dy) == (1, 1):
+        return x - y + n - 1, min(x, y)
+    return x + y, min(x, n - 1 - y)  # (1, -1)
+
+
+@cache
+def _bit_layout(n):
+    """
+    n x n 보드의 방향별 비트 배치.
+    방향마다 한 줄을 연속된 비트로 펼치고, 줄 사이에 _WIDE 비트 여백을 둔다.
+    → 어떤 칸이든 ±_WIDE 윈도우를 shift 한 번으로 잘라낼 수 있고 경계 밖은 항상 0.
+    반환: (pos, onboard)
+      pos[d][x][y] = d 방향 배치에서 (x,y)의 비트 위치
+      onboard[d]   = d 방향 배치에서 보드 안 칸들의 마스크
+    """
+    stride = n + _WIDE
+    pos, onboard = [], []
+    for d in range(len(DIRECTIONS)):
+        table = [[0] * n for _ in range(n)]
+        mask = 0
+        for x in range(n):
+            for y in range(n):
+                line, offset = _line_coord(n, d, x, y)
+                p = line * stride + _WIDE + offset
+                table[x][y] = p
+                mask |= 1 << p
+        pos.append(table)
+        onboard.append(mask)
+    return pos, onboard
+
+
+def _trailing_ones(v):
+    return (v ^ (v + 1)).bit_length() - 1
+
+
+def _run_extent(mine):
+    """13비트 윈도우에서 중심 비트로부터 (-방향, +방향)으로 이어진 돌 개수."""
+    down = SPAN - (~mine & _LOW_MASK).bit_length()
+    up = _trailing_ones(mine >> (SPAN + 1))
+    return down, up
+
+
+def _run_through_center(mine):
+    """13비트 윈도우에서 중심 비트를 지나는 연속 돌 개수 (중심은 놓였다고 가정)."""
+    down, up = _run_extent(mine)
+    return 1 + down + up
+
+
+# ------------------------------
+# 패턴 룩업 테이블
+# ------------------------------
+# 13칸 윈도우의 각 칸을 3진수 한 자리로 인코딩한다.
+#   0 = 막힘(상대 돌 또는 보드 밖), 1 = 내 돌, 2 = 빈칸
+# 키 = Σ digit_i * 3^i (i = 윈도우 비트 위치, 중심 = SPAN)
+# 규칙 판정은 같은 색 / 빈칸 / 그 외만 구분하므로 3^13 가지 윈도우로 모든 경우가 표현된다.
+WINDOW_CELLS = 2 * SPAN + 1
+_BLOCKED, _MINE, _EMPTY = 0, 1, 2
+_NOT_MINE = (_BLOCKED, _EMPTY)
+
+PAT_OPEN_FOUR = 1  # 독립된 열린4 (.BBBB., 바깥이 같은 색으로 바로 이어지지 않음)
+PAT_THREE = 2  # 보조 열린3 패턴 .BBB. / .BB.B. / .B.BB.
+PAT_FIVE = 4  # 중심을 지나는 5목 이상
+PAT_OVERLINE = 8  # 중심을 지나는 6목 이상 (장목)
+
+THREE_PATTERNS = ("_BBB_", "_BB_B_", "_B_BB_")
+
+
+def _bits_to_base3():
+    """13비트 비트열 → 켜진 비트 자리만 3진수 1인 값 (키 계산용)."""
+    table = [0] * (1 << WINDOW_CELLS)
+    for v in range(1, len(table)):
+        low = v & -v
+        table[v] = table[v ^ low] + 3 ** (low.bit_length() - 1)
+    return table
+
+
+_B3_MINE = _bits_to_base3()
+_B3_EMPTY = [2 * v for v in _B3_MINE]
+
+
+def window_key(mine, empty):
+    """(내 돌, 빈칸) 13비트 윈도우 → 패턴 테이블 키."""
+    return _B3_MINE[mine] + _B3_EMPTY[empty]
+
+
+def _mark(table, fixed, flag):
+    """fixed = {칸: 허용 digit 튜플} 조건을 만족하는 모든 윈도우 키에 flag 를 켠다 (나머지 칸은 자유)."""
+    keys = [0]
+    for i in range(WINDOW_CELLS):
+        weight = 3**i
+        keys = [k + d * weight for k in keys for d in fixed.get(i, (0, 1, 2))]
+    for k in keys:
+        table[k] |= flag
+
+
+def _build_pattern_table():
+    """
+    모든 윈도우를 하나씩 판정하는 대신, 각 패턴이 성립하는 윈도우 집합을 직접 열거해 표시한다.
+    (3^13 ≈ 160만 칸, 생성은 시작 시 한 번)
+    """
+    table = bytearray(3**WINDOW_CELLS)
+
+    # 열린4: '.BBBB.' + 바깥 칸(윈도우 안이라면)은 내 돌이 아님
+    for k in range(WINDOW_CELLS - 5):
+        fixed = {k: (_EMPTY,), k + 5: (_EMPTY,)}
+        fixed.update({k + i: (_MINE,) for i in range(1, 5)})
+        if k - 1 >= 0:
+            fixed[k - 1] = _NOT_MINE
+        if k + 6 < WINDOW_CELLS:
+            fixed[k + 6] = _NOT_MINE
+        _mark(table, fixed, PAT_OPEN_FOUR)
+
+    # 보조 열린3 패턴 (윈도우 어디에 있든)
+    for pattern in THREE_PATTERNS:
+        for k in range(WINDOW_CELLS - len(pattern) + 1):
+            fixed = {
+                k + i: (_MINE,) if c == "B" else (_EMPTY,)
+                for i, c in enumerate(pattern)
+            }
+            _mark(table, fixed, PAT_THREE)
+
+    # 중심을 지나는 연속 돌: 중심에서 아래로 down, 위로 up 칸
+    for down in range(SPAN + 1):
+        for up in range(SPAN + 1):
+            run = 1 + down + up
+            if run < 5:
                 continue
-            for dx, dy in DIRECTIONS:
-                if _run_length_from(board, i, j, dx, dy, stone) >= 5:
+            fixed = {i: (_MINE,) for i in range(SPAN - down, SPAN + up + 1)}
+            if SPAN - down - 1 >= 0:
+                fixed[SPAN - down - 1] = _NOT_MINE
+            if SPAN + up + 1 < WINDOW_CELLS:
+                fixed[SPAN + up + 1] = _NOT_MINE
+            _mark(table, fixed, PAT_FIVE | (PAT_OVERLINE if run >= 6 else 0))
+
+    return table
+
+
+PATTERN_TABLE = _build_pattern_table()
+
+
+class BitBoard:
+    """
+    색별·방향별 정수 마스크로 표현한 보드.
+    masks[stone][d] = d 방향 배치(_bit_layout)에서 stone이 놓인 칸들의 비트.
+    착수/회수는 방향당 비트 연산 한 번이고, 판정은 윈도우를 잘라 비트 연산으로 처리한다.
+    """
+
+    __slots__ = ("n", "pos", "onboard", "masks")
+
+    def __init__(self, n=15):
+        self.n = n
+        self.pos, self.onboard = _bit_layout(n)
+        self.masks = {BLACK: [0] * len(DIRECTIONS), WHITE: [0] * len(DIRECTIONS)}
+
+    @classmethod
+    def from_board(cls, board):
+        """2D 보드(board[x][y])로부터 생성."""
+        bb = cls(len(board))
+        for x, row in enumerate(board):
+            for y, cell in enumerate(row):
+                if cell == BLACK or cell == WHITE:
+                    bb.place(x, y, cell)
+        return bb
+
+    @classmethod
+    def from_string(cls, s, n):
+        """Game.board 문자열(인덱스 = y * n + x)로부터 생성."""
+        bb = cls(n)
+        for i, cell in enumerate(s):
+            if cell == BLACK or cell == WHITE:
+                bb.place(i % n, i // n, cell)
+        return bb
+
+    def copy(self):
+        bb = BitBoard.__new__(BitBoard)
+        bb.n, bb.pos, bb.onboard = self.n, self.pos, self.onboard
+        bb.masks = {stone: masks[:] for stone, masks in self.masks.items()}
+        return bb
+
+    def to_board(self):
+        """2D 보드(board[x][y])로 변환 (디버그용)."""
+        return [[self.get(x, y) for y in range(self.n)] for x in range(self.n)]
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.n and 0 <= y < self.n
+
+    def get(self, x, y):
+        bit = 1 << self.pos[0][x][y]
+        if self.masks[BLACK][0] & bit:
+            return BLACK
+        if self.masks[WHITE][0] & bit:
+            return WHITE
+        return EMPTY
+
+    def place(self, x, y, stone):
+        masks = self.masks[stone]
+        for d, table in enumerate(self.pos):
+            masks[d] |= 1 << table[x][y]
+
+    def remove(self, x, y, stone):
+        masks = self.masks[stone]
+        for d, table in enumerate(self.pos):
+            masks[d] &= ~(1 << table[x][y])
+
+    def _window(self, d, x, y, stone, radius=SPAN):
+        """d 방향으로 (x,y) 중심 ±radius 윈도우를 잘라 (내 돌, 빈칸) 비트열로 반환."""
+        lo = self.pos[d][x][y] - radius
+        width = (1 << (2 * radius + 1)) - 1
+        mine = (self.masks[stone][d] >> lo) & width
+        theirs = (self.masks[_OPPONENT[stone]][d] >> lo) & width
+        empty = (self.onboard[d] >> lo) & width & ~(mine | theirs)
+        return mine, empty
+
+    def _pattern(self, d, x, y, stone):
+        """(x,y)에 stone을 놓았다고 가정한 d 방향 윈도우의 패턴 플래그."""
+        mine, empty = self._window(d, x, y, stone)
+        center = 1 << SPAN
+        return PATTERN_TABLE[window_key(mine | center, empty & ~center)]
+
+    # --- 5목/장목 ---
+    def run_length(self, x, y, d, stone):
+        """(x,y)에 stone이 놓였다고 가정하고 d 방향 양방향 연속 길이."""
+        mine, _ = self._window(d, x, y, stone)
+        return _run_through_center(mine | (1 << SPAN))
+
+    def has_five(self, stone):
+        """보드 전체에 stone의 5목 이상이 하나라도 있으면 True."""
+        for m in self.masks[stone]:
+            if m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4):
+                return True
+        return False
+
+    def has_overline(self, stone):
+        """보드 전체에 stone의 장목(6목↑)이 있으면 True."""
+        for m in self.masks[stone]:
+            if m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4) & (m >> 5):
+                return True
+        return False
+
+    def has_exact_five(self, x, y, stone):
+        """(x,y)에 (이미) 둔 상태라고 가정하고 정확히 5목인가? (장목 방향이 있으면 False)"""
+        exact = False
+        for d in range(len(DIRECTIONS)):
+            flags = self._pattern(d, x, y, stone)
+            if flags & PAT_OVERLINE:
+                return False
+            if flags & PAT_FIVE:
+                exact = True
+        return exact
+
+    def winning_line(self, x, y, stone):
+        """
+        마지막 착수 (x,y)를 지나는 네 줄만 보고 승리 줄의 좌표 목록을 반환 (없으면 None).
+        - 흑: 정확히 5목만 승리 (어느 방향이든 장목이면 None)
+        - 백: 5목 이상 승리
+        """
+        win_dir = None
+        for d in range(len(DIRECTIONS)):
+            flags = self._pattern(d, x, y, stone)
+            if stone == BLACK and flags & PAT_OVERLINE:
+                return None
+            if flags & PAT_FIVE and win_dir is None:
+                win_dir = d
+                if stone != BLACK:
+                    break
+        if win_dir is None:
+            return None
+        dx, dy = DIRECTIONS[win_dir]
+        mine, _ = self._window(win_dir, x, y, stone)
+        down, up = _run_extent(mine | (1 << SPAN))
+        return [(x + k * dx, y + k * dy) for k in range(-down, up + 1)]
+
+    def would_be_overline(self, x, y, stone):
+        """(x,y)에 두면 장목(6목↑)이 되는가?"""
+        if not self.in_bounds(x, y) or self.get(x, y) != EMPTY:
+            return False
+        return any(
+            self._pattern(d, x, y, stone) & PAT_OVERLINE for d in range(len(DIRECTIONS))
+        )
+
+    # --- 열린4 / 열린3 ---
+    def count_open_four_dirs(self, x, y, stone):
+        """(x,y)에 stone을 둘 때 '독립된' 열린4가 생기는 방향 수."""
+        if not self.in_bounds(x, y) or self.get(x, y) != EMPTY:
+            return 0
+        return sum(
+            1
+            for d in range(len(DIRECTIONS))
+            if self._pattern(d, x, y, stone) & PAT_OPEN_FOUR
+        )
+
+    def _has_open_three(self, x, y, d, stone):
+        """(x,y)에 stone이 놓였다고 가정하고 d 방향이 열린3인가? (_has_open_three_on_dir 와 동일)"""
+        mine, empty = self._window(d, x, y, stone, radius=_WIDE)
+        center = 1 << _WIDE
+        mine |= center
+        empty &= ~center
+
+        # 보조 패턴: .BBB. / .BB.B. / .B.BB.
+        lo = _WIDE - SPAN
+        key = window_key((mine >> lo) & WINDOW_MASK, (empty >> lo) & WINDOW_MASK)
+        if PATTERN_TABLE[key] & PAT_THREE:
+            return True
+
+        # 같은 방향 빈칸 하나에 한 수 더 두면 열린4가 되는가?
+        for t in range(-5, 6):
+            bit = center << t if t >= 0 else center >> -t
+            if not empty & bit:
+                continue
+            lo = _WIDE + t - SPAN
+            key = window_key(
+                ((mine | bit) >> lo) & WINDOW_MASK,
+                ((empty & ~bit) >> lo) & WINDOW_MASK,
+            )
+            if PATTERN_TABLE[key] & PAT_OPEN_FOUR:
+                return True
+        return False
+
+    def is_forbidden_double_three(self, x, y, stone):
+        """흑(B)만 33 금수. 범위 밖은 False, 이미 돌이 있는 칸은 True."""
+        if stone != BLACK:
+            return False
+        if not self.in_bounds(x, y):
+            return False
+        if self.get(x, y) != EMPTY:
+            return True
+        dirs = 0
+        for d in range(len(DIRECTIONS)):
+            if self._has_open_three(x, y, d, stone):
+                dirs += 1
+                if dirs >= 2:
                     return True
-    return False
+        return False
+
+    def is_forbidden_double_four(self, x, y, stone):
+        """흑(B)만 44 금수."""
+        if stone != BLACK:
+            return False
+        return self.count_open_four_dirs(x, y, stone) >= 2
+
+
+# ------------------------------
+# 5목/장목 (2D 보드 어댑터)
+# ------------------------------
+def check_five(board, stone):
+    """보드에 stone의 5목 이상이 하나라도 존재하면 True."""
+    return BitBoard.from_board(board).has_five(stone)
 
 
 def has_exact_five(board, x, y, stone):
@@ -70,27 +423,20 @@ def has_exact_five(board, x, y, stone):
     - 어느 한 방향 run == 5 → True
     - run >= 6 있으면 False
     """
-    exact = False
-    for dx, dy in DIRECTIONS:
-        run = _run_length_from(board, x, y, dx, dy, stone)
-        if run >= 6:
-            return False
-        if run == 5:
-            exact = True
-    return exact
+    return BitBoard.from_board(board).has_exact_five(x, y, stone)
+
+
+def find_winning_line(board, x, y, stone):
+    """
+    (x,y)에 (이미) 둔 상태라고 가정하고 (x,y)를 지나는 승리 줄 좌표 목록 (없으면 None).
+    흑은 정확히 5목, 백은 5목 이상. 보드 전체 검사는 check_five 를 사용.
+    """
+    return BitBoard.from_board(board).winning_line(x, y, stone)
 
 
 def is_overline_present(board, stone):
     """현재 보드에 stone의 장목(6목↑)이 존재하면 True."""
-    n = len(board)
-    for i in range(n):
-        for j in range(n):
-            if board[i][j] != stone:
-                continue
-            for dx, dy in DIRECTIONS:
-                if _run_length_from(board, i, j, dx, dy, stone) >= 6:
-                    return True
-    return False
+    return BitBoard.from_board(board).has_overline(stone)
 
 
 def would_be_overline(board, x, y, stone):
@@ -98,14 +444,7 @@ def would_be_overline(board, x, y, stone):
     n = len(board)
     if not _in_bounds(n, x, y) or board[x][y] != EMPTY:
         return False
-    board[x][y] = stone
-    try:
-        for dx, dy in DIRECTIONS:
-            if _run_length_from(board, x, y, dx, dy, stone) >= 6:
-                return True
-        return False
-    finally:
-        board[x][y] = EMPTY
+    return BitBoard.from_board(board).would_be_overline(x, y, stone)
 
 
 def is_overline(board, x, y, stone, *, present_only=False, simulate=False):
@@ -124,7 +463,45 @@ def is_overline(board, x, y, stone, *, present_only=False, simulate=False):
 
 
 # ------------------------------
-# 열린4 / 열린3
+# 열린4 / 금수 (2D 보드 어댑터)
+# ------------------------------
+def count_open_four_dirs(board, x, y, color):
+    """(x,y)에 color를 둘 때 생성되는 '독립된' 열린4가 서로 다른 방향에서 몇 개인지."""
+    n = len(board)
+    if not _in_bounds(n, x, y) or board[x][y] != EMPTY:
+        return 0
+    return BitBoard.from_board(board).count_open_four_dirs(x, y, color)
+
+
+def is_forbidden_double_three(board, x, y, stone):
+    """
+    흑(B)만 33 금수.
+    (x,y)에 두었을 때 서로 다른 두 방향 이상에서 '열린3'이면 True.
+    - 범위 밖: False (유효성은 호출부에서 별도 처리 권장)
+    - 이미 돌이 있는 칸: True (착수 불가 취지)
+    """
+    if stone != BLACK:
+        return False
+    n = len(board)
+    if not _in_bounds(n, x, y):
+        return False
+    if board[x][y] != EMPTY:
+        return True
+    return BitBoard.from_board(board).is_forbidden_double_three(x, y, stone)
+
+
+def is_forbidden_double_four(board, x, y, stone):
+    """
+    흑(B)만 44 금수.
+    (x,y)에 둘 때 서로 다른 두 방향 이상에서 '독립된' 열린4(.BBBB.)가 동시에 만들어지면 True.
+    """
+    if stone != BLACK:
+        return False
+    return count_open_four_dirs(board, x, y, stone) >= 2
+
+
+# ------------------------------
+# 열린4 / 열린3 (문자열 기반 참조 구현 - 디버그/테스트용)
 # ------------------------------
 def _has_open_four_on_dir_str(s, coords, color):
     """
@@ -193,63 +570,6 @@ def _has_open_three_on_dir(board, x, y, dx, dy, color):
     return any(p in s for p in patterns)
 
 
-def count_open_four_dirs(board, x, y, color):
-    """(x,y)에 color를 둘 때 생성되는 '독립된' 열린4가 서로 다른 방향에서 몇 개인지."""
-    n = len(board)
-    if not _in_bounds(n, x, y) or board[x][y] != EMPTY:
-        return 0
-    board[x][y] = color
-    try:
-        cnt = 0
-        for dx, dy in DIRECTIONS:
-            if _has_open_four_on_dir(board, x, y, dx, dy, color):
-                cnt += 1
-        return cnt
-    finally:
-        board[x][y] = EMPTY
-
-
-# ------------------------------
-# 금수 본판정 (정석룰)
-# ------------------------------
-def is_forbidden_double_three(board, x, y, stone):
-    """
-    흑(B)만 33 금수.
-    (x,y)에 두었을 때 서로 다른 두 방향 이상에서 '열린3'이면 True.
-    - 범위 밖: False (유효성은 호출부에서 별도 처리 권장)
-    - 이미 돌이 있는 칸: True (착수 불가 취지)
-    """
-    if stone != BLACK:
-        return False
-    n = len(board)
-    if not _in_bounds(n, x, y):
-        return False
-    if board[x][y] != EMPTY:
-        return True
-
-    board[x][y] = stone
-    try:
-        dirs = 0
-        for dx, dy in DIRECTIONS:
-            if _has_open_three_on_dir(board, x, y, dx, dy, stone):
-                dirs += 1
-                if dirs >= 2:
-                    return True
-        return False
-    finally:
-        board[x][y] = EMPTY
-
-
-def is_forbidden_double_four(board, x, y, stone):
-    """
-    흑(B)만 44 금수.
-    (x,y)에 둘 때 서로 다른 두 방향 이상에서 '독립된' 열린4(.BBBB.)가 동시에 만들어지면 True.
-    """
-    if stone != BLACK:
-        return False
-    return count_open_four_dirs(board, x, y, stone) >= 2
-
-
 # ------------------------------
 # 디버그 헬퍼
 # ------------------------------
@@ -0,0 +1,12 @@
+from functools import cache
+
+import redis
+from django.conf import settings
+
+
+@cache
+def get_redis() -> redis.Redis:
+    """settings.REDIS_URL 공용 Redis 클라이언트 (프로세스당 1개, 문자열 응답)"""
+    if not settings.REDIS_URL:
+        raise RuntimeError("REDIS_URL 이 설정되지 않았습니다.")
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
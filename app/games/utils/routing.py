@@ -4,9 +4,11 @@ from .consumers import GameConsumer, LobbyConsumer  # utils 안의 consumers.py
 from .direct_message_consumer import DirectMessageConsumer
 from .matchmaking_consumer import MatchmakingConsumer
 from .notification_consumer import NotificationConsumer
+from .spectator_consumer import SpectatorConsumer
 
 websocket_urlpatterns = [
     re_path(r"ws/games/(?P<game_id>\d+)/$", GameConsumer.as_asgi()),
+    re_path(r"ws/games/(?P<game_id>\d+)/spectate/$", SpectatorConsumer.as_asgi()),
     re_path(r"ws/lobby/$", LobbyConsumer.as_asgi()),
     re_path(r"ws/matchmaking/$", MatchmakingConsumer.as_asgi()),
     re_path(r"ws/dm/(?P<friend_id>\d+)/$", DirectMessageConsumer.as_asgi()),
@@ -0,0 +1,65 @@
+import asyncio
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .heartbeat import HeartbeatMixin
+from .spectators import SPECTATOR_SLOW_CLOSE_CODE, SendWindow, spectator_hub
+
+
+class SpectatorConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
+    """
+    관전 전용 WebSocket 컨슈머 (읽기 전용)
+    게임 그룹에 들어가지 않고 spectator_hub 의 중계만 받음 - 착수/준비 등 조작 메시지는 무시
+    클라이언트는 받은 메시지 수를 ack 로 돌려보내고, ack 가 SPECTATOR_MAX_UNACKED 이상 밀리면 끊음
+    """
+
+    async def connect(self):
+        self.game_id = int(self.scope["url_route"]["kwargs"]["game_id"])
+        self.window = SendWindow()
+        self.dropped = False
+        # 중계(동기 호출)에서 받은 메시지를 순서대로 보내기 위한 대기열 (길이는 window 가 제한)
+        self.outbox = asyncio.Queue()
+
+        await self.accept()
+        await self.touch_online()
+        self._writer = asyncio.create_task(self._drain())
+        await spectator_hub.join(self.game_id, self)
+
+    async def disconnect(self, code):
+        spectator_hub.leave(self.game_id, self)
+        writer = getattr(self, "_writer", None)
+        if writer:
+            writer.cancel()
+
+    async def receive_json(self, content, **kwargs):
+        if await self.handle_ping(content):
+            return
+        msg_type = content.get("type")
+        if msg_type == "ack":
+            self.window.ack(content.get("count"))
+        elif msg_type == "resync":
+            # 델타 순서가 어긋난 관전자 - 프로세스 보관 상태로 다시 맞춤 (DB 조회 없음)
+            spectator_hub.send_state(self)
+        elif msg_type == "play":
+            await self.send_json(
+                {"type": "error", "message": "관전 중에는 착수할 수 없습니다."}
+            )
+
+    def push(self, text: str):
+        """중계에서 호출 - ack 가 밀린 관전자만 끊음 (다른 관전자는 기다리지 않음)"""
+        if self.dropped:
+            return
+        if not self.window.try_send():
+            self.dropped = True
+            spectator_hub.leave(self.game_id, self)
+            print(f"[Spectator] slow viewer dropped: game_id={self.game_id}")
+            asyncio.get_running_loop().create_task(
+                self.close(code=SPECTATOR_SLOW_CLOSE_CODE)
+            )
+            return
+        self.outbox.put_nowait(text)
+
+    async def _drain(self):
+        while True:
+            text = await self.outbox.get()
+            await self.send(text_data=text)
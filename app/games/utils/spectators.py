@@ -0,0 +1,259 @@
+import asyncio
+import json
+import time
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+# 관전자별 미확인(ack 전) 메시지 상한 - 넘으면 느린 관전자로 보고 연결을 끊음
+SPECTATOR_MAX_UNACKED = 64
+# 느린 관전자를 끊을 때 쓰는 close 코드
+SPECTATOR_SLOW_CLOSE_CODE = 4008
+
+
+def spectator_group(game_id) -> str:
+    """게임별 관전 그룹 (프로세스마다 중계 채널 1개만 들어감)"""
+    return f"game_{game_id}_spectators"
+
+
+def get_spectator_delay() -> float:
+    """관전 지연 시간 (초, settings.SPECTATOR_DELAY)"""
+    return float(getattr(settings, "SPECTATOR_DELAY", 0) or 0)
+
+
+def load_spectator_state(game_id):
+    """DB 에서 전체 상태 1회 생성 → (상태, 시계가 도는지). 게임이 없으면 (None, False)"""
+    from app.games.models import Game
+    from app.games.utils.consumers import build_game_state
+
+    game = Game.objects.filter(pk=game_id).first()
+    if not game:
+        return None, False
+    running = bool(game.last_move_time and not game.winner)
+    return build_game_state(game), running
+
+
+class SendWindow:
+    """
+    관전자별 전송 창 - 보낸 메시지 수와 클라이언트가 ack 한 수의 차이로 느린 관전자 판단
+    Daphne 의 send() 는 소켓 버퍼와 무관하게 바로 반환되므로 서버 쪽 큐 길이로는 알 수 없음
+    """
+
+    def __init__(self, limit: int = SPECTATOR_MAX_UNACKED):
+        self.limit = limit
+        self.sent = 0
+        self.acked = 0
+
+    def try_send(self) -> bool:
+        """미확인 메시지가 상한 미만이면 1개 전송으로 기록하고 True"""
+        if self.sent - self.acked >= self.limit:
+            return False
+        self.sent += 1
+        return True
+
+    def ack(self, count) -> None:
+        """클라이언트가 받은 누적 메시지 수 (보낸 수를 넘거나 줄어드는 값은 무시)"""
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            return
+        self.acked = max(self.acked, min(count, self.sent))
+
+
+class SpectatorHub:
+    """
+    프로세스당 1개의 관전 중계
+    - 1단계: 채널 레이어 관전 그룹에는 게임당 이 프로세스의 중계 채널 1개만 참가
+      (관전자가 수백 명이어도 그룹 메시지는 프로세스 수만큼만 전달됨)
+    - 2단계: 중계 채널이 받은 메시지를 이 프로세스의 관전 소켓에 전달
+    - 게임별 상태 1개를 메모리에 보관하고 착수 델타를 반영 → 입장/재동기화는 이 상태로만 응답
+      (없거나 순서가 어긋났을 때만 프로세스당 1회 DB 에서 다시 불러옴)
+    - SPECTATOR_DELAY 가 있으면 DB 에서 불러온 상태를 포함한 모든 메시지를 그만큼 늦게 반영
+      → 보관 상태는 항상 지연된 시점 기준이라 관전자에게 실시간 수가 보이지 않음
+    """
+
+    def __init__(self, loader=None, delay=get_spectator_delay, clock=time.time):
+        self.load_state = loader or database_sync_to_async(load_spectator_state)
+        self.delay = delay
+        self.clock = clock
+        self.viewers: dict[int, set] = {}
+        self.relays: dict[int, asyncio.Task] = {}
+        # game_id → {"state": 전체 상태, "clock_at": 기준 시각, "running": 시계 진행 여부}
+        self.states: dict[int, dict] = {}
+        # game_id → 진행 중인 DB 로드 (같은 게임은 한 번에 하나씩, 순서대로)
+        self.loading: dict[int, asyncio.Task] = {}
+
+    # ---------------------
+    # 관전자 등록 / 해제
+    # ---------------------
+    async def join(self, game_id: int, viewer):
+        """관전자 등록 + 현재 상태 전송 (중계 채널이 없으면 생성)"""
+        self.viewers.setdefault(game_id, set()).add(viewer)
+        if game_id not in self.relays:
+            self.relays[game_id] = asyncio.get_running_loop().create_task(
+                self._relay(game_id)
+            )
+        self.send_state(viewer)
+
+    def leave(self, game_id: int, viewer):
+        """관전자 해제 - 마지막 관전자면 중계 채널과 캐시 정리"""
+        viewers = self.viewers.get(game_id)
+        if viewers is None:
+            return
+        viewers.discard(viewer)
+        if not viewers:
+            del self.viewers[game_id]
+            self.states.pop(game_id, None)
+            relay = self.relays.pop(game_id, None)
+            if relay:
+                relay.cancel()
+
+    def send_state(self, viewer):
+        """
+        관전자 한 명에게 보관 상태 전송 (입장/재동기화)
+        보관 상태가 없으면 다시 불러오기만 요청 - 도착하면 이 게임의 관전자 모두에게 전송됨
+        """
+        entry = self.states.get(viewer.game_id)
+        if entry is None:
+            self.reload(viewer.game_id)
+            return
+        viewer.push(json.dumps({"type": "state", **self._current(entry)}))
+
+    # ---------------------
+    # 게임 컨슈머 → 관전 그룹
+    # ---------------------
+    async def publish(self, game_id: int, text: str):
+        """관전 그룹에 직렬화된 메시지 전송 (move 델타 / state / game_deleted)"""
+        await get_channel_layer().group_send(
+            spectator_group(game_id), {"type": "spectator.message", "text": text}
+        )
+
+    async def refresh(self, game_id: int):
+        """준비/시작/리매치 등 델타가 없는 변경 - 각 프로세스가 DB 에서 상태를 1회 다시 만듦"""
+        await get_channel_layer().group_send(
+            spectator_group(game_id), {"type": "spectator.refresh"}
+        )
+
+    # ---------------------
+    # 중계
+    # ---------------------
+    async def _relay(self, game_id: int):
+        channel_layer = get_channel_layer()
+        group = spectator_group(game_id)
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add(group, channel)
+        try:
+            while True:
+                event = await channel_layer.receive(channel)
+                try:
+                    self._handle(game_id, event)
+                except Exception as e:
+                    print(f"[Spectators] relay error: {repr(e)}")
+        finally:
+            await channel_layer.group_discard(group, channel)
+
+    def _handle(self, game_id: int, event: dict):
+        if event["type"] == "spectator.refresh":
+            # 변경 이후 상태가 필요하므로 진행 중인 로드에 합치지 않고 그 뒤에 다시 불러옴
+            self.reload(game_id, force=True)
+        else:
+            text = event["text"]
+            self._schedule(game_id, json.loads(text), text)
+
+    def reload(self, game_id: int, force: bool = False):
+        """
+        DB 에서 전체 상태를 다시 불러와 (지연 후) 이 프로세스의 관전자 모두에게 전송
+        이미 불러오는 중이면 그 결과를 같이 기다림 (force 면 그 로드가 끝난 뒤 한 번 더)
+        """
+        pending = self.loading.get(game_id)
+        if pending and not force:
+            return pending
+        task = asyncio.get_running_loop().create_task(self._load(game_id, pending))
+        self.loading[game_id] = task
+        return task
+
+    async def _load(self, game_id: int, previous):
+        try:
+            if previous:
+                # 이전 로드 결과가 먼저 반영되도록 순서 유지
+                await asyncio.gather(previous, return_exceptions=True)
+            if game_id not in self.viewers:
+                return
+            state, running = await self.load_state(game_id)
+            message = {"type": "state", **state} if state else {"type": "game_deleted"}
+            self._schedule(game_id, message, json.dumps(message), running)
+        except Exception as e:
+            print(f"[Spectators] load error: {repr(e)}")
+        finally:
+            if self.loading.get(game_id) is asyncio.current_task():
+                del self.loading[game_id]
+
+    def _schedule(self, game_id, message, text, running=None):
+        """SPECTATOR_DELAY 만큼 늦게 반영 (같은 지연이므로 도착 순서 유지)"""
+        delay = self.delay()
+        if delay > 0:
+            asyncio.get_running_loop().call_later(
+                delay, self._deliver, game_id, message, text, running
+            )
+        else:
+            self._deliver(game_id, message, text, running)
+
+    def _deliver(self, game_id, message, text, running=None):
+        """보관 상태 갱신 후 이 프로세스의 관전자에게 전달"""
+        viewers = self.viewers.get(game_id)
+        if not viewers:
+            return
+
+        kind = message.get("type")
+        if kind == "move":
+            entry = self.states.get(game_id)
+            if entry is None:
+                # 기준 상태를 불러오는 중 - 이 수는 불러온 상태에 포함되거나 그 뒤에 다시 옴
+                return
+            state = entry["state"]
+            seq = state.get("seq")
+            if seq is not None and message["seq"] <= seq:
+                return  # 이미 반영된 수
+            if seq is None or message["seq"] != seq + 1:
+                # 순서가 어긋남 → 보관 상태를 버리고 프로세스당 1회 다시 불러옴
+                self.states.pop(game_id, None)
+                self.reload(game_id)
+                return
+            i = message["y"] * state["size"] + message["x"]
+            state["board"] = (
+                state["board"][:i] + message["stone"] + state["board"][i + 1 :]
+            )
+            for key in ("seq", "turn", "black_time", "white_time"):
+                state[key] = message[key]
+            entry["clock_at"] = self.clock()
+            entry["running"] = bool(state.get("white_id"))
+        elif kind == "state":
+            state = {key: value for key, value in message.items() if key != "type"}
+            if running is None:
+                # 게임 컨슈머가 보낸 상태는 게임 종료 상태
+                running = not state.get("winner")
+            self._store(game_id, state, running)
+        elif kind == "game_deleted":
+            self.states.pop(game_id, None)
+
+        for viewer in list(viewers):
+            viewer.push(text)
+
+    def _store(self, game_id, state, running) -> dict:
+        entry = {"state": state, "clock_at": self.clock(), "running": running}
+        self.states[game_id] = entry
+        return entry
+
+    def _current(self, entry) -> dict:
+        """보관 상태에 기준 시각 이후 흐른 시간을 반영한 사본"""
+        state = dict(entry["state"])
+        if entry["running"]:
+            elapsed = int(self.clock() - entry["clock_at"])
+            key = "black_time" if state["turn"] == "black" else "white_time"
+            state[key] = max(0, state[key] - elapsed)
+        return state
+
+
+# 프로세스 전역 인스턴스
+spectator_hub = SpectatorHub()
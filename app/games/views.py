@@ -1,5 +1,4 @@
 import json
-import time
 from datetime import timedelta
 from functools import wraps
 
@@ -9,16 +8,16 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Q
 from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-
-from django.core.cache import cache
 from django.views.decorators.http import require_POST
 
+from app.accounts.middleware import invalidate_suspension
 from app.accounts.models import UserProfile
-from app.accounts.views import get_online_users, AI_GAME_USERS_KEY
+from app.accounts.views import ai_game_users_tracker
 
 from .models import (
     BOARD_SIZE,
@@ -27,10 +26,11 @@ from .models import (
     FriendRequest,
     Game,
     GameHistory,
-    Move,
     Report,
     Sanction,
 )
+from .utils.lobby import get_online_user_ids, get_waiting_rooms, lobby_notifier
+from .utils.spectators import spectator_hub
 
 User = get_user_model()
 
@@ -38,8 +38,7 @@ User = get_user_model()
 def notify_lobby_room_change():
     """로비에 게임 방 목록 변경 알림"""
     try:
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)("lobby", {"type": "room_list_changed"})
+        async_to_sync(lobby_notifier.notify)("rooms")
     except Exception as e:
         print(f"[notify_lobby_room_change] ERROR: {repr(e)}")
 
@@ -47,38 +46,38 @@ def notify_lobby_room_change():
 @login_required
 def lobby(request):
     """게임 로비 - 대기 중인 방 목록 표시"""
-    # 온라인 유저 목록 가져오기 (하트비트 캐시 기반)
-    online_users = get_online_users()
-    online_user_ids = set(online_users.keys())
-
-    # white가 null인 게임 = 대기 중인 방
-    all_waiting_games = Game.objects.filter(white__isnull=True).order_by("-created_at")
+    # 대기 중인 방 (캐시된 목록) - 방장이 온라인인 방 + 본인 방만 표시
+    online_user_ids = get_online_user_ids()
 
     # 방장이 오프라인인 방 정리 (본인 방 제외)
-    games_to_delete = []
-    waiting_games = []
-    for game in all_waiting_games:
-        # 본인 방은 유지
-        if game.black == request.user:
-            waiting_games.append(game)
-        # 방장이 온라인이면 유지
-        elif game.black_id in online_user_ids:
-            waiting_games.append(game)
-        # 방장이 오프라인이면 삭제 대상
-        else:
-            games_to_delete.append(game.id)
-
-    # 오프라인 방장의 빈 방 삭제
+    games_to_delete = [
+        room["id"]
+        for room in get_waiting_rooms()
+        if room["black_id"] != request.user.id
+        and room["black_id"] not in online_user_ids
+    ]
+    deleted = 0
     if games_to_delete:
-        Game.objects.filter(id__in=games_to_delete).delete()
+        deleted, _ = Game.objects.filter(
+            id__in=games_to_delete, white__isnull=True
+        ).delete()
 
     # 로비 진입 시 본인이 만든 빈 방 정리 (상대 없음, 게임 미시작)
-    Game.objects.filter(
+    own_deleted, _ = Game.objects.filter(
         black=request.user,
         white__isnull=True,
         game_started=False,
     ).delete()
 
+    # 방이 지워졌으면 캐시를 비우고 로비에 알린 뒤 다시 조회
+    if deleted or own_deleted:
+        notify_lobby_room_change()
+    waiting_games = [
+        room
+        for room in get_waiting_rooms()
+        if room["black_id"] == request.user.id or room["black_id"] in online_user_ids
+    ]
+
     # 현재 사용자가 참여 중인 진행 중인 게임이 있는지 확인
     active_game = Game.objects.filter(
         Q(black=request.user) | Q(white=request.user), winner__isnull=True
@@ -243,6 +242,7 @@ def join_game(request, pk):
         async_to_sync(channel_layer.group_send)(
             f"game_{game.pk}", {"type": "player_joined"}
         )
+        async_to_sync(spectator_hub.refresh)(game.pk)
 
         # 로비에 게임 방 목록 변경 알림 (방이 꽉 참)
         notify_lobby_room_change()
@@ -252,7 +252,14 @@ def join_game(request, pk):
 
 def game_room(request, pk):
     game = get_object_or_404(Game, pk=pk)
-    return render(request, "games/room.html", {"game": game, "BOARD_SIZE": BOARD_SIZE})
+    # 흑/백 플레이어가 아니면 관전 소켓으로 접속 (읽기 전용)
+    user_id = request.user.id if request.user.is_authenticated else None
+    is_spectator = user_id is None or user_id not in (game.black_id, game.white_id)
+    return render(
+        request,
+        "games/room.html",
+        {"game": game, "BOARD_SIZE": BOARD_SIZE, "is_spectator": is_spectator},
+    )
 
 
 def ai_game(request):
@@ -282,14 +289,13 @@ def ai_game_status(request):
     """AI 게임 상태 업데이트 (하트비트)"""
 
     user = request.user
-    ai_users = cache.get(AI_GAME_USERS_KEY, {})
-    ai_users[str(user.id)] = {
-        "user_id": user.id,
-        "username": user.username,
-        "nickname": user.first_name or user.username,
-        "last_seen": time.time(),
-    }
-    cache.set(AI_GAME_USERS_KEY, ai_users, timeout=300)
+    ai_game_users_tracker.touch(
+        {
+            "user_id": user.id,
+            "username": user.username,
+            "nickname": user.first_name or user.username,
+        }
+    )
 
     # 로비에 상태 변경 알림
     notify_lobby_status_change()
@@ -301,11 +307,7 @@ def ai_game_status(request):
 @require_POST
 def ai_game_leave(request):
     """AI 게임 종료 알림"""
-    user = request.user
-    ai_users = cache.get(AI_GAME_USERS_KEY, {})
-    if str(user.id) in ai_users:
-        del ai_users[str(user.id)]
-        cache.set(AI_GAME_USERS_KEY, ai_users, timeout=300)
+    ai_game_users_tracker.remove(request.user.id)
 
     # 로비에 상태 변경 알림
     notify_lobby_status_change()
@@ -316,10 +318,7 @@ def ai_game_leave(request):
 def notify_lobby_status_change():
     """로비에 유저 상태 변경 알림"""
     try:
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            "lobby", {"type": "user_status_changed"}
-        )
+        async_to_sync(lobby_notifier.notify)("users")
     except Exception as e:
         print(f"[notify_lobby_status_change] ERROR: {repr(e)}")
 
@@ -338,8 +337,8 @@ def leave_game(request, pk):
     if game.winner:
         return redirect("games:lobby")
 
-    # 게임이 시작되었는지 확인 (Move가 하나라도 있으면 시작됨)
-    has_moves = Move.objects.filter(game=game).exists()
+    # 게임이 시작되었는지 확인 (한 수라도 두었으면 시작됨)
+    has_moves = game.move_count > 0
 
     # 양쪽 플레이어가 모두 있고 게임이 시작된 후에는 나가기 불가
     if has_moves and game.black and game.white:
@@ -354,6 +353,7 @@ def leave_game(request, pk):
         # WebSocket으로 백돌 플레이어에게 알림 (게임 삭제됨)
         channel_layer = get_channel_layer()
         async_to_sync(channel_layer.group_send)(f"game_{pk}", {"type": "game_deleted"})
+        async_to_sync(spectator_hub.publish)(pk, json.dumps({"type": "game_deleted"}))
         # 로비에 게임 방 목록 변경 알림
         notify_lobby_room_change()
         return redirect("games:lobby")
@@ -367,6 +367,7 @@ def leave_game(request, pk):
         async_to_sync(channel_layer.group_send)(
             f"game_{pk}", {"type": "broadcast_state"}
         )
+        async_to_sync(spectator_hub.refresh)(pk)
         # 로비에 게임 방 목록 변경 알림 (방이 다시 대기 중으로 전환)
         notify_lobby_room_change()
         return redirect("games:lobby")
@@ -406,6 +407,36 @@ def game_history(request):
     return render(request, "games/history.html", context)
 
 
+@login_required
+def game_replay(request, history_id):
+    """기보 조회 (AJAX) - 전적 1행 조회로 수순/수 간격 반환"""
+    history = get_object_or_404(
+        GameHistory.objects.select_related("black", "white"), pk=history_id
+    )
+
+    def player(user):
+        if not user:
+            return None
+        return {"id": user.id, "nickname": user.first_name or user.username}
+
+    return JsonResponse(
+        {
+            "id": history.pk,
+            "game_id": history.game_id,
+            "size": BOARD_SIZE,
+            "black": player(history.black),
+            "white": player(history.white),
+            "winner": history.winner,
+            "created_at": history.created_at.isoformat(),
+            "finished_at": history.finished_at.isoformat(),
+            # [[x, y], ...] 흑부터 번갈아 둔 순서
+            "moves": [list(move) for move in history.get_replay_moves()],
+            # 각 수를 두기까지 걸린 시간 (초, 첫 수는 0)
+            "times": history.get_replay_times(),
+        }
+    )
+
+
 # ====== 친구 관련 뷰 ======
 
 
@@ -866,6 +897,7 @@ def admin_report_action(request, report_id):
         ends_at = timezone.now() + timedelta(days=days)
         profile.suspended_until = ends_at
         profile.save()
+        transaction.on_commit(lambda: invalidate_suspension(profile.user_id))
         Sanction.objects.create(
             user=report.reported_user,
             sanction_type="suspend",
@@ -882,6 +914,7 @@ def admin_report_action(request, report_id):
     elif action == "permanent_ban":
         profile.is_permanently_banned = True
         profile.save()
+        transaction.on_commit(lambda: invalidate_suspension(profile.user_id))
         Sanction.objects.create(
             user=report.reported_user,
             sanction_type="permanent_ban",
@@ -996,6 +1029,7 @@ def admin_user_sanction(request, user_id):
         ends_at = timezone.now() + timedelta(days=days)
         profile.suspended_until = ends_at
         profile.save()
+        transaction.on_commit(lambda: invalidate_suspension(profile.user_id))
         Sanction.objects.create(
             user=target_user,
             sanction_type="suspend",
@@ -1009,6 +1043,7 @@ def admin_user_sanction(request, user_id):
     elif action == "permanent_ban":
         profile.is_permanently_banned = True
         profile.save()
+        transaction.on_commit(lambda: invalidate_suspension(profile.user_id))
         Sanction.objects.create(
             user=target_user,
             sanction_type="permanent_ban",
@@ -1022,6 +1057,7 @@ def admin_user_sanction(request, user_id):
         profile.suspended_until = None
         profile.is_permanently_banned = False
         profile.save()
+        transaction.on_commit(lambda: invalidate_suspension(profile.user_id))
         return JsonResponse({"success": True, "message": "제재를 해제했습니다."})
 
     return JsonResponse({"error": "잘못된 액션입니다."}, status=400)
@@ -312,3 +312,21 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": 60 * 60,  # 매 시간 (3600초)
     },
 }
+
+# ──────────────────────────────────────────────────────────────────────
+# 로비 / 게임 실시간 설정
+# ──────────────────────────────────────────────────────────────────────
+# 로비 알림 병합 창 (초, 이벤트 종류별). 창 안에 들어온 알림은 한 번만 전송, 0이면 즉시 전송
+LOBBY_NOTIFY_WINDOWS = {
+    "users": 0.25,  # 접속자 목록
+    "rooms": 0.25,  # 게임 방 목록
+}
+
+# 매칭 큐 백엔드: "memory"(프로세스 1개용, 기본값) | "redis"(여러 ASGI 프로세스가 큐 공유, REDIS_URL 필요)
+MATCHMAKING_BACKEND = env("MATCHMAKING_BACKEND", default="memory")
+# 틱마다 큐를 짝짓는 방식: "greedy"(오래 기다린 순, 가까운 상대) | "optimal"(틱 전체 Rating 차이/대기 시간 최적)
+MATCHMAKING_PAIRING = env("MATCHMAKING_PAIRING", default="greedy")
+# 로비 접속자 레지스트리: "memory"(프로세스 1개용, 기본값) | "redis"(여러 Daphne 프로세스가 공유, REDIS_URL 필요)
+PRESENCE_BACKEND = env("PRESENCE_BACKEND", default="memory")
+# 관전 지연 시간 (초, 0이면 지연 없음) - 관전 화면으로 훈수 두는 것을 막을 때 사용
+SPECTATOR_DELAY = env.float("SPECTATOR_DELAY", default=0)